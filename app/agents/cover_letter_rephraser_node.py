@@ -5,10 +5,11 @@ from datetime import datetime
 from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 
 from app.prompts.cl_rephraser_prompt import SYSTEM_PROMPT, PROMPT
 from app.types.node_state import NodeState 
+from app.services.llm_registry import llm_registry
+from app.services.profile_store import profile_store
 from app.config import settings
 
 class CoverLetterRephraserNode:
@@ -22,7 +23,8 @@ class CoverLetterRephraserNode:
         temperature (float): The temperature setting for the LLM to control randomness.
         max_tokens (int): Maximum number of tokens to be generated in the output.
         timeout (float): Timeout value for the LLM request.
-        llm (ChatOpenAI): Instance of the LLM for generating the output.
+        streaming (bool): Whether the letter is generated as a token stream.
+        llm (ChatOpenAI): Shared LLM client from the registry for generating the output.
         prompt_template (ChatPromptTemplate): Template for structuring the input prompt.
     """
 
@@ -31,7 +33,8 @@ class CoverLetterRephraserNode:
         model: str = settings.LLM_MODEL,
         temperature: float = settings.TEMPERATURE,
         max_tokens: int = settings.MAX_TOKENS,
-        timeout: float = settings.TIMEOUT
+        timeout: float = settings.TIMEOUT,
+        streaming: bool = settings.COVER_LETTER_STREAMING
     ) -> None:
         """
         Initializes the CoverLetterRephraserNode with the specified settings.
@@ -41,13 +44,16 @@ class CoverLetterRephraserNode:
             temperature (float): The temperature for the LLM (default from settings).
             max_tokens (int): The maximum number of tokens for the LLM response.
             timeout (float): Timeout value for the LLM response.
+            streaming (bool): Whether to stream the letter token by token (default from settings).
         """
-        self.llm = ChatOpenAI(
+        self.streaming = streaming
+
+        # Shared client from the registry, reusing its pooled connections
+        self.llm = llm_registry.get_chat_model(
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
-            timeout=timeout, 
-            cache=False  # Ensures fresh responses without caching
+            timeout=timeout
         )
 
         # Define the prompt template with system and human messages.
@@ -68,25 +74,36 @@ class CoverLetterRephraserNode:
             Dict[str, Any] | None: A dictionary containing the generated cover letter and 
             a message for the user, or None if generation fails.
         """
+        user_details = profile_store.resolve(state)  # The profile tailored by the suggestor.
+
         # Prepare the input prompt for the LLM using state data.
         prompt = self.prompt_template.invoke({
             "position": state.job_description.position,  # Job title.
             "organization": state.job_description.organization,  # Organization name.
             "job_responsibilities": state.job_description.responsibilities,  # Job responsibilities.
             "job_skills": state.job_description.skills,  # Required skills from the job description.
-            "user_skills": state.user_details["skills"],  # User's skills.
-            "user_experiences": json.dumps(state.user_details["experiences"], indent=2),  # User's experiences.
-            "user_education": json.dumps(state.user_details["education"], indent=2),  # User's education details.
-            "user_projects": json.dumps(state.user_details["projects"], indent=2),  # User's projects.
-            "user_details": json.dumps(state.user_details, indent=2),  # Full user details in JSON format.
+            "user_skills": user_details["skills"],  # User's skills.
+            "user_experiences": json.dumps(user_details["experiences"], indent=2),  # User's experiences.
+            "user_education": json.dumps(user_details["education"], indent=2),  # User's education details.
+            "user_projects": json.dumps(user_details["projects"], indent=2),  # User's projects.
+            "user_details": json.dumps(user_details, indent=2),  # Full user details in JSON format.
             "date": datetime.now().strftime("%b %d, %Y")  # Current date for use in the cover letter.
         })
 
-        # Invoke the LLM with the prepared prompt and capture the output.
-        output = self.llm.invoke(prompt)
+        if self.streaming:
+            # Stream the letter with the node's config, so callers of
+            # graph.stream(..., stream_mode="messages") see it build up token by token.
+            output = None
+            for chunk in self.llm.stream(prompt, config):
+                output = chunk if output is None else output + chunk  # Accumulate the full letter.
+            cover_letter = output.content if output is not None else ""
+
+        else:
+            # Invoke the LLM with the prepared prompt and capture the output.
+            cover_letter = self.llm.invoke(prompt, config).content
 
         # Return the generated cover letter and an acknowledgment message.
         return {
             "messages": [AIMessage(content="Crafted your cover letter!")],  # Message to indicate success.
-            "cover_letter": output.content  # Generated cover letter content.
+            "cover_letter": cover_letter  # Generated cover letter content.
         }
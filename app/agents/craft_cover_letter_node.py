@@ -1,16 +1,14 @@
-from typing import Dict, Any, List
-import json 
-import base64
+from typing import Dict, Any
 from langchain_core.runnables import RunnableConfig
-from langchain_core.messages import HumanMessage, AIMessage
-from langchain_openai import ChatOpenAI
-from google.cloud import secretmanager
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from langchain_core.messages import AIMessage
 
 from email.message import EmailMessage
 
 from app.types.node_state import NodeState 
+from app.services.document_sinks import DocumentSink, get_document_sink
+from app.services.publish_queue import publish_queue
+from app.services.mail_queue import OutboundMail, mail_queue
+from app.services.profile_store import profile_store
 from app.config import settings
 
 class CraftCoverLetterNode: 
@@ -20,26 +18,39 @@ class CraftCoverLetterNode:
     services such as Docs, Drive, and Gmail APIs.
 
     Attributes:
-        doc_client: Google Docs API client for document creation and updates.
-        drive_client: Google Drive API client for managing permissions and sharing links.
-        email_client: Gmail API client for sending emails.
+        sink (DocumentSink): Stores the cover letter; Google Docs by default.
+        publish_queue (PublishQueue): Worker pool used to publish in the background.
+        publish_mode (str): "sync" to publish before responding, "async" to publish in the background.
+        mail_queue (MailQueue): Outbound mail queue the link emails are sent through.
+        send_emails (bool): Whether the cover letter link is emailed to the user.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        publish_mode: str = settings.PUBLISH_MODE,
+        sink: DocumentSink | None = None,
+        send_emails: bool = settings.COVER_LETTER_EMAIL
+    ):
         """
-        Initializes the node by authenticating with Google Cloud and creating API clients
-        for Docs, Drive, and Gmail.
+        Initializes the node. Authentication and API clients are left to the document sink
+        and the mail queue, which only set them up on first use.
+
+        Args:
+            publish_mode (str): "sync" to publish before responding, "async" to publish in the background.
+            sink (DocumentSink | None): Where cover letters are stored; defaults to the DOCUMENT_SINK backend.
+            send_emails (bool): Whether to email the cover letter link to the user.
         """
-        # Authenticate and set up API clients for Google services
-        credentials = self.authenticate() 
-        self.doc_client = build("docs", "v1", credentials=credentials)
-        self.drive_client = build("drive", "v3", credentials=credentials)
-        self.email_client = build("gmail", "v1", credentials=credentials)
+        self.sink = sink or get_document_sink()
+        self.publish_queue = publish_queue
+        self.publish_mode = publish_mode
+        self.mail_queue = mail_queue
+        self.send_emails = send_emails
 
     def __call__(self, state: NodeState, config: RunnableConfig) -> Dict[str, Any] | None:
         """
         Creates a Google Doc for the cover letter and returns a link to the document.
-        Optionally, an email with the link can be sent to the user.
+        Optionally, an email with the link is queued for the user. In async publish mode
+        the document is created by the publish queue and a job handle is returned at once.
 
         Args:
             state (NodeState): Contains the crafted cover letter and job details.
@@ -49,45 +60,60 @@ class CraftCoverLetterNode:
             Dict[str, Any] | None: A dictionary containing a link to the created document
             and an acknowledgment message.
         """
+        cover_letter = state.cover_letter
+        organization = state.job_description.organization
+        position = state.job_description.position
+        user_email = (profile_store.resolve(state) or {}).get("personal_details", {}).get("email") if self.send_emails else None
+
+        if self.publish_mode == "async":
+            def publish() -> str:
+                link = self.publish_cover_letter(cover_letter, organization, position)
+                if user_email:
+                    self.send_email(user_email, position, organization, link)
+                return link
+
+            job = self.publish_queue.submit(
+                node=config.get("metadata", {}).get("langgraph_node", "craft_cover_letter"),
+                work=publish,
+                config=config,
+                message=lambda link: f"I have crafted a draft cover letter. Here's the link to your cover letter:\n{link}"
+            )
+            return {
+                "messages": [
+                    AIMessage(
+                        id=job.message_id,
+                        content=f"I am crafting your cover letter (job {job.job_id}). The link will be added here once it is ready."
+                    )
+                ]
+            }
+
         # Create a Google Doc for the cover letter
         cover_letter_link = self.create_doc(
-            cover_letter=state.cover_letter,
-            organization=state.job_description.organization,
-            position=state.job_description.position
+            cover_letter=cover_letter,
+            organization=organization,
+            position=position
         )
 
+        if cover_letter_link is None:
+            return {
+                "messages": [
+                    AIMessage(content="Sorry, I could not create your cover letter document right now. Please try again in a moment.")
+                ]
+            }
+
+        if user_email:
+            self.send_email(user_email, position, organization, cover_letter_link)
+
         return {
             "messages": [
                 AIMessage(content=f"I have crafted a draft cover letter. Here's the link to your cover letter:\n{cover_letter_link}")
             ]
         }
 
-    def authenticate(self, scopes: List[str] = settings.GCP_SCOPES):
-        """
-        Authenticates with Google Cloud using a service account and retrieves credentials.
-
-        Args:
-            scopes (List[str]): The scopes required for Google Cloud API access.
-
-        Returns:
-            Credentials: Google Cloud service account credentials.
-        """
-        secretmanager_client = secretmanager.SecretManagerServiceClient() 
-        response = secretmanager_client.access_secret_version(name=settings.GCP_SECRET_VERSION)
-        
-        # Decode the service account JSON stored in Secret Manager
-        service_account_info = json.loads(response.payload.data.decode("UTF-8"))
-        
-        # Create credentials for Google Cloud APIs
-        credentials = service_account.Credentials.from_service_account_info(
-            service_account_info, scopes=scopes
-        )
-
-        return credentials
-
-    def create_doc(self, cover_letter: str, organization: str, position: str) -> str: 
+    def create_doc(self, cover_letter: str, organization: str, position: str) -> str | None: 
         """
         Creates a Google Doc containing the cover letter and grants public write access.
+        The text is uploaded on the create call itself, so no separate insertText update is needed.
 
         Args:
             cover_letter (str): The text of the cover letter.
@@ -95,69 +121,41 @@ class CraftCoverLetterNode:
             position (str): The job position.
 
         Returns:
-            str: A sharable link to the created Google Doc.
+            str | None: A sharable link to the created Google Doc, or None if it could not be
+            created even after the scheduler's retries.
         """
         try:
-            # Create a new Google Doc with the specified title
-            cover_letter_doc = self.doc_client \
-                .documents() \
-                .create(
-                    body={
-                        "title": f"{organization} - {position} Cover Letter"
-                    }
-                ) \
-                .execute()
-        
-            cover_letter_doc_id = cover_letter_doc["documentId"]
-
-            # Add the cover letter content to the Google Doc
-            requests = [
-                {
-                    "insertText": {
-                        "location": {
-                            "index": 1  # Insert text at the beginning of the document
-                        },
-                        "text": cover_letter
-                    }
-                }
-            ]
-
-            # Execute the batch update to insert text into the document
-            self.doc_client.documents().batchUpdate(
-                documentId=cover_letter_doc_id,
-                body={
-                    "requests": requests
-                }
-            ).execute()
-
-            # Grant public write access to the document
-            drive_permission = {
-                "type": "anyone",
-                "role": "writer"
-            }
-
-            self.drive_client.permissions().create(
-                fileId=cover_letter_doc_id,
-                body=drive_permission,
-                fields="id"
-            ).execute()
-
-            # Generate a sharable link to the Google Doc
-            share_link = f"https://docs.google.com/document/d/{cover_letter_doc_id}/edit"
-            return share_link 
+            return self.publish_cover_letter(cover_letter, organization, position)
 
         except Exception as e:
             print(f"Exception: {e}")
 
-    def send_email(self, user_email: str, position: str, organization: str, cover_letter_link: str):
+    def publish_cover_letter(self, cover_letter: str, organization: str, position: str) -> str:
         """
-        Sends an email to the user containing a link to the crafted cover letter.
+        Publishes the cover letter to the document sink, raising on failure.
+
+        Returns:
+            str: A link to the published document.
+        """
+        # Create the document with its content and share it in as few round trips as possible
+        return self.sink.publish_text(
+            title=f"{organization} - {position} Cover Letter",
+            text=cover_letter
+        )
+
+    def send_email(self, user_email: str, position: str, organization: str, cover_letter_link: str) -> OutboundMail | None:
+        """
+        Queues an email to the user containing a link to the crafted cover letter. The email is
+        sent in the background by the mail queue, batched with others and retried on failure.
 
         Args:
             user_email (str): The recipient's email address.
             position (str): The job position.
             organization (str): The organization name.
             cover_letter_link (str): The link to the Google Doc with the cover letter.
+
+        Returns:
+            OutboundMail | None: The queued email, whose status tracks its delivery, or None if it could not be queued.
         """
         # Create the email content
         mail_data = EmailMessage()
@@ -170,17 +168,8 @@ class CraftCoverLetterNode:
             f"Here is your link to the cover letter crafted for {position} at {organization}: {cover_letter_link}"
         )
 
-        # Encode the email message in base64
-        encoded_message = base64.urlsafe_b64encode(mail_data.as_bytes()).decode()
-        create_message = {"raw": encoded_message}
-        
         try:
-            # Send the email using the Gmail API
-            send_message = (
-                self.email_client.users()
-                .messages()
-                .send(userId="me", body=create_message)
-                .execute()
-            )
+            # Hand the email to the background sender
+            return self.mail_queue.enqueue(mail_data)
         except Exception as e:
             print(f"Exception: {e}")
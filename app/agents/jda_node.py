@@ -3,12 +3,14 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import HumanMessage, AIMessage
 from langgraph.types import interrupt
-from langchain_openai import ChatOpenAI
 
 # Importing custom prompts and types
 from app.prompts.jda_prompt import SYSTEM_PROMPT, PROMPT
 from app.types.jd_schema import JDSchema
 from app.types.node_state import NodeState
+from app.services.llm_registry import llm_registry
+from app.utils.cache import TieredCache, stable_hash, fingerprint, normalize_text
+from app.utils.message_window import compact_job_descriptions
 from app.config import settings
 
 
@@ -18,42 +20,78 @@ class JDANode:
         model: str = settings.LLM_MODEL,  # Default model set from config settings
         temperature: float = settings.TEMPERATURE,  # Temperature for randomness in response
         max_tokens: int = settings.MAX_TOKENS,  # Maximum number of tokens for the response
-        timeout: float = settings.TIMEOUT  # Timeout setting for the API call
+        timeout: float = settings.TIMEOUT,  # Timeout setting for the API call
+        cache_enabled: bool = settings.JD_CACHE_ENABLED  # Reuse extractions of previously seen job descriptions
     ) -> None:
-        # Initialize the LLM with the provided settings
-        self.llm = ChatOpenAI(
+        self.model = model
+
+        # Content-addressed cache of extracted job descriptions: in-process LRU plus an optional SQLite tier
+        self.cache = TieredCache.create(
+            namespace="jd_extraction",
+            max_size=settings.JD_CACHE_MAX_SIZE,
+            ttl=settings.JD_CACHE_TTL,
+            path=settings.CACHE_DB_PATH
+        ) if cache_enabled else None
+
+        # Shared LLM from the registry with structured output for the defined schema (JDSchema)
+        self.llm = llm_registry.get_structured_llm(
+            schema=JDSchema,
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
             timeout=timeout
         )
 
-        # Apply structured output configuration to the LLM with a defined schema (JDSchema)
-        self.llm = self.llm.with_structured_output(schema=JDSchema)
-
         # Define the prompt template with system and human prompt components
         self.prompt_template = ChatPromptTemplate([
             ("system", SYSTEM_PROMPT),  # System-level instructions for the model
             ("human", PROMPT)  # The prompt text for the human input (job description)
         ]) 
 
-    def __call__(self, state: NodeState, config: RunnableConfig) -> Dict[str, Any] | None:
+    def cache_key(self, job_description: str) -> str:
         """
-        This method is called when the node is invoked in the flow. It takes the current state
-        and configuration as inputs, processes the job description, and generates a structured
-        job description response.
+        Builds the cache key from the normalized job description text, the model and the prompts,
+        so that editing the extraction prompt or switching models never serves stale entries.
         """
-        
-        # Create the prompt by inserting the job description from the state into the template
+        return stable_hash(self.model, fingerprint(SYSTEM_PROMPT, PROMPT), normalize_text(str(job_description)))
+
+    def extract(self, job_description: str) -> JDSchema:
+        """
+        Extracts the structured job description, serving repeat postings from the cache.
+        """
+        key = self.cache_key(job_description) if self.cache is not None else None
+
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return JDSchema.model_validate(cached)
+
+        # Create the prompt by inserting the job description into the template
         prompt = self.prompt_template.invoke({
-            "job_description": state.job_description  # Use the job description from the node state
+            "job_description": job_description  # Use the job description from the node state
         })
 
         # Use the LLM to generate the structured job description response based on the prompt
         structured_jd = self.llm.invoke(prompt)
+
+        if key is not None:
+            self.cache.set(key, structured_jd.model_dump())
+
+        return structured_jd
+
+    def __call__(self, state: NodeState, config: RunnableConfig) -> Dict[str, Any] | None:
+        """
+        This method is called when the node is invoked in the flow. It takes the current state
+        and configuration as inputs, processes the job description, and generates a structured
+        job description response. Pasted job descriptions in the conversation are replaced
+        by a reference to the structured one, so they are not checkpointed again on every turn.
+        """
         
+        structured_jd = self.extract(state.job_description)
+
         # Return the result with a flag indicating that a job description was processed
         return {
             "is_jd_given": True,  # Indicate that the job description was provided
-            "job_description": structured_jd  # Return the structured job description
+            "job_description": structured_jd,  # Return the structured job description
+            "messages": compact_job_descriptions(state.messages, structured_jd)  # Same ids, compacted content
         }
@@ -0,0 +1,67 @@
+import time
+import logging
+import importlib
+import threading
+from typing import Any, Callable, Dict
+from langchain_core.runnables import RunnableConfig
+
+from app.types.node_state import NodeState
+
+logger = logging.getLogger(__name__)
+
+
+class LazyNode:
+    """
+    Stands in for a graph node and builds it on first call.
+
+    The node class is given by its import path, so neither the node's module (with its prompts
+    and client libraries) nor the node itself, which may set up network clients, is loaded
+    before the graph needs it. This keeps importing and compiling the graph fast for workers
+    that are started on demand.
+
+    Attributes:
+        target (str): Import path of the node class, e.g. "app.agents.jda_node:JDANode".
+        kwargs (Dict[str, Any]): Keyword arguments the node is constructed with.
+        import_seconds (float | None): Seconds spent importing the node's module, once built.
+        init_seconds (float | None): Seconds spent constructing the node, once built.
+    """
+
+    def __init__(self, target: str, **kwargs: Any) -> None:
+        self.target = target
+        self.kwargs = kwargs
+        self.import_seconds: float | None = None
+        self.init_seconds: float | None = None
+
+        self._node: Callable[[NodeState, RunnableConfig], Dict[str, Any] | None] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self._node is not None
+
+    @property
+    def node(self) -> Callable[[NodeState, RunnableConfig], Dict[str, Any] | None]:
+        """
+        The node, imported and constructed on first access.
+        """
+        if self._node is None:
+            with self._lock:
+                if self._node is None:
+                    module_name, class_name = self.target.split(":")
+
+                    start = time.perf_counter()
+                    node_class = getattr(importlib.import_module(module_name), class_name)
+                    self.import_seconds = time.perf_counter() - start
+
+                    start = time.perf_counter()
+                    node = node_class(**self.kwargs)
+                    self.init_seconds = time.perf_counter() - start
+
+                    logger.info(
+                        "Built %s (import %.3fs, init %.3fs)", class_name, self.import_seconds, self.init_seconds
+                    )
+                    self._node = node
+        return self._node
+
+    def __call__(self, state: NodeState, config: RunnableConfig) -> Dict[str, Any] | None:
+        return self.node(state, config)
@@ -1,8 +1,8 @@
+import logging
 from typing import Dict, Any
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import HumanMessage, AIMessage
-from langchain_openai import ChatOpenAI
 
 # Importing the custom prompts for query preprocessing
 from app.prompts.preprocessor_prompt import SYSTEM_PROMPT, PROMPT
@@ -10,8 +10,13 @@ from app.prompts.preprocessor_prompt import SYSTEM_PROMPT, PROMPT
 # Importing necessary types for node state and schema
 from app.types.node_state import NodeState 
 from app.types.intent_schema import IntentSchema
+from app.services.llm_registry import llm_registry
+from app.services.profile_store import profile_store
+from app.utils.intent_rules import IntentClassifier
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 # Node for processing user queries
 class QueryPreprocessorNode:
@@ -20,45 +25,74 @@ class QueryPreprocessorNode:
         model: str = settings.LLM_MODEL,  # Default model from configuration
         temperature: float = settings.TEMPERATURE,  # Temperature for randomness in response
         max_tokens: int = settings.MAX_TOKENS,  # Maximum number of tokens in response
-        timeout: float = settings.TIMEOUT  # Timeout for API calls
+        timeout: float = settings.TIMEOUT,  # Timeout for API calls
+        rules_enabled: bool = settings.INTENT_RULES_ENABLED  # Try the local rule-based classifier first
     ) -> None:
-        # Initialize the LLM model with the provided parameters
-        self.llm = ChatOpenAI(
+        # Local classifier answering confident cases without a round trip to the LLM
+        self.intent_rules = IntentClassifier() if rules_enabled else None
+
+        # Shared LLM from the registry with structured output for intent and job description
+        self.llm = llm_registry.get_structured_llm(
+            schema=IntentSchema,
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
-            timeout=timeout, 
-            cache=False  # Disable caching to ensure fresh responses
+            timeout=timeout
         )
 
-        # Apply structured output with the specified schema for intent and job description
-        self.llm = self.llm.with_structured_output(schema=IntentSchema)
-
         # Define the prompt template that combines system and human-level prompts
         self.prompt_template = ChatPromptTemplate.from_messages([
             ("system", SYSTEM_PROMPT),  # System-level instructions
             ("human", PROMPT)  # Human-level prompt to guide the query
         ])
 
+    def classify(self, user_query: str, known_intent: str | None = None, need: str = "both") -> IntentSchema:
+        """
+        Classifies the user query, using the local rules when they are confident and the LLM otherwise.
+        `need` tells the rules which fields this turn has to fill: "intent", "jd" or "both".
+        """
+        if self.intent_rules is not None:
+            output = self.intent_rules.classify(user_query, known_intent=known_intent, need=need)
+            if output is not None:
+                return output
+
+        # Generate prompt for LLM based on the user query
+        prompt = self.prompt_template.invoke({
+            "user_query": user_query
+        })
+
+        # Invoke the LLM with the generated prompt
+        return self.llm.invoke(prompt)
+
+    def store_profile(self, state: NodeState) -> Dict[str, Any]:
+        """
+        Moves a profile given inline in `user_details` to the profile store. The state then keeps
+        only the profile's id, and the overlay of a previous profile is cleared.
+        """
+        if not state.user_details:
+            return {}
+
+        return {
+            "user_details": None,
+            "profile_id": profile_store.put(state.user_details),
+            "profile_overlay": None
+        }
+
     def __call__(self, state: NodeState, config: RunnableConfig) -> Dict[str, Any] | None:
         """
         This method is called when the node is invoked. It processes the user query,
         handles different scenarios for intent and job description, and returns appropriate responses.
         """
+        profile_update = self.store_profile(state)
 
         # Case 1: If the intent is provided and job description is not given
         if (state.intent is not None and state.intent != "") and not state.is_jd_given:
-            # Generate prompt for LLM based on the last user message
-            prompt = self.prompt_template.invoke({
-                "user_query": state.messages[-1].content
-            })
-
-            # Invoke the LLM with the generated prompt
-            output = self.llm.invoke(prompt)
+            # Classify the last user message, which is expected to carry the job description
+            output = self.classify(state.messages[-1].content, known_intent=state.intent, need="jd")
             content = f"Thank you! I will help you craft {state.intent} for the given job description."
             
-            # If job description is provided, adjust the response
-            if output.is_jd_given:
+            # If job description is still missing, adjust the response
+            if not output.is_jd_given:
                 content = f"I understand that you want me to help you craft {state.intent}. Can you please provide the job description clearly?" 
             
             # Return response with message, job description, and status of job description
@@ -66,17 +100,13 @@ class QueryPreprocessorNode:
                 "messages": [AIMessage(content=content)],
                 "job_description": output.job_description,
                 "is_jd_given": output.is_jd_given,
+                **profile_update
             }
 
         # Case 2: If intent is not provided and job description is given
         if (state.intent is None or state.intent == "") and state.is_jd_given:
-            # Generate prompt for LLM based on the last user message
-            prompt = self.prompt_template.invoke({
-                "user_query": state.messages[-1].content
-            })
-
-            # Invoke the LLM with the generated prompt
-            output = self.llm.invoke(prompt)
+            # Classify the last user message, which is expected to carry the intent
+            output = self.classify(state.messages[-1].content, need="intent")
             content = f"Got it! I will help you craft {output.intent}"
             
             # If no intent is identified, ask for clarification
@@ -87,17 +117,13 @@ class QueryPreprocessorNode:
             return {
                 "messages": [AIMessage(content=content)],
                 "intent": output.intent,
+                **profile_update
             }
 
         # Case 3: Normal flow when intent and job description are both provided or need processing
-        prompt = self.prompt_template.invoke({
-            "user_query": state.messages[-1].content
-        })
-
-        # Invoke LLM to get the output based on the query
-        output = self.llm.invoke(prompt)
+        output = self.classify(state.messages[-1].content)
 
-        print(output)  # Debug print to check the output
+        logger.debug("Classified query: %s", output)
 
         # Determine response content based on the presence of intent and job description
         if (output.intent is not None and output.intent != "") and output.is_jd_given:
@@ -114,5 +140,6 @@ class QueryPreprocessorNode:
             "messages": [AIMessage(content=content)],  # Response message
             "intent": output.intent,  # Identified intent
             "is_jd_given": output.is_jd_given,  # Status if job description is provided
-            "job_description": output.job_description  # Job description if available
+            "job_description": output.job_description,  # Job description if available
+            **profile_update  # Profile id in place of the inline profile
         }
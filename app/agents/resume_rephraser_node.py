@@ -2,7 +2,6 @@ from typing import Dict, Any
 from langchain_core.runnables import RunnableConfig
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 # Importing custom prompts for resume rephrasing
 from app.prompts.resume_rephraser_prompt import (
@@ -12,6 +11,11 @@ from app.prompts.resume_rephraser_prompt import (
 # Importing necessary types for node state and schema
 from app.types.node_state import NodeState 
 from app.types.enhancer_schema import EnhancerSchema
+from app.services.llm_registry import llm_registry
+from app.services.profile_store import profile_store
+from app.utils.concurrency import bounded_map
+from app.utils.cache import TieredCache, stable_hash, fingerprint
+from app.utils.profile_overlay import overlay_key, selected_indices
 from app.config import settings
 
 
@@ -21,21 +25,33 @@ class ResumeRephraserNode:
         model: str = settings.LLM_MODEL,  # Default model from config
         temperature: float = settings.TEMPERATURE,  # Temperature for output randomness
         max_tokens: int = settings.MAX_TOKENS,  # Max tokens for LLM output
-        timeout: float = settings.TIMEOUT  # Timeout for the API request
+        timeout: float = settings.TIMEOUT,  # Timeout for the API request
+        max_concurrency: int = settings.REPHRASER_MAX_CONCURRENCY,  # Cap on rephrasing calls in flight
+        cache_enabled: bool = settings.REPHRASE_CACHE_ENABLED  # Reuse rephrasings of identical inputs
     ) -> None:
-        
-        # Initialize the LLM model with the provided settings
-        self.llm = ChatOpenAI(
+        self.max_concurrency = max_concurrency
+        self.model = model
+        self.temperature = temperature
+
+        # LRU cache of rephrased bullets with an optional TTL
+        self.cache = TieredCache.create(
+            namespace="rephrased_bullets",
+            max_size=settings.REPHRASE_CACHE_MAX_SIZE,
+            ttl=settings.REPHRASE_CACHE_TTL
+        ) if cache_enabled else None
+
+        # Fingerprint of the rephrasing prompts; editing them invalidates cached results
+        self.prompt_fingerprint = fingerprint(SYSTEM_PROMPT, PROMPT)
+
+        # Shared LLM from the registry with structured output for enhanced points
+        self.llm = llm_registry.get_structured_llm(
+            schema=EnhancerSchema,
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
-            timeout=timeout, 
-            cache=False  # Disable cache to ensure fresh results
+            timeout=timeout
         )
 
-        # Apply structured output with the specified schema for enhanced points
-        self.llm = self.llm.with_structured_output(schema=EnhancerSchema)
-
         # Define the prompt template for enhancing bullet points in resume descriptions
         self.enhanced_bullet_points_prompt_template = ChatPromptTemplate.from_messages([
             ("system", SYSTEM_PROMPT),  # System-level instructions for the rephrasing task
@@ -46,7 +62,17 @@ class ResumeRephraserNode:
         """
         Rephrases a list of description points to make them concise, impactful, and relevant to the job.
         Takes in a list of description points and a job description to tailor the content.
+        Identical (points, job description) pairs are served from the cache.
         """
+        key = stable_hash(
+            self.model, self.temperature, self.prompt_fingerprint, description_points, job_description
+        ) if self.cache is not None else None
+
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return list(cached)  # Copy, so callers never mutate the cached entry
+
         original_description = ""  # Initialize an empty string to concatenate the points
         for point in description_points:
             original_description += point  # Concatenate all points into a single string
@@ -60,60 +86,44 @@ class ResumeRephraserNode:
         # Invoke the LLM to get the enhanced description points
         output = self.llm.invoke(prompt)
 
+        if key is not None:
+            self.cache.set(key, output.enhanced_points)
+
         # Return the enhanced and rephrased points
         return output.enhanced_points
 
-    def process_experiences(self, experiences: list[Dict[str, Any]], job_description: str) -> list[Dict[str, Any]]:
-        """
-        Processes and enhances the descriptions in the experiences.
-        Iterates over the list of experiences and applies the rephrasing function.
-        """
-        for experience in experiences:
-            # If experience has a description and it's a list of points, rephrase it
-            if "description" in experience and isinstance(experience["description"], list):
-                experience["description"] = self.rephrase_description(
-                    experience["description"], job_description  # Rephrase using job description
-                )
-        return experiences
-
-    def process_projects(self, projects: list[Dict[str, Any]], job_description: str) -> list[Dict[str, Any]]:
-        """
-        Processes and enhances the descriptions in the projects.
-        Similar to experiences, applies the rephrasing function to project descriptions.
-        """
-        for project in projects:
-            # If project has a description and it's a list of points, rephrase it
-            if "description" in project and isinstance(project["description"], list):
-                project["description"] = self.rephrase_description(
-                    project["description"], job_description  # Rephrase using job description
-                )
-        return projects
-
     def __call__(self, state: NodeState, config: RunnableConfig) -> Dict[str, Any] | None:
         """
-        This method is called when the node is invoked. It processes user details (experiences and projects),
-        rephrasing them based on the job description and returning the updated user details.
+        This method is called when the node is invoked. It rephrases the descriptions of the selected
+        experiences and projects based on the job description and returns only the rephrased
+        descriptions, as an update of the profile overlay.
         """
-        user_details = state.user_details  # Extract user details from the state
+        # The profile as stored; the selection is applied below and the original points are rephrased
+        user_details = profile_store.resolve(state, with_overlay=False)
         job_description = state.job_description  # Extract job description from the state
 
         # If either user details or job description is missing, return None
         if not user_details or not job_description:
             return None
 
-        # Process experiences if available
-        if "experience" in user_details:
-            user_details["experience"] = self.process_experiences(
-                user_details["experience"], job_description  # Rephrase experiences
-            )
-
-        # Process projects if available
-        if "projects" in user_details:
-            user_details["projects"] = self.process_projects(
-                user_details["projects"], job_description  # Rephrase projects
-            )
+        # Rephrase experiences and projects together so all calls share one bounded pool.
+        # Only items whose description is a list of points are rephrased.
+        targets = [
+            (kind, index)
+            for kind in ("experiences", "projects")
+            for index in selected_indices(user_details, state.profile_overlay, kind)
+            if isinstance(user_details[kind][index].get("description"), list)
+        ]
+
+        rephrased = bounded_map(
+            lambda target: self.rephrase_description(user_details[target[0]][target[1]]["description"], job_description),
+            targets,
+            self.max_concurrency
+        )
 
-        # Return the updated user details
+        # Return the rephrased descriptions, keyed by the item they belong to
         return {
-            "user_details": user_details  # Return the enhanced user details
-        }
\ No newline at end of file
+            "profile_overlay": {
+                "descriptions": {overlay_key(kind, index): description for (kind, index), description in zip(targets, rephrased)}
+            }
+        }
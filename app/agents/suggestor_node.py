@@ -1,38 +1,67 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableConfig
-from langchain_openai import ChatOpenAI
 
 # Import custom prompts and types for experience, project, and skills evaluation
 from app.prompts.suggestor_prompt import (
     EXP_SYSTEM_PROMPT, EXP_PROMPT,
     PROJ_SYSTEM_PROMPT, PROJ_PROMPT,
-    SKILLS_SYSTEM_PROMPT, SKILLS_PROMPT
+    SKILLS_SYSTEM_PROMPT, SKILLS_PROMPT,
+    BATCH_SYSTEM_PROMPT, BATCH_PROMPT
 )
-from app.types.suggestor_schema import RatingSchema, SkillsSchema
+from app.types.suggestor_schema import RatingSchema, BatchRatingSchema, SkillsSchema
 from app.types.node_state import NodeState 
+from app.services.llm_registry import llm_registry
+from app.services.profile_store import profile_store
+from app.utils.concurrency import run_concurrently
+from app.utils.cache import TieredCache, stable_hash, fingerprint
+from app.utils.relevance import rank_by_relevance
 from app.config import settings
 
+# Rating given to items that were filtered out or never judged; below any real rating
+UNJUDGED_RATING = -1
+
 class SuggestorNode:
     def __init__(
         self,
         model: str = settings.LLM_MODEL,  # LLM model from settings
         temperature: float = settings.TEMPERATURE,  # Temperature for randomness in output
         max_tokens: int = settings.MAX_TOKENS,  # Max number of tokens for the output
-        timeout: float = settings.TIMEOUT  # Timeout for the API call
+        timeout: float = settings.TIMEOUT,  # Timeout for the API call
+        mode: str = settings.SUGGESTOR_MODE,  # "sequential", "concurrent" or "batched" rating of items
+        max_concurrency: int = settings.SUGGESTOR_MAX_CONCURRENCY,  # Cap on LLM calls in flight
+        cache_enabled: bool = settings.RATING_CACHE_ENABLED,  # Reuse ratings of unchanged (item, JD) pairs
+        prefilter_top_k: int | None = settings.SUGGESTOR_PREFILTER_TOP_K,  # Items per kind sent to the judge
+        early_exit_rating: int | None = settings.SUGGESTOR_EARLY_EXIT_RATING  # Rating that counts as a confident pick
     ) -> None:
-        # Initialize the LLM with the provided settings
-        self.llm = ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            timeout=timeout, 
-            cache=False  # Disable cache for fresh responses
-        ) 
-
-        # Structured Output for judging experiences and skills using defined schemas
-        self.judge_llm = self.llm.with_structured_output(schema=RatingSchema)  # Ratings for experiences and projects
-        self.llm = self.llm.with_structured_output(schema=SkillsSchema)  # Skills output
+        if mode not in ("sequential", "concurrent", "batched"):
+            raise ValueError(f"Unknown suggestor mode: {mode}")
+
+        self.mode = mode
+        self.max_concurrency = max_concurrency
+        self.model = model
+        self.prefilter_top_k = prefilter_top_k
+        self.early_exit_rating = early_exit_rating
+
+        # Memoized ratings keyed on (item, JD): bounded in-process LRU, optionally backed by SQLite
+        self.rating_cache = TieredCache.create(
+            namespace="relevance_ratings",
+            max_size=settings.RATING_CACHE_MAX_SIZE,
+            ttl=settings.RATING_CACHE_TTL,
+            path=settings.CACHE_DB_PATH if settings.RATING_CACHE_PERSISTENT else None
+        ) if cache_enabled else None
+
+        # Ratings depend on the judge prompts, so they are part of every cache key
+        self.prompt_fingerprint = fingerprint(
+            EXP_SYSTEM_PROMPT, EXP_PROMPT, PROJ_SYSTEM_PROMPT, PROJ_PROMPT, BATCH_SYSTEM_PROMPT, BATCH_PROMPT
+        )
+
+        # Shared structured-output LLMs from the registry for judging experiences and skills
+        llm_settings = dict(model=model, temperature=temperature, max_tokens=max_tokens, timeout=timeout)
+        self.judge_llm = llm_registry.get_structured_llm(schema=RatingSchema, **llm_settings)  # Ratings for experiences and projects
+        self.batch_judge_llm = llm_registry.get_structured_llm(schema=BatchRatingSchema, **llm_settings)  # Ratings for all items at once
+        self.llm = llm_registry.get_structured_llm(schema=SkillsSchema, **llm_settings)  # Skills output
 
         # Define prompt templates for different categories: experiences, projects, and skills
         self.exp_prompt_template = ChatPromptTemplate.from_messages([
@@ -50,75 +79,314 @@ class SuggestorNode:
             ("human", SKILLS_PROMPT)  # Human-level prompt for skill evaluation
         ])
 
-    def __call__(self, state: NodeState, config: RunnableConfig) -> Dict[str, Any] | None:
+        self.batch_prompt_template = ChatPromptTemplate.from_messages([
+            ("system", BATCH_SYSTEM_PROMPT),  # System-level instructions for batched evaluation
+            ("human", BATCH_PROMPT)  # Human-level prompt listing every item with its index
+        ])
+
+    def rating_key(self, kind: str, item: Dict[str, Any], job_description: Any) -> str:
         """
-        This method processes the user’s experiences, projects, and skills to determine the most relevant details
-        for a specific job description. It evaluates the experiences and projects, rates them, and filters the 
-        most relevant skills to return an updated version of the user's details.
+        Builds a stable cache key for an item's rating from the item's content, the job description,
+        the model and the judge prompts. Any edit to the item yields a new key.
         """
-        
-        rated_experiences = []  # List to store rated experiences
-        # Evaluate and rate each experience based on the job description
-        for experience in state.user_details["experiences"]:
-            prompt = self.exp_prompt_template.invoke({
-                "experience": experience,  # The user’s experience to be evaluated
-                "job_description": state.job_description  # The job description for context
-            })
+        return stable_hash(kind, item, job_description, self.model, self.prompt_fingerprint)
 
-            # Get the rating and append the experience with its rating
-            output = self.judge_llm.invoke(prompt)
-            rated_experiences.append((output.rating, experience))
-        
-        rated_projects = []  # List to store rated projects
-        # Evaluate and rate each project based on the job description
-        for project in state.user_details["projects"]:
-            prompt = self.proj_prompt_template.invoke({
-                "project": project,  # The user’s project to be evaluated
-                "job_description": state.job_description  # The job description for context
+    def cached_rating(self, kind: str, item: Dict[str, Any], job_description: Any) -> int | None:
+        """
+        Returns the memoized rating of an item, or None if it has to be judged.
+        """
+        if self.rating_cache is None:
+            return None
+        return self.rating_cache.get(self.rating_key(kind, item, job_description))
+
+    def store_rating(self, kind: str, item: Dict[str, Any], job_description: Any, rating: int) -> None:
+        """
+        Memoizes the rating of an item for later runs against the same job description.
+        """
+        if self.rating_cache is not None:
+            self.rating_cache.set(self.rating_key(kind, item, job_description), rating)
+
+    def rate_experience(self, experience: Dict[str, Any], job_description: Any) -> int:
+        """
+        Rates a single experience against the job description using the judge LLM.
+        """
+        rating = self.cached_rating("experience", experience, job_description)
+        if rating is not None:
+            return rating
+
+        prompt = self.exp_prompt_template.invoke({
+            "experience": experience,  # The user’s experience to be evaluated
+            "job_description": job_description  # The job description for context
+        })
+        rating = self.judge_llm.invoke(prompt).rating
+        self.store_rating("experience", experience, job_description, rating)
+        return rating
+
+    def rate_project(self, project: Dict[str, Any], job_description: Any) -> int:
+        """
+        Rates a single project against the job description using the judge LLM.
+        """
+        rating = self.cached_rating("project", project, job_description)
+        if rating is not None:
+            return rating
+
+        prompt = self.proj_prompt_template.invoke({
+            "project": project,  # The user’s project to be evaluated
+            "job_description": job_description  # The job description for context
+        })
+        rating = self.judge_llm.invoke(prompt).rating
+        self.store_rating("project", project, job_description, rating)
+        return rating
+
+    def rate_batch(
+        self,
+        experiences: List[Dict[str, Any]],
+        projects: List[Dict[str, Any]],
+        job_description: Any
+    ) -> List[int]:
+        """
+        Rates every experience and project in a single structured-output request, so the job
+        description is sent once instead of once per item. Items are indexed experiences first,
+        then projects. Memoized items are left out of the request. Any index missing from the batch
+        response is rated with an individual call.
+
+        Returns:
+            List[int]: One rating per item, experiences followed by projects.
+        """
+        items = [("experience", exp) for exp in experiences] + [("project", proj) for proj in projects]
+
+        # Start from the memoized ratings and only send the remaining items to the judge
+        ratings = {}
+        for index, (kind, item) in enumerate(items):
+            rating = self.cached_rating(kind, item, job_description)
+            if rating is not None:
+                ratings[index] = rating
+
+        pending = [index for index in range(len(items)) if index not in ratings]
+        if pending:
+            # Items are re-indexed from 0 in the prompt; position maps back to the item index
+            labels = {"experience": "Work Experience", "project": "Project"}
+            listing = "\n\n".join(
+                f"[{position}] {labels[items[index][0]]}:\n{items[index][1]}"
+                for position, index in enumerate(pending)
+            )
+            prompt = self.batch_prompt_template.invoke({
+                "items": listing,  # Every item prefixed with its index
+                "job_description": job_description  # The job description, sent only once
             })
+            output = self.batch_judge_llm.invoke(prompt)
 
-            # Get the rating and append the project with its rating
-            output = self.judge_llm.invoke(prompt)
-            rated_projects.append((output.rating, project))
-        
-        # Evaluate the relevance of skills to the job description
+            # Keep only ratings for indices that were actually listed
+            for r in output.ratings:
+                if 0 <= r.index < len(pending):
+                    index = pending[r.index]
+                    ratings[index] = r.rating
+                    self.store_rating(*items[index], job_description, r.rating)
+
+        # Fall back to per-item judgements for any index the batch response skipped
+        missing = [index for index in range(len(items)) if index not in ratings]
+        if missing:
+            fallback = run_concurrently([
+                (lambda i=i: self.rate_experience(experiences[i], job_description)) if i < len(experiences)
+                else (lambda i=i: self.rate_project(projects[i - len(experiences)], job_description))
+                for i in missing
+            ], self.max_concurrency)
+            ratings.update(zip(missing, fallback))
+
+        return [ratings[index] for index in range(len(items))]
+
+    def selection_slots(self, num_experiences: int, num_projects: int) -> tuple[int, int]:
+        """
+        Returns how many experiences and projects the top-2 selection logic keeps for the given counts,
+        i.e. how many of the best-rated items of each kind actually matter.
+        """
+        if (num_experiences < 2 and num_projects < 2) or (num_experiences > 2 and num_projects > 2):
+            return min(2, num_experiences), min(2, num_projects)
+
+        if num_experiences < 2 and num_projects >= 2:
+            return num_experiences, min(2 + (2 - num_experiences), num_projects)
+
+        if num_experiences >= 2 and num_projects < 2:
+            return min(2 + (2 - num_projects), num_experiences), num_projects
+
+        return num_experiences, num_projects  # All items are kept
+
+    def candidates(self, items: List[Dict[str, Any]], job_description: Any, slots: int) -> List[int]:
+        """
+        Returns the indices of the items to send to the judge, most lexically relevant first.
+        With the prefilter enabled only the top-K items are kept, but never fewer than the slots to fill.
+        """
+        if self.prefilter_top_k is None and self.early_exit_rating is None:
+            return list(range(len(items)))
+
+        # Cheap local scoring pass against the job's skills and responsibilities
+        order = rank_by_relevance(items, job_description)
+
+        if self.prefilter_top_k is not None:
+            order = order[:max(self.prefilter_top_k, slots)]
+        return order
+
+    def judge_items(
+        self,
+        experiences: List[Dict[str, Any]],
+        projects: List[Dict[str, Any]],
+        job_description: Any,
+        skills_task: Callable[[], List[str]]
+    ) -> tuple[List[int], List[int], List[str]]:
+        """
+        Rates the candidate experiences and projects with per-item judge calls, alongside the skills selection.
+
+        Every candidate is dispatched in one concurrent round, most relevant first and alternating between
+        experiences and projects, with at most max_concurrency calls in flight (one at a time in sequential
+        mode). Once a kind has enough items rated at or above early_exit_rating to fill its slots, its calls
+        that have not started yet are cancelled. Items that are never judged get UNJUDGED_RATING.
+
+        Returns:
+            tuple[List[int], List[int], List[str]]: Experience ratings, project ratings and the relevant skills.
+        """
+        items = {"experience": experiences, "project": projects}
+        rate = {"experience": self.rate_experience, "project": self.rate_project}
+        slots = dict(zip(items, self.selection_slots(len(experiences), len(projects))))
+        queues = {kind: self.candidates(items[kind], job_description, slots[kind]) for kind in items}
+        ratings = {kind: {} for kind in items}
+
+        def filled(kind: str) -> bool:
+            # Enough confident picks to fill every slot of this kind
+            if self.early_exit_rating is None:
+                return False
+            confident = sum(1 for rating in ratings[kind].values() if rating >= self.early_exit_rating)
+            return confident >= slots[kind]
+
+        # Alternate between the kinds, so each gets its most relevant candidates judged first
+        order = [
+            (kind, queues[kind][position])
+            for position in range(max(len(queue) for queue in queues.values()))
+            for kind in items if position < len(queues[kind])
+        ]
+
+        if self.mode != "concurrent":
+            relevant_skills = skills_task()
+            for kind, index in order:
+                if not filled(kind):
+                    ratings[kind][index] = rate[kind](items[kind][index], job_description)
+
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, self.max_concurrency)) as executor:
+                skills_future = executor.submit(skills_task)
+                futures = {
+                    executor.submit(rate[kind], items[kind][index], job_description): (kind, index)
+                    for kind, index in order
+                }
+
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    kind, index = futures[future]
+                    ratings[kind][index] = future.result()
+
+                    if filled(kind):
+                        # Calls already running finish; the ones still queued are dropped
+                        for pending, (pending_kind, _) in futures.items():
+                            if pending_kind == kind:
+                                pending.cancel()
+
+                relevant_skills = skills_future.result()
+
+        return (
+            [ratings["experience"].get(index, UNJUDGED_RATING) for index in range(len(experiences))],
+            [ratings["project"].get(index, UNJUDGED_RATING) for index in range(len(projects))],
+            relevant_skills
+        )
+
+    def select_skills(self, skills: Any, job_description: Any) -> List[str]:
+        """
+        Selects the user's skills that are most relevant to the job description.
+        """
         prompt = self.skills_prompt_template.invoke({
-            "skills": state.user_details["skills"],  # The user’s skills to be evaluated
-            "job_description": state.job_description  # The job description for context
+            "skills": skills,  # The user’s skills to be evaluated
+            "job_description": job_description  # The job description for context
         })
+        return self.llm.invoke(prompt).skills
 
-        output = self.llm.invoke(prompt)
-        relevant_skills = output.skills  # Extract relevant skills for the job description
+    def __call__(self, state: NodeState, config: RunnableConfig) -> Dict[str, Any] | None:
+        """
+        This method processes the user’s experiences, projects, and skills to determine the most relevant details
+        for a specific job description. It evaluates the experiences and projects, rates them, and filters the 
+        most relevant skills. Only the selection is returned, as an update of the profile overlay.
+        """
+        # Judge the profile as given, whatever an earlier run on this thread selected
+        user_details = profile_store.resolve(state, with_overlay=False)
+        experiences = user_details["experiences"]
+        projects = user_details["projects"]
+
+        skills_task = lambda: self.select_skills(user_details["skills"], state.job_description)
+
+        if self.mode == "batched":
+            # Prefilter locally, then rate the remaining candidates in one request alongside the skills selection
+            exp_slots, proj_slots = self.selection_slots(len(experiences), len(projects))
+            exp_candidates = self.candidates(experiences, state.job_description, exp_slots)
+            proj_candidates = self.candidates(projects, state.job_description, proj_slots)
+
+            ratings, relevant_skills = run_concurrently([
+                lambda: self.rate_batch(
+                    [experiences[index] for index in exp_candidates],
+                    [projects[index] for index in proj_candidates],
+                    state.job_description
+                ),
+                skills_task
+            ], self.max_concurrency)
+
+            # Map the candidate ratings back onto the full lists
+            exp_ratings = [UNJUDGED_RATING] * len(experiences)
+            proj_ratings = [UNJUDGED_RATING] * len(projects)
+            for index, rating in zip(exp_candidates, ratings[:len(exp_candidates)]):
+                exp_ratings[index] = rating
+            for index, rating in zip(proj_candidates, ratings[len(exp_candidates):]):
+                proj_ratings[index] = rating
+
+        else:
+            exp_ratings, proj_ratings, relevant_skills = self.judge_items(
+                experiences, projects, state.job_description, skills_task
+            )
+
+        rated_experiences = list(zip(exp_ratings, range(len(experiences))))  # (rating, index) pairs
+        rated_projects = list(zip(proj_ratings, range(len(projects))))  # (rating, index) pairs
 
         # Sort experiences and projects by rating in descending order
         rated_experiences.sort(reverse=True, key=lambda x: x[0])
         rated_projects.sort(reverse=True, key=lambda x: x[0])
 
-        # Logic to update the user's experiences and projects based on the ratings
+        # Keep all items, in their original order, unless the rules below narrow them down
+        selected_experiences = list(range(len(experiences)))
+        selected_projects = list(range(len(projects)))
+
+        # Logic to select the user's experiences and projects based on the ratings
         if (
             (len(rated_experiences) < 2 and len(rated_projects) < 2) or  # Less than 2 experiences and projects
             (len(rated_experiences) > 2 and len(rated_projects) > 2)  # More than 2 experiences and projects
         ):
             # Select top 2 rated experiences and projects
-            state.user_details["experiences"] = [exp for _, exp in rated_experiences[:2]]
-            state.user_details["projects"] = [proj for _, proj in rated_projects[:2]]
+            selected_experiences = [index for _, index in rated_experiences[:2]]
+            selected_projects = [index for _, index in rated_projects[:2]]
 
         elif len(rated_experiences) < 2 and len(rated_projects) >= 2:
             # Select 2 experiences, and the remaining required number of projects
-            state.user_details["experiences"] = [exp for _, exp in rated_experiences[:2]]
-            extra_projects = 2 - len(state.user_details["experiences"])
-            state.user_details["projects"] = [proj for _, proj in rated_projects[:2 + extra_projects]]
+            selected_experiences = [index for _, index in rated_experiences[:2]]
+            extra_projects = 2 - len(selected_experiences)
+            selected_projects = [index for _, index in rated_projects[:2 + extra_projects]]
         
         elif len(rated_experiences) >= 2 and len(rated_projects) < 2:
             # Select 2 projects, and the remaining required number of experiences
-            state.user_details["projects"] = [proj for _, proj in rated_projects[:2]]
-            extra_experiences = 2 - len(state.user_details["projects"])
-            state.user_details["experiences"] = [exp for _, exp in rated_experiences[:2 + extra_experiences]]
-
-        # Update skills with the most relevant skills for the job description
-        state.user_details["skills"] = relevant_skills
+            selected_projects = [index for _, index in rated_projects[:2]]
+            extra_experiences = 2 - len(selected_projects)
+            selected_experiences = [index for _, index in rated_experiences[:2 + extra_experiences]]
 
-        # Return the updated user details with the most relevant experiences, projects, and skills
+        # Return the selected experiences and projects, by index in the stored profile, and the most
+        # relevant skills. Descriptions rephrased for an earlier job description are dropped.
         return {
-            "user_details": state.user_details
+            "profile_overlay": {
+                "selected": {"experiences": selected_experiences, "projects": selected_projects},
+                "skills": relevant_skills,
+                "descriptions": None
+            }
         }
@@ -0,0 +1,256 @@
+import sys
+import json
+import time
+import logging
+import argparse
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.agents.jda_node import JDANode
+from app.agents.suggestor_node import SuggestorNode
+from app.agents.resume_rephraser_node import ResumeRephraserNode
+from app.agents.cover_letter_rephraser_node import CoverLetterRephraserNode
+from app.agents.craft_resume_node import CraftResumeNode
+from app.agents.craft_cover_letter_node import CraftCoverLetterNode
+from app.types.jd_schema import JDSchema
+from app.types.node_state import NodeState
+from app.services.profile_store import profile_store
+from app.utils.cache import normalize_text
+from app.utils.concurrency import bounded_map
+from app.utils.message_window import window_messages
+from app.utils.profile_overlay import merge_overlay
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Stages of a bulk run, in pipeline order
+STAGES = ("jd_analysis", "exp_suggestor", "rephraser", "craft")
+
+
+@dataclass
+class BulkJobResult:
+    """
+    Outcome of crafting a document for one job description.
+
+    Attributes:
+        index (int): Position of the job description in the bulk request.
+        job_description (Optional[JDSchema]): The analysed job description.
+        message (Optional[str]): The crafting node's reply, e.g. the link to the document.
+        user_details (Optional[Dict[str, Any]]): The profile tailored to this job description.
+        cover_letter (Optional[str]): The cover letter text, for cover letter runs.
+        timings (Dict[str, float]): Seconds spent in each stage.
+        error (Optional[str]): Why the job failed, if it did.
+    """
+    index: int
+    job_description: Optional[JDSchema] = None
+    message: Optional[str] = None
+    user_details: Optional[Dict[str, Any]] = None
+    cover_letter: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.timings.values())
+
+
+@dataclass
+class BulkResult:
+    """
+    Results of a bulk run, one per job description in request order, with the run's wall time.
+    """
+    results: List[BulkJobResult]
+    wall_seconds: float
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Aggregate timings: per stage mean/p95/max over the jobs that reached it, plus throughput.
+        """
+        stages = {}
+        for stage in STAGES:
+            durations = sorted(result.timings[stage] for result in self.results if stage in result.timings)
+            if durations:
+                stages[stage] = {
+                    "mean_seconds": sum(durations) / len(durations),
+                    "p95_seconds": durations[int(0.95 * (len(durations) - 1))],
+                    "max_seconds": durations[-1],
+                }
+
+        succeeded = sum(1 for result in self.results if result.error is None)
+        sequential = sum(result.total_seconds for result in self.results)
+        return {
+            "jobs": len(self.results),
+            "succeeded": succeeded,
+            "failed": len(self.results) - succeeded,
+            "wall_seconds": self.wall_seconds,
+            "sequential_seconds": sequential,  # Time the same work takes one job at a time
+            "jobs_per_second": len(self.results) / self.wall_seconds if self.wall_seconds else 0.0,
+            "stages": stages,
+        }
+
+
+class BulkCrafter:
+    """
+    Tailors one candidate profile to many job descriptions at once.
+
+    The graph's per-request steps are skipped or shared: there is no preprocessing (the intent
+    and job descriptions are given), the profile is stored once and every job refers to it, repeated
+    postings are analysed once, and every job runs through the same node instances, so LLM
+    clients and the JD, rating and rephrasing caches are shared. Jobs then run concurrently
+    through JD analysis, suggestion, rephrasing and crafting.
+
+    Attributes:
+        intent (str): "resume" or "cover_letter".
+        max_concurrency (int): Number of job descriptions processed at once.
+    """
+
+    def __init__(
+        self,
+        intent: str = "resume",
+        max_concurrency: int = settings.BULK_MAX_CONCURRENCY,
+        jda: JDANode | None = None,
+        suggestor: SuggestorNode | None = None,
+        rephraser: ResumeRephraserNode | CoverLetterRephraserNode | None = None,
+        crafter: CraftResumeNode | CraftCoverLetterNode | None = None
+    ) -> None:
+        if intent not in ("resume", "cover_letter"):
+            raise ValueError(f"Unknown intent: {intent}")
+
+        self.intent = intent
+        self.max_concurrency = max_concurrency
+        self.jda = jda or JDANode()
+        self.suggestor = suggestor or SuggestorNode()
+        if intent == "resume":
+            self.rephraser = rephraser or ResumeRephraserNode()
+            self.crafter = crafter or CraftResumeNode()
+        else:
+            self.rephraser = rephraser or CoverLetterRephraserNode()
+            self.crafter = crafter or CraftCoverLetterNode()
+
+    def run(self, user_details: Dict[str, Any], job_descriptions: List[str]) -> BulkResult:
+        """
+        Crafts a resume or cover letter for every job description.
+
+        Args:
+            user_details (Dict[str, Any]): The candidate's profile, shaped like `resumes/*.json` as in
+                                           the graph state.
+            job_descriptions (List[str]): The job postings.
+
+        Returns:
+            BulkResult: Per job results in input order, with timings.
+        """
+        start = time.perf_counter()
+
+        # Stored once; the jobs only carry its id and their own overlay of changes
+        profile_id = profile_store.put(user_details)
+
+        # Analyse each distinct posting once
+        distinct: Dict[str, str] = {}
+        for job_description in job_descriptions:
+            distinct.setdefault(normalize_text(job_description), job_description)
+
+        analysed = dict(zip(distinct, bounded_map(self._analyse, list(distinct.values()), self.max_concurrency)))
+
+        results = bounded_map(
+            lambda job: self._craft(job[0], job[1], analysed[normalize_text(job[1])], profile_id),
+            list(enumerate(job_descriptions)),
+            self.max_concurrency
+        )
+
+        result = BulkResult(results=results, wall_seconds=time.perf_counter() - start)
+        logger.info("Bulk run: %s", json.dumps(result.summary()))
+        return result
+
+    def _analyse(self, job_description: str) -> tuple[JDSchema | None, float, str | None]:
+        start = time.perf_counter()
+        try:
+            return self.jda.extract(job_description), time.perf_counter() - start, None
+        except Exception as e:
+            logger.exception("JD analysis failed")
+            return None, time.perf_counter() - start, str(e)
+
+    def _craft(
+        self,
+        index: int,
+        job_description: str,
+        analysed: tuple[JDSchema | None, float, str | None],
+        profile_id: str
+    ) -> BulkJobResult:
+        structured_jd, jd_seconds, jd_error = analysed
+        result = BulkJobResult(index=index, job_description=structured_jd, timings={"jd_analysis": jd_seconds})
+        if jd_error is not None:
+            result.error = jd_error
+            return result
+
+        state = NodeState(
+            messages=[HumanMessage(content=job_description)],
+            intent=self.intent,
+            is_jd_given=True,
+            job_description=structured_jd,
+            profile_id=profile_id
+        )
+        config = {"configurable": {"thread_id": None}, "metadata": {}}
+
+        stages: List[tuple[str, Callable]] = [
+            ("exp_suggestor", self.suggestor),
+            ("rephraser", self.rephraser),
+            ("craft", self.crafter),
+        ]
+
+        for stage, node in stages:
+            start = time.perf_counter()
+            try:
+                self._apply(state, node(state, config))
+            except Exception as e:
+                logger.exception("Bulk job %d failed in %s", index, stage)
+                result.error = f"{stage}: {e}"
+                return result
+            finally:
+                result.timings[stage] = time.perf_counter() - start
+
+        replies = [message.content for message in state.messages if isinstance(message, AIMessage)]
+        result.message = replies[-1] if replies else None
+        result.user_details = profile_store.resolve(state)
+        result.cover_letter = state.cover_letter or None
+        return result
+
+    @staticmethod
+    def _apply(state: NodeState, update: Dict[str, Any] | None) -> None:
+        # Merge a node's update into the state the way the graph would
+        for key, value in (update or {}).items():
+            if key == "messages":
+                state.messages = window_messages(state.messages, value)
+            elif key == "profile_overlay":
+                state.profile_overlay = merge_overlay(state.profile_overlay, value)
+            else:
+                setattr(state, key, value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Craft resumes or cover letters for many job descriptions at once.")
+    parser.add_argument("profile", help="Path to the candidate's profile JSON, e.g. resumes/john_doe.json")
+    parser.add_argument("job_descriptions", nargs="+", help="Paths to text files holding one job description each")
+    parser.add_argument("--intent", choices=["resume", "cover_letter"], default="resume")
+    parser.add_argument("--max-concurrency", type=int, default=settings.BULK_MAX_CONCURRENCY)
+    args = parser.parse_args()
+
+    with open(args.profile) as f:
+        profile = json.load(f)
+
+    job_descriptions = []
+    for path in args.job_descriptions:
+        with open(path) as f:
+            job_descriptions.append(f.read())
+
+    result = BulkCrafter(intent=args.intent, max_concurrency=args.max_concurrency).run(profile, job_descriptions)
+
+    for path, job in zip(args.job_descriptions, result.results):
+        timings = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in job.timings.items())
+        print(f"{path}: {job.error or job.message} [{timings}]")
+    json.dump(result.summary(), sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
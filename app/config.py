@@ -1,5 +1,5 @@
 import os 
-from typing import List
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -8,16 +8,110 @@ class Settings(BaseSettings):
     RESUME_PARSER_API_KEY: str = os.environ["RESUME_PARSER_API_KEY"]
     SERVICE_ACCOUNT: str = os.environ["SERVICE_ACCOUNT"]
 
+    CHECKPOINTER: str = "memory"  # "memory", "bounded_memory" or "postgres"
+    CHECKPOINT_DURABILITY: str = "async"  # "sync", "async" or "exit" (one checkpoint write per run); applied through app.main.run_options()
+    CHECKPOINT_MAX_THREADS: int = 10000  # bounded_memory: threads held before the least recently used is dropped
+    CHECKPOINT_MAX_BYTES: int = 512 * 1024 * 1024  # bounded_memory: serialized bytes held across threads
+    CHECKPOINT_THREAD_TTL: Optional[float] = 24 * 3600.0  # bounded_memory: seconds a thread may stay idle
+    CHECKPOINT_KEEP_LAST: int = 5  # bounded_memory: checkpoints kept per thread
+    POSTGRES_POOL_MIN_SIZE: int = 1
+    POSTGRES_POOL_MAX_SIZE: int = 10
+    POSTGRES_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    POSTGRES_SETUP: bool = True  # Create or migrate the checkpoint tables at startup
+
+    PROFILE_STORE: Optional[str] = None  # "memory", "sqlite" or "postgres"; None uses "postgres" with the Postgres checkpointer, else "memory"
+    PROFILE_STORE_MAX_SIZE: int = 10000  # memory: profiles held before the least recently used is dropped
+    PROFILE_CACHE_SIZE: int = 256  # sqlite/postgres: profiles kept in process after being read
+
+    NODE_WARMUP: str = "lazy"  # Build graph nodes "eager" at import, in the "background" after import, or "lazy" on first call
+    COLD_START_BUDGET: float = 1.5  # Seconds allowed for importing app.main, checked by the startup profiler
+
+    MESSAGE_WINDOW: Optional[int] = 20  # Messages kept in the thread state; None keeps the whole history
+    MESSAGE_COMPACT_CHARS: Optional[int] = 2000  # User messages this long are replaced by a reference once their JD is extracted; None disables
+
     LLM_MODEL: str = "gpt-4o"
     TEMPERATURE: float = 0.0
     MAX_TOKENS: int = 4096
     TIMEOUT: float = 300.0
 
+    LLM_POOL_MAX_CONNECTIONS: int = 100
+    LLM_POOL_MAX_KEEPALIVE: int = 20
+    LLM_POOL_KEEPALIVE_EXPIRY: float = 30.0
+
+    SUGGESTOR_MODE: str = "concurrent"  # "sequential", "concurrent" or "batched"
+    SUGGESTOR_MAX_CONCURRENCY: int = 8
+    SUGGESTOR_PREFILTER_TOP_K: Optional[int] = 4  # Items per kind sent to the judge; None judges all
+    SUGGESTOR_EARLY_EXIT_RATING: Optional[int] = 9  # Rating that fills a slot early; None disables early exit
+
+    REPHRASER_MAX_CONCURRENCY: int = 8
+
+    DATA_DIR: str = "~/.career_craft"  # Local state, e.g. the cache database; relative paths of other settings are resolved against it
+    CACHE_DB_PATH: str = "cache.sqlite3"  # Relative to DATA_DIR; empty string disables persistent cache tiers
+    CACHE_MAX_ROWS: Optional[int] = 100000  # Entries each cache keeps in the database before the oldest are dropped; None for no cap
+    CACHE_STATS_LOG_EVERY: Optional[int] = 1000  # Lookups between hit/miss stats logged per cache at info level; None disables
+
+    JD_CACHE_ENABLED: bool = True
+    JD_CACHE_MAX_SIZE: int = 1024
+    JD_CACHE_TTL: float = 7 * 24 * 3600.0
+
+    RATING_CACHE_ENABLED: bool = True
+    RATING_CACHE_MAX_SIZE: int = 4096
+    RATING_CACHE_TTL: float = 7 * 24 * 3600.0
+    RATING_CACHE_PERSISTENT: bool = False
+
+    REPHRASE_CACHE_ENABLED: bool = True
+    REPHRASE_CACHE_MAX_SIZE: int = 2048
+    REPHRASE_CACHE_TTL: Optional[float] = None  # Seconds; None keeps entries until evicted
+
+    COVER_LETTER_STREAMING: bool = True
+
+    INTENT_RULES_ENABLED: bool = True
+    INTENT_RULES_MIN_CONFIDENCE: float = 0.8
+    INTENT_RULES_JD_MIN_CHARS: int = 300
+    INTENT_RULES_SHORT_REPLY_CHARS: int = 80
+
     GCP_SECRET_VERSION: str = os.environ["SECRET_VERSION"]
     GCP_SCOPES: List[str] = [
         "https://www.googleapis.com/auth/documents",
         "https://www.googleapis.com/auth/drive",
         "https://www.googleapis.com/auth/gmail.send"
     ]
+    GCP_TOKEN_REFRESH_MARGIN: float = 300.0  # Seconds before expiry at which tokens are refreshed
+    GCP_BACKGROUND_REFRESH: bool = True
+
+    DRIVE_UPLOAD_RESUMABLE_THRESHOLD: int = 5 * 1024 * 1024  # Bytes; larger uploads are chunked
+    DRIVE_UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # Bytes; must be a multiple of 256 KiB
+    DRIVE_SHARE_PERMISSIONS: List[Dict[str, str]] = [{"type": "anyone", "role": "writer"}]
+
+    GOOGLE_API_RATES: Dict[str, float] = {"docs": 5.0, "drive": 10.0, "gmail": 2.0}  # Requests per second
+    GOOGLE_API_BURSTS: Dict[str, int] = {"docs": 10, "drive": 20, "gmail": 5}
+    GOOGLE_API_MAX_QUEUE: int = 100  # Calls waiting per API before new ones are rejected
+    GOOGLE_API_MAX_RETRIES: int = 5
+    GOOGLE_API_BACKOFF_BASE: float = 0.5  # Seconds
+    GOOGLE_API_BACKOFF_MAX: float = 32.0  # Seconds
+    GOOGLE_API_ACQUIRE_TIMEOUT: float = 60.0  # Seconds a call may wait for a rate limit slot
+
+    PUBLISH_MODE: str = "sync"  # "sync" or "async"
+    PUBLISH_WORKERS: int = 4
+    PUBLISH_MAX_JOBS_KEPT: int = 1000
+    PUBLISH_ATTACH_TIMEOUT: float = 60.0  # Seconds a finished job waits for the queuing run to end before attaching its result
+    PUBLISH_ATTACH_POLL_INTERVAL: float = 0.05
+
+    MAIL_TRANSPORT: str = "gmail"  # "gmail" or "local"
+    MAIL_LOCAL_DIR: Optional[str] = None  # Where the local transport writes .eml files, if anywhere
+    MAIL_BATCH_SIZE: int = 25  # Emails per Gmail batch request
+    MAIL_BATCH_LINGER: float = 0.5  # Seconds to wait for a batch to fill up
+    MAIL_MAX_RETRIES: int = 5
+    MAIL_MAX_QUEUE: int = 10000
+    COVER_LETTER_EMAIL: bool = False  # Email the cover letter link to the user
+
+    BULK_MAX_CONCURRENCY: int = 8  # Job descriptions processed at once in bulk runs
+
+    RESUME_OUTPUT_FORMAT: str = "docx"  # "docx", "markdown" or "html"; text formats are returned inline
+
+    DOCUMENT_SINK: str = "google"  # "google", "local" or "fake"
+    LOCAL_SINK_DIR: str = ".cache/documents"
+    FAKE_SINK_LATENCY: float = 0.0  # Seconds injected per publish by the fake sink
+    FAKE_SINK_JITTER: float = 0.0  # Extra random seconds, up to this value
 
 settings  = Settings()
\ No newline at end of file
@@ -1,31 +1,40 @@
+import time
+import logging
+import threading
+from typing import Dict
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
-
-# Import agent nodes and handlers
-from app.agents.preprocessor_node import QueryPreprocessorNode
-from app.agents.jda_node import JDANode
-from app.agents.suggestor_node import SuggestorNode
-from app.agents.resume_rephraser_node import ResumeRephraserNode
-from app.agents.cover_letter_rephraser_node import CoverLetterRephraserNode
-from app.agents.craft_resume_node import CraftResumeNode
-from app.agents.craft_cover_letter_node import CraftCoverLetterNode
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+# Import agent nodes and handlers; agent nodes are imported and built on first use
+from app.agents.lazy_node import LazyNode
 from app.agents.handler_nodes import get_missing_jd, get_missing_intent
 
 from app.routers import handle_doc_type, handle_missing_info
+from app.services.publish_queue import publish_queue
+from app.services.checkpointer import create_checkpointer, create_async_postgres_checkpointer
 from app.types.node_state import NodeState
 from app.types.config_schema import ConfigSchema
+from app.config import settings
+
+logger = logging.getLogger(__name__)
 
 # Initialize the StateGraph with schemas for state management and configuration
 graph_builder = StateGraph(state_schema=NodeState, config_schema=ConfigSchema)
 
+# Agent nodes, by graph node name. Each is constructed on its first call, or when warmed up
+nodes: Dict[str, LazyNode] = {
+    "query_preprocessor": LazyNode("app.agents.preprocessor_node:QueryPreprocessorNode"),
+    "jd_analysis": LazyNode("app.agents.jda_node:JDANode"),
+    "exp_suggestor": LazyNode("app.agents.suggestor_node:SuggestorNode"),
+    "resume_rephraser": LazyNode("app.agents.resume_rephraser_node:ResumeRephraserNode"),
+    "cover_letter_rephraser": LazyNode("app.agents.cover_letter_rephraser_node:CoverLetterRephraserNode"),
+    "craft_resume": LazyNode("app.agents.craft_resume_node:CraftResumeNode"),
+    "craft_cover_letter": LazyNode("app.agents.craft_cover_letter_node:CraftCoverLetterNode"),
+}
+
 # Add Nodes: These define the individual processing steps in the workflow
-graph_builder.add_node(node="query_preprocessor", action=QueryPreprocessorNode())
-graph_builder.add_node(node="jd_analysis", action=JDANode())
-graph_builder.add_node(node="exp_suggestor", action=SuggestorNode())
-graph_builder.add_node(node="resume_rephraser", action=ResumeRephraserNode())
-graph_builder.add_node(node="cover_letter_rephraser", action=CoverLetterRephraserNode())
-graph_builder.add_node(node="craft_resume", action=CraftResumeNode())
-graph_builder.add_node(node="craft_cover_letter", action=CraftCoverLetterNode())
+for name, node in nodes.items():
+    graph_builder.add_node(node=name, action=node)
 
 # Add handler nodes for missing data
 graph_builder.add_node(node="get_missing_jd", action=get_missing_jd)
@@ -71,10 +80,64 @@ graph_builder.add_edge("craft_resume", END)
 # Set the entry point for the workflow
 graph_builder.set_entry_point("query_preprocessor")
 
-# Compile the graph with a checkpointing mechanism for state persistence
-checkpointer = MemorySaver()
-graph = graph_builder.compile(
-    checkpointer=checkpointer,
-    interrupt_before=["get_missing_jd", "get_missing_intent"],  # Interrupt points for user input
-    interrupt_after=[]  # No interruptions post these nodes
-)
+def compile_graph(checkpointer: BaseCheckpointSaver):
+    """
+    Compiles the graph with a checkpointing mechanism for state persistence. Runs choose how
+    often checkpoints are written through the `durability` argument of `invoke`/`stream`; pass
+    `**run_options()` to use CHECKPOINT_DURABILITY.
+    """
+    return graph_builder.compile(
+        checkpointer=checkpointer,
+        interrupt_before=["get_missing_jd", "get_missing_intent"],  # Interrupt points for user input
+        interrupt_after=[]  # No interruptions post these nodes
+    )
+
+
+def run_options() -> Dict[str, str]:
+    """
+    Keyword arguments for `graph.invoke`/`graph.stream` (and their async variants) that apply
+    the configured CHECKPOINT_DURABILITY, e.g. `graph.invoke(input, config, **run_options())`.
+    """
+    return {"durability": settings.CHECKPOINT_DURABILITY}
+
+
+async def compile_async_graph():
+    """
+    Compiles the graph for async runs (`ainvoke`/`astream`), which need an async checkpointer
+    when thread state is kept in Postgres.
+    """
+    if settings.CHECKPOINTER == "postgres":
+        return compile_graph(await create_async_postgres_checkpointer())
+    return graph
+
+
+# Thread state is kept in memory or in Postgres, depending on CHECKPOINTER
+checkpointer = create_checkpointer()
+graph = compile_graph(checkpointer)
+
+# Let background publishing jobs attach their results to the conversation thread
+publish_queue.bind_graph(graph)
+
+
+def warm_up() -> Dict[str, float]:
+    """
+    Builds every agent node that has not been called yet, so no request pays for it.
+
+    Returns:
+        Dict[str, float]: Seconds spent importing and constructing each node, by node name.
+    """
+    timings = {}
+    for name, node in nodes.items():
+        start = time.perf_counter()
+        node.node
+        timings[name] = time.perf_counter() - start
+
+    logger.info("Nodes warmed up in %.3fs", sum(timings.values()))
+    return timings
+
+
+# Build the nodes now, in the background after startup, or only on their first call
+if settings.NODE_WARMUP == "eager":
+    warm_up()
+elif settings.NODE_WARMUP == "background":
+    threading.Thread(target=warm_up, name="node-warmup", daemon=True).start()
@@ -47,4 +47,23 @@ Job Description:
 {job_description}
 
 NOTE: Select top 10 skills only.
-"""
\ No newline at end of file
+"""
+
+BATCH_SYSTEM_PROMPT = """
+You're an expert judge who can give high quality ratings for user's work experiences and projects to the given job description.
+A high score indicates that the item is highly relevant to the job description and vice-versa.
+"""
+
+BATCH_PROMPT = """
+Rate out of 10 each of the user's work experiences and projects listed below against the job description.
+Every item is prefixed with its index in square brackets.
+
+User's Items:
+{items}
+
+Job Description:
+{job_description}
+
+Analyze each item independently and give a score out of 0-10. 
+Return exactly one rating per index listed above.
+"""
@@ -0,0 +1,283 @@
+import time
+import atexit
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Iterator, Optional, Sequence, Set, Tuple
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver, ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+)
+from langgraph.checkpoint.memory import InMemorySaver, MemorySaver
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Connection settings required by the Postgres checkpointer
+POSTGRES_CONNECTION_KWARGS = {"autocommit": True, "prepare_threshold": 0}
+
+
+def create_checkpointer(kind: str = settings.CHECKPOINTER) -> BaseCheckpointSaver:
+    """
+    Creates the checkpointer that stores the graph's thread state.
+
+    Args:
+        kind (str): "memory" to keep threads in this process, "bounded_memory" to keep them in
+                    this process within CHECKPOINT_MAX_* limits, "postgres" to store them in
+                    POSTGRES_DB_URI, where every worker can resume them, including threads
+                    parked at an interrupt.
+
+    Returns:
+        BaseCheckpointSaver: The checkpointer.
+    """
+    if kind == "memory":
+        return MemorySaver()
+    if kind == "bounded_memory":
+        return BoundedMemorySaver()
+    if kind == "postgres":
+        return create_postgres_checkpointer()
+    raise ValueError(f"Unknown checkpointer: {kind}")
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """
+    In-memory checkpointer whose footprint is bounded, for long-running workers.
+
+    - Only the last `keep_last` checkpoints of each thread are kept, together with their
+      pending writes and the channel values they reference; older ones are pruned on write.
+    - Threads idle for longer than `ttl` seconds are dropped.
+    - When more than `max_threads` threads are held, or their serialized size exceeds
+      `max_bytes`, the least recently used threads are dropped.
+
+    A dropped thread starts over on its next message, so limits should leave room for
+    conversations parked at an interrupt. Pruned checkpoints can no longer be replayed.
+
+    Attributes:
+        max_threads (int): Maximum number of threads held.
+        max_bytes (int): Maximum serialized bytes held across threads.
+        ttl (Optional[float]): Seconds a thread may stay idle; None keeps idle threads.
+        keep_last (int): Checkpoints kept per thread and namespace.
+    """
+
+    def __init__(
+        self,
+        max_threads: int = settings.CHECKPOINT_MAX_THREADS,
+        max_bytes: int = settings.CHECKPOINT_MAX_BYTES,
+        ttl: Optional[float] = settings.CHECKPOINT_THREAD_TTL,
+        keep_last: int = settings.CHECKPOINT_KEEP_LAST,
+        **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.keep_last = max(1, keep_last)
+
+        self._lock = threading.RLock()
+        self._last_used: OrderedDict[str, float] = OrderedDict()  # Least recently used first
+        self._thread_bytes: Dict[str, int] = {}
+        self._versions: Dict[Tuple[str, str, str], Dict[str, Any]] = {}  # Channel versions per checkpoint
+        self._blob_keys: Dict[str, Set[tuple]] = defaultdict(set)
+        self._write_keys: Dict[str, Set[tuple]] = defaultdict(set)
+        self._counters = {"pruned_checkpoints": 0, "expired_threads": 0, "evicted_threads": 0}
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            self._expire()
+            result = super().get_tuple(config)
+
+            if thread_id in self._last_used:
+                self._touch(thread_id)
+            elif not any(self.storage.get(thread_id, {}).values()):
+                # The lookup created empty entries for an unknown thread
+                self.storage.pop(thread_id, None)
+            return result
+
+    def list(self, config: RunnableConfig | None, **kwargs: Any) -> Iterator[CheckpointTuple]:
+        # Collected under the lock, so concurrent writes can't change the dicts mid-iteration
+        with self._lock:
+            checkpoints = [*super().list(config, **kwargs)]
+        yield from checkpoints
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+
+        with self._lock:
+            saved = super().put(config, checkpoint, metadata, new_versions)
+
+            self._versions[(thread_id, checkpoint_ns, checkpoint["id"])] = dict(checkpoint["channel_versions"])
+            self._blob_keys[thread_id].update((thread_id, checkpoint_ns, k, v) for k, v in new_versions.items())
+            self._prune(thread_id, checkpoint_ns)
+            self._touch(thread_id)
+            self._measure(thread_id)
+            self._enforce_limits(keep=thread_id)
+            return saved
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+
+        with self._lock:
+            super().put_writes(config, writes, task_id, task_path)
+
+            self._write_keys[thread_id].add((thread_id, checkpoint_ns, config["configurable"]["checkpoint_id"]))
+            self._touch(thread_id)
+            self._measure(thread_id)
+            self._enforce_limits(keep=thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        # Uses the per-thread key index instead of scanning every stored blob and write
+        with self._lock:
+            self.storage.pop(thread_id, None)
+            for key in self._write_keys.pop(thread_id, set()):
+                self.writes.pop(key, None)
+            for key in self._blob_keys.pop(thread_id, set()):
+                self.blobs.pop(key, None)
+            for key in [key for key in self._versions if key[0] == thread_id]:
+                del self._versions[key]
+            self._last_used.pop(thread_id, None)
+            self._thread_bytes.pop(thread_id, None)
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        Returns the threads, checkpoints and serialized bytes held, plus eviction counters.
+        """
+        with self._lock:
+            return {
+                "threads": len(self._last_used),
+                "checkpoints": len(self._versions),
+                "bytes": sum(self._thread_bytes.values()),
+                "max_bytes": self.max_bytes,
+                "largest_thread_bytes": max(self._thread_bytes.values(), default=0),
+                **self._counters,
+            }
+
+    def _touch(self, thread_id: str) -> None:
+        self._last_used[thread_id] = time.monotonic()
+        self._last_used.move_to_end(thread_id)
+
+    def _prune(self, thread_id: str, checkpoint_ns: str) -> None:
+        # Drop all but the newest keep_last checkpoints; checkpoint ids sort by creation time
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if len(checkpoints) <= self.keep_last:
+            return
+
+        for checkpoint_id in sorted(checkpoints)[:-self.keep_last]:
+            del checkpoints[checkpoint_id]
+            self._versions.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            self._write_keys[thread_id].discard((thread_id, checkpoint_ns, checkpoint_id))
+            self._counters["pruned_checkpoints"] += 1
+
+        # Drop channel values no remaining checkpoint of the namespace refers to
+        referenced = {
+            (thread_id, checkpoint_ns, channel, version)
+            for checkpoint_id in checkpoints
+            for channel, version in self._versions.get((thread_id, checkpoint_ns, checkpoint_id), {}).items()
+        }
+        for key in [key for key in self._blob_keys[thread_id] if key[1] == checkpoint_ns and key not in referenced]:
+            self.blobs.pop(key, None)
+            self._blob_keys[thread_id].discard(key)
+
+    def _measure(self, thread_id: str) -> None:
+        size = sum(
+            len(checkpoint[1]) + len(metadata[1])
+            for checkpoints in self.storage.get(thread_id, {}).values()
+            for checkpoint, metadata, _ in checkpoints.values()
+        )
+        size += sum(len(self.blobs[key][1]) for key in self._blob_keys[thread_id] if key in self.blobs)
+        size += sum(
+            len(value[2][1])
+            for key in self._write_keys[thread_id]
+            for value in self.writes.get(key, {}).values()
+        )
+        self._thread_bytes[thread_id] = size
+
+    def _expire(self) -> None:
+        if self.ttl is None:
+            return
+        deadline = time.monotonic() - self.ttl
+        while self._last_used and next(iter(self._last_used.values())) < deadline:
+            self.delete_thread(next(iter(self._last_used)))
+            self._counters["expired_threads"] += 1
+
+    def _enforce_limits(self, keep: str) -> None:
+        self._expire()
+        while len(self._last_used) > 1 and (
+            len(self._last_used) > self.max_threads or sum(self._thread_bytes.values()) > self.max_bytes
+        ):
+            # Evict the least recently used thread, never the one being written
+            victim = next(thread_id for thread_id in self._last_used if thread_id != keep)
+            logger.info("Evicting checkpoint thread %s", victim)
+            self.delete_thread(victim)
+            self._counters["evicted_threads"] += 1
+
+
+def create_postgres_checkpointer(uri: str = settings.POSTGRES_DB_URI) -> BaseCheckpointSaver:
+    """
+    Creates a Postgres checkpointer backed by a pool of connections shared by all threads.
+    The checkpoint tables are created or migrated first when POSTGRES_SETUP is set.
+    """
+    # Imported here so the Postgres driver is only needed when it is used
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+    from langgraph.checkpoint.postgres import PostgresSaver
+
+    pool = ConnectionPool(
+        conninfo=uri,
+        min_size=settings.POSTGRES_POOL_MIN_SIZE,
+        max_size=settings.POSTGRES_POOL_MAX_SIZE,
+        timeout=settings.POSTGRES_POOL_TIMEOUT,
+        kwargs={**POSTGRES_CONNECTION_KWARGS, "row_factory": dict_row},
+        open=True
+    )
+    atexit.register(pool.close)
+
+    checkpointer = PostgresSaver(pool)
+    if settings.POSTGRES_SETUP:
+        checkpointer.setup()
+
+    logger.info("Postgres checkpointer ready (pool of %d-%d connections)", pool.min_size, pool.max_size)
+    return checkpointer
+
+
+async def create_async_postgres_checkpointer(uri: str = settings.POSTGRES_DB_URI) -> BaseCheckpointSaver:
+    """
+    Async counterpart of `create_postgres_checkpointer`, for graphs run with `ainvoke`/`astream`.
+    Must be awaited inside the event loop that runs the graph; the pool is closed with `pool.close()`
+    on the returned checkpointer's `conn`.
+    """
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+    pool = AsyncConnectionPool(
+        conninfo=uri,
+        min_size=settings.POSTGRES_POOL_MIN_SIZE,
+        max_size=settings.POSTGRES_POOL_MAX_SIZE,
+        timeout=settings.POSTGRES_POOL_TIMEOUT,
+        kwargs={**POSTGRES_CONNECTION_KWARGS, "row_factory": dict_row},
+        open=False
+    )
+    await pool.open()
+
+    checkpointer = AsyncPostgresSaver(pool)
+    if settings.POSTGRES_SETUP:
+        await checkpointer.setup()
+
+    return checkpointer
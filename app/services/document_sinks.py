@@ -0,0 +1,134 @@
+import os
+import re
+import time
+import uuid
+import random
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Tuple
+
+from app.config import settings
+
+
+class DocumentSink(ABC):
+    """
+    Destination for crafted documents. A sink stores a rendered document and returns a link to it.
+    """
+
+    @abstractmethod
+    def publish_docx(self, title: str, content: bytes) -> str:
+        """
+        Stores a rendered .docx document.
+
+        Args:
+            title (str): The document title.
+            content (bytes): The rendered .docx document.
+
+        Returns:
+            str: A link to the stored document.
+        """
+
+    @abstractmethod
+    def publish_text(self, title: str, text: str) -> str:
+        """
+        Stores a plain text document, e.g. a cover letter.
+
+        Args:
+            title (str): The document title.
+            text (str): The document content.
+
+        Returns:
+            str: A link to the stored document.
+        """
+
+
+class LocalDirectorySink(DocumentSink):
+    """
+    Writes documents into a local directory and returns `file://` links. Useful for running
+    the full graph offline.
+
+    Attributes:
+        directory (str): The directory documents are written to.
+    """
+
+    def __init__(self, directory: str = settings.LOCAL_SINK_DIR) -> None:
+        self.directory = os.path.abspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def publish_docx(self, title: str, content: bytes) -> str:
+        return self._write(title, ".docx", content)
+
+    def publish_text(self, title: str, text: str) -> str:
+        return self._write(title, ".txt", text.encode("UTF-8"))
+
+    def _write(self, title: str, extension: str, content: bytes) -> str:
+        # A unique suffix keeps concurrent documents with the same title apart
+        name = re.sub(r"[^\w.-]+", "_", title).strip("_") or "document"
+        path = os.path.join(self.directory, f"{name}-{uuid.uuid4().hex[:8]}{extension}")
+        with open(path, "wb") as f:
+            f.write(content)
+        return f"file://{path}"
+
+
+class FakeDocumentSink(DocumentSink):
+    """
+    Keeps documents in memory after an injected delay that stands in for network latency,
+    so throughput tests can run on a box with no network.
+
+    Attributes:
+        latency (float): Seconds each publish call sleeps.
+        jitter (float): Extra random delay of up to this many seconds per call.
+        documents (Dict[str, Tuple[str, bytes]]): Published documents by id, as (title, content).
+    """
+
+    def __init__(self, latency: float = settings.FAKE_SINK_LATENCY, jitter: float = settings.FAKE_SINK_JITTER) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.documents: Dict[str, Tuple[str, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def publish_docx(self, title: str, content: bytes) -> str:
+        return self._store(title, content)
+
+    def publish_text(self, title: str, text: str) -> str:
+        return self._store(title, text.encode("UTF-8"))
+
+    def _store(self, title: str, content: bytes) -> str:
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        document_id = uuid.uuid4().hex
+        with self._lock:
+            self.documents[document_id] = (title, content)
+        return f"fake://documents/{document_id}"
+
+
+_sinks: Dict[str, DocumentSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_document_sink(kind: str = settings.DOCUMENT_SINK) -> DocumentSink:
+    """
+    Returns the process-wide document sink of the given kind.
+
+    Args:
+        kind (str): "google" for Google Docs/Drive, "local" for a local directory, "fake" for in-memory.
+
+    Returns:
+        DocumentSink: The shared sink instance.
+    """
+    with _sinks_lock:
+        if kind not in _sinks:
+            if kind == "google":
+                # Imported here so offline backends never load the Google client libraries
+                from app.services.google_publisher import google_publisher
+                _sinks[kind] = google_publisher
+            elif kind == "local":
+                _sinks[kind] = LocalDirectorySink()
+            elif kind == "fake":
+                _sinks[kind] = FakeDocumentSink()
+            else:
+                raise ValueError(f"Unknown document sink: {kind}")
+
+        return _sinks[kind]
@@ -0,0 +1,149 @@
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from google.oauth2 import service_account
+
+logger = logging.getLogger(__name__)
+
+
+class GoogleClientProvider:
+    """
+    Lazily authenticates with Google Cloud and hands out cached API clients shared by all nodes.
+
+    Nothing happens at construction time: the Google client libraries are only imported once
+    they are needed, the service account is fetched from Secret Manager on the first request for
+    credentials, and every Docs/Drive/Gmail client is built on first use. Built clients are cached
+    per thread, because the underlying httplib2 transport is not thread-safe. A background thread
+    refreshes the access token before it expires, so requests never wait on a token refresh.
+
+    Attributes:
+        scopes (List[str]): The scopes required for Google Cloud API access.
+        secret_version (str): Secret Manager version holding the service account JSON.
+        refresh_margin (float): Seconds before expiry at which the token is refreshed.
+        background_refresh (bool): Whether to refresh tokens in a background thread.
+    """
+
+    def __init__(
+        self,
+        scopes: List[str] = settings.GCP_SCOPES,
+        secret_version: str = settings.GCP_SECRET_VERSION,
+        refresh_margin: float = settings.GCP_TOKEN_REFRESH_MARGIN,
+        background_refresh: bool = settings.GCP_BACKGROUND_REFRESH
+    ) -> None:
+        self.scopes = scopes
+        self.secret_version = secret_version
+        self.refresh_margin = refresh_margin
+        self.background_refresh = background_refresh
+
+        self._credentials = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._refresher: threading.Thread | None = None
+
+    @property
+    def credentials(self) -> "service_account.Credentials":
+        """
+        The service account credentials, authenticated on first access.
+        """
+        if self._credentials is None:
+            with self._lock:
+                if self._credentials is None:
+                    self._credentials = self.authenticate()
+                    if self.background_refresh:
+                        self._start_refresher()
+        return self._credentials
+
+    def authenticate(self) -> "service_account.Credentials":
+        """
+        Authenticates with Google Cloud using a service account stored in Secret Manager.
+
+        Returns:
+            Credentials: Google Cloud service account credentials.
+        """
+        from google.cloud import secretmanager
+        from google.oauth2 import service_account
+
+        secretmanager_client = secretmanager.SecretManagerServiceClient()
+        response = secretmanager_client.access_secret_version(name=self.secret_version)
+
+        # Decode the service account JSON stored in Secret Manager
+        service_account_info = json.loads(response.payload.data.decode("UTF-8"))
+
+        # Create credentials for Google Cloud APIs
+        return service_account.Credentials.from_service_account_info(
+            service_account_info, scopes=self.scopes
+        )
+
+    def service(self, api: str, version: str) -> Any:
+        """
+        Returns the calling thread's client for a Google API, building it on first use.
+
+        Args:
+            api (str): The API name, e.g. "docs", "drive" or "gmail".
+            version (str): The API version, e.g. "v1".
+
+        Returns:
+            Resource: The discovery-based API client.
+        """
+        services: Dict[Tuple[str, str], Any] = self._local.__dict__.setdefault("services", {})
+        if (api, version) not in services:
+            from googleapiclient.discovery import build
+            services[(api, version)] = build(api, version, credentials=self.credentials, cache_discovery=False)
+        return services[(api, version)]
+
+    @property
+    def docs(self) -> Any:
+        return self.service("docs", "v1")
+
+    @property
+    def drive(self) -> Any:
+        return self.service("drive", "v3")
+
+    @property
+    def gmail(self) -> Any:
+        return self.service("gmail", "v1")
+
+    def close(self) -> None:
+        """
+        Stops the background token refresher.
+        """
+        self._stop.set()
+
+    def _start_refresher(self) -> None:
+        self._refresher = threading.Thread(target=self._refresh_loop, name="google-token-refresher", daemon=True)
+        self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        from google.auth.transport.requests import Request
+
+        while not self._stop.is_set():
+            try:
+                credentials = self._credentials
+                if credentials.expiry is None or self._seconds_to_expiry(credentials) <= self.refresh_margin:
+                    credentials.refresh(Request())
+
+                # Sleep until shortly before the new token expires
+                wait = max(self._seconds_to_expiry(credentials) - self.refresh_margin, 30.0)
+
+            except Exception as e:
+                logger.warning("Google token refresh failed: %s", e)
+                wait = 30.0
+
+            self._stop.wait(wait)
+
+    @staticmethod
+    def _seconds_to_expiry(credentials: "service_account.Credentials") -> float:
+        # google-auth stores expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return (credentials.expiry - now).total_seconds()
+
+
+# Provider shared by every node in the process
+google_clients = GoogleClientProvider()
@@ -0,0 +1,187 @@
+import io
+import time
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+from googleapiclient.http import MediaIoBaseUpload
+
+from app.services.document_sinks import DocumentSink
+from app.services.google_clients import GoogleClientProvider, google_clients
+from app.services.google_scheduler import GoogleAPIScheduler, google_scheduler
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_DOC_MIME_TYPE = "application/vnd.google-apps.document"
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class GoogleDocsPublisher(DocumentSink):
+    """
+    Publishes documents as shared Google Docs using as few API round trips as possible.
+
+    Content is uploaded as media on the Drive `files.create` call and converted to a Google Doc
+    server side, so a document is created with its content in one request. Permission grants
+    are then sent together in one Google batch HTTP request. Every API call goes through the
+    shared scheduler, which keeps it within the Drive quota and retries transient failures; a
+    single-request `files.create` is only retried on quota errors, since retrying a timeout or
+    5xx could leave a duplicate document behind.
+    Calls are timed: every publish is logged with the time of each of its calls, and the
+    timings of the calling thread's last publish and cumulative per-call stats are kept.
+
+    Attributes:
+        google (GoogleClientProvider): Provider of the Drive client.
+        permissions (List[Dict[str, str]]): Drive permissions granted on every published document.
+        scheduler (GoogleAPIScheduler): Rate limits and retries the API calls.
+    """
+
+    def __init__(
+        self,
+        google: GoogleClientProvider = google_clients,
+        permissions: List[Dict[str, str]] = settings.DRIVE_SHARE_PERMISSIONS,
+        scheduler: GoogleAPIScheduler = google_scheduler
+    ) -> None:
+        self.google = google
+        self.permissions = permissions
+        self.scheduler = scheduler
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(lambda: {"calls": 0, "total_seconds": 0.0})
+
+    def publish_text(self, title: str, text: str) -> str:
+        """
+        Creates a shared Google Doc holding plain text, e.g. a cover letter.
+
+        Args:
+            title (str): The document title.
+            text (str): The document content.
+
+        Returns:
+            str: A sharable link to the Google Doc.
+        """
+        self._local.timings = []
+        media = MediaIoBaseUpload(io.BytesIO(text.encode("UTF-8")), mimetype="text/plain")
+        file_id = self._create(title, media)
+        self.share(file_id)
+        self._log_publish(title)
+        return self.link(file_id)
+
+    def publish_docx(self, title: str, content: bytes) -> str:
+        """
+        Uploads a .docx document from memory, converts it to a shared Google Doc and returns its link.
+        Documents of at least DRIVE_UPLOAD_RESUMABLE_THRESHOLD bytes are sent as a chunked,
+        resumable upload; smaller ones go in a single request.
+
+        Args:
+            title (str): The document title.
+            content (bytes): The rendered .docx document.
+
+        Returns:
+            str: A sharable link to the Google Doc.
+        """
+        self._local.timings = []
+        resumable = len(content) >= settings.DRIVE_UPLOAD_RESUMABLE_THRESHOLD
+        media = MediaIoBaseUpload(
+            io.BytesIO(content),
+            mimetype=DOCX_MIME_TYPE,
+            chunksize=settings.DRIVE_UPLOAD_CHUNK_SIZE,
+            resumable=resumable
+        )
+        file_id = self._create(title, media)
+        self.share(file_id)
+        self._log_publish(title)
+        return self.link(file_id)
+
+    def share(self, file_id: str) -> None:
+        """
+        Grants the configured permissions on a file, all of them in one batch request.
+        """
+        drive = self.google.drive
+        requests = [
+            drive.permissions().create(fileId=file_id, body=permission, fields="id")
+            for permission in self.permissions
+        ]
+
+        if not requests:
+            return
+
+        def execute_batch() -> None:
+            # A fresh batch per attempt, so a retry resends every grant
+            errors = []
+            batch = drive.new_batch_http_request(
+                callback=lambda request_id, response, exception: exception and errors.append(exception)
+            )
+            for request in requests:
+                batch.add(request)
+
+            batch.execute()
+            if errors:
+                raise errors[0]
+
+        self._timed("drive.permissions.batch", execute_batch)
+
+    @staticmethod
+    def link(file_id: str) -> str:
+        return f"https://docs.google.com/document/d/{file_id}/edit"
+
+    @property
+    def last_timings(self) -> List[Tuple[str, float]]:
+        """
+        The (call, seconds) timings of the calling thread's most recent publish.
+        """
+        return list(getattr(self._local, "timings", []))
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Cumulative call counts and durations per API call.
+        """
+        with self._lock:
+            return {name: dict(values) for name, values in self._stats.items()}
+
+    def _create(self, title: str, media: MediaIoBaseUpload) -> str:
+        # Create the Google Doc with its content in the same request
+        request = self.google.drive.files().create(
+            body={"name": title, "mimeType": GOOGLE_DOC_MIME_TYPE},
+            media_body=media,
+            fields="id"
+        )
+
+        if media.resumable():
+            def upload() -> Dict[str, Any]:
+                response = None
+                while response is None:
+                    _, response = request.next_chunk()  # Sends one chunk per call
+                return response
+
+            # A retry resumes the same upload session, so it cannot create a second document
+            return self._timed("drive.files.create (resumable)", upload)["id"]
+
+        # Only quota errors are retried: a timeout or 5xx may come after the document was created
+        return self._timed("drive.files.create", request.execute, idempotent=False)["id"]
+
+    def _timed(self, name: str, call: Callable[[], Any], idempotent: bool = True) -> Any:
+        start = time.perf_counter()
+        try:
+            return self.scheduler.execute("drive", call, idempotent=idempotent)
+        finally:
+            elapsed = time.perf_counter() - start
+            getattr(self._local, "timings", []).append((name, elapsed))
+            with self._lock:
+                self._stats[name]["calls"] += 1
+                self._stats[name]["total_seconds"] += elapsed
+            logger.debug("Google API call %s took %.3fs", name, elapsed)
+
+    def _log_publish(self, title: str) -> None:
+        # One line per published document, with the time of each API call it took
+        timings = self.last_timings
+        logger.info(
+            "Published %r in %.3fs over %d API calls: %s",
+            title, sum(seconds for _, seconds in timings), len(timings),
+            ", ".join(f"{name} {seconds:.3f}s" for name, seconds in timings)
+        )
+
+
+# Publisher shared by the crafting nodes
+google_publisher = GoogleDocsPublisher()
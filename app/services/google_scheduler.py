@@ -0,0 +1,151 @@
+import time
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, TypeVar
+from googleapiclient.errors import HttpError
+
+from app.utils.rate_limiter import TokenBucket, backoff_delay
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Reasons Google gives for quota errors returned with a 403 instead of a 429
+RATE_LIMIT_REASONS = ("ratelimitexceeded", "userratelimitexceeded", "quotaexceeded")
+
+
+class GoogleAPIScheduler:
+    """
+    Schedules calls to Google APIs within their quotas.
+
+    Every API (Docs, Drive, Gmail) has its own token bucket, so bursts from the crafting nodes
+    are spread out to the configured rate instead of tripping per-user quotas; callers beyond
+    the bounded queue are rejected. Calls failing with 429, a rate-limit 403, a 5xx or a
+    connection error are retried with exponential backoff and full jitter, honouring
+    Retry-After when Google sends it.
+
+    Attributes:
+        max_retries (int): Retries per call after the first attempt.
+        backoff_base (float): Seconds of the first backoff step.
+        backoff_max (float): Upper bound of a single backoff delay in seconds.
+        acquire_timeout (float): Maximum seconds a call waits for a rate limit slot.
+    """
+
+    def __init__(
+        self,
+        rates: Dict[str, float] = settings.GOOGLE_API_RATES,
+        bursts: Dict[str, int] = settings.GOOGLE_API_BURSTS,
+        max_queue: int = settings.GOOGLE_API_MAX_QUEUE,
+        max_retries: int = settings.GOOGLE_API_MAX_RETRIES,
+        backoff_base: float = settings.GOOGLE_API_BACKOFF_BASE,
+        backoff_max: float = settings.GOOGLE_API_BACKOFF_MAX,
+        acquire_timeout: float = settings.GOOGLE_API_ACQUIRE_TIMEOUT
+    ) -> None:
+        self.buckets = {
+            api: TokenBucket(rate=rate, capacity=bursts.get(api, 1), max_queue=max_queue)
+            for api, rate in rates.items()
+        }
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.acquire_timeout = acquire_timeout
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"calls": 0, "retries": 0, "failures": 0, "throttled_seconds": 0.0}
+        )
+
+    def execute(self, api: str, call: Callable[[], T], cost: float = 1, idempotent: bool = True) -> T:
+        """
+        Runs a Google API call within the API's rate limit, retrying transient failures.
+
+        Args:
+            api (str): The API the call goes to, e.g. "docs", "drive" or "gmail".
+            call (Callable[[], T]): Sends the request, e.g. a request's `execute`.
+            cost (float): Rate limit tokens the call takes, e.g. the number of requests in a batch.
+            idempotent (bool): Whether the call may be repeated after any transient failure. Calls that are
+                               not, e.g. creating a file or sending emails, are only retried on quota
+                               errors, which Google returns before acting; a timeout or 5xx may come
+                               after the server has acted, so those are raised.
+
+        Returns:
+            T: The call's result.
+
+        Raises:
+            RateLimitExceeded: If no rate limit slot is available in time.
+            HttpError: If the call fails with a non-retryable error or retries run out.
+        """
+        bucket = self.buckets.get(api)
+        retryable = self.is_retryable if idempotent else self.is_rate_limited
+
+        for attempt in range(self.max_retries + 1):
+            if bucket is not None:
+                waited = bucket.acquire(timeout=self.acquire_timeout, tokens=cost)
+                self._record(api, "throttled_seconds", waited)
+
+            self._record(api, "calls")
+            try:
+                return call()
+
+            except (HttpError, ConnectionError, TimeoutError) as e:
+                if attempt == self.max_retries or not retryable(e):
+                    self._record(api, "failures")
+                    raise
+
+                delay = max(backoff_delay(attempt, self.backoff_base, self.backoff_max), self.retry_after(e))
+                self._record(api, "retries")
+                logger.warning("Google %s call failed (%s), retry %d in %.2fs", api, e, attempt + 1, delay)
+                time.sleep(delay)
+
+    @classmethod
+    def is_retryable(cls, error: Exception) -> bool:
+        """
+        Whether an error is transient: quota errors, server errors and connection failures.
+        """
+        if not isinstance(error, HttpError):
+            return True
+        return error.resp.status >= 500 or cls.is_rate_limited(error)
+
+    @staticmethod
+    def is_rate_limited(error: Exception) -> bool:
+        """
+        Whether an error is a quota error: a 429, or a 403 with a rate limit reason. Google rejects
+        such requests before acting on them, so they are safe to retry for any call.
+        """
+        if not isinstance(error, HttpError):
+            return False
+
+        status = error.resp.status
+        if status == 429:
+            return True
+        if status != 403:
+            return False
+
+        details = error.error_details if isinstance(error.error_details, list) else []
+        reasons = [str(error.reason)] + [str(detail.get("reason", "")) for detail in details if isinstance(detail, dict)]
+        return any(reason.replace(" ", "").lower() in RATE_LIMIT_REASONS for reason in reasons)
+
+    @staticmethod
+    def retry_after(error: Exception) -> float:
+        # Google sends Retry-After in seconds on some quota errors
+        try:
+            return float(error.resp.get("retry-after", 0))
+        except (AttributeError, TypeError, ValueError):
+            return 0.0
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Cumulative calls, retries, failures and time spent waiting on the rate limit, per API.
+        """
+        with self._lock:
+            return {api: dict(values) for api, values in self._stats.items()}
+
+    def _record(self, api: str, key: str, value: float = 1) -> None:
+        with self._lock:
+            self._stats[api][key] += value
+
+
+# Scheduler shared by every Google API call in the process
+google_scheduler = GoogleAPIScheduler()
@@ -0,0 +1,121 @@
+import threading
+from typing import TYPE_CHECKING, Dict, Tuple, Type
+import httpx
+from pydantic import BaseModel
+from langchain_core.runnables import Runnable
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+# (model, temperature, max_tokens, timeout)
+ClientKey = Tuple[str, float, int, float]
+
+
+class LLMRegistry:
+    """
+    A process-wide registry of chat model clients shared by all graph nodes.
+
+    Clients are keyed by (model, temperature, max_tokens, timeout) and all of them send
+    requests through one pair of keep-alive HTTP connection pools (sync and async), so
+    nodes reuse warm connections instead of each paying for its own TLS handshakes.
+    Structured-output wrappers are cached per (client, schema).
+
+    Attributes:
+        limits (httpx.Limits): Connection pool limits shared by every client.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = settings.LLM_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections: int = settings.LLM_POOL_MAX_KEEPALIVE,
+        keepalive_expiry: float = settings.LLM_POOL_KEEPALIVE_EXPIRY
+    ) -> None:
+        """
+        Initializes the registry. HTTP pools and clients are created lazily on first use.
+
+        Args:
+            max_connections (int): Maximum number of concurrent connections in the pool.
+            max_keepalive_connections (int): Maximum number of idle connections kept alive.
+            keepalive_expiry (float): Seconds an idle connection is kept before being closed.
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+
+        self._lock = threading.Lock()
+        self._http_client: httpx.Client | None = None
+        self._http_async_client: httpx.AsyncClient | None = None
+        self._clients: Dict[ClientKey, "ChatOpenAI"] = {}
+        self._structured: Dict[Tuple[ClientKey, Type[BaseModel]], Runnable] = {}
+
+    def get_chat_model(
+        self,
+        model: str = settings.LLM_MODEL,
+        temperature: float = settings.TEMPERATURE,
+        max_tokens: int = settings.MAX_TOKENS,
+        timeout: float = settings.TIMEOUT
+    ) -> "ChatOpenAI":
+        """
+        Returns the shared chat model for the given settings, creating it on first request.
+        The OpenAI client libraries are imported on the first request too, as they are slow to load.
+
+        Returns:
+            ChatOpenAI: A client backed by the shared connection pools.
+        """
+        key = (model, temperature, max_tokens, timeout)
+
+        with self._lock:
+            if key not in self._clients:
+                from langchain_openai import ChatOpenAI
+                from openai import DefaultHttpxClient, DefaultAsyncHttpxClient
+
+                # Pools are created once and handed to every client
+                if self._http_client is None:
+                    self._http_client = DefaultHttpxClient(limits=self.limits)
+                    self._http_async_client = DefaultAsyncHttpxClient(limits=self.limits)
+
+                self._clients[key] = ChatOpenAI(
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=timeout,
+                    cache=False,  # Ensures fresh responses without caching
+                    http_client=self._http_client,
+                    http_async_client=self._http_async_client
+                )
+
+            return self._clients[key]
+
+    def get_structured_llm(
+        self,
+        schema: Type[BaseModel],
+        model: str = settings.LLM_MODEL,
+        temperature: float = settings.TEMPERATURE,
+        max_tokens: int = settings.MAX_TOKENS,
+        timeout: float = settings.TIMEOUT
+    ) -> Runnable:
+        """
+        Returns the shared structured-output wrapper of a chat model for the given schema.
+
+        Args:
+            schema (Type[BaseModel]): The pydantic schema the model output is parsed into.
+
+        Returns:
+            Runnable: The cached `with_structured_output` runnable.
+        """
+        llm = self.get_chat_model(model, temperature, max_tokens, timeout)
+        key = ((model, temperature, max_tokens, timeout), schema)
+
+        with self._lock:
+            if key not in self._structured:
+                self._structured[key] = llm.with_structured_output(schema=schema)
+
+            return self._structured[key]
+
+
+# Registry shared by every node in the process
+llm_registry = LLMRegistry()
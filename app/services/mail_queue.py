@@ -0,0 +1,360 @@
+import os
+import time
+import uuid
+import base64
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Any, Deque, Dict, List, Optional
+
+from app.utils.rate_limiter import backoff_delay
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MailQueueFull(Exception):
+    """
+    Raised when an email is enqueued while MAIL_MAX_QUEUE emails are already waiting.
+    """
+
+
+class MailQueueClosed(Exception):
+    """
+    Raised when an email is enqueued after the queue was closed.
+    """
+
+
+@dataclass
+class OutboundMail:
+    """
+    An email waiting in, or delivered by, the mail queue.
+
+    Attributes:
+        mail_id (str): Unique identifier of the email.
+        message (EmailMessage): The email to deliver.
+        status (str): One of "queued", "sent" or "failed".
+        attempts (int): Delivery attempts made so far.
+        next_attempt_at (float): Monotonic time before which the email is not retried.
+        error (Optional[str]): The last delivery error, if any.
+    """
+    mail_id: str
+    message: EmailMessage
+    enqueued_at: float
+    status: str = "queued"
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    sent_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+class MailTransport(ABC):
+    """
+    Delivers batches of emails.
+    """
+
+    @abstractmethod
+    def send_batch(self, messages: List[EmailMessage]) -> List[Optional[Exception]]:
+        """
+        Sends the emails together where the transport allows it.
+
+        Args:
+            messages (List[EmailMessage]): The emails to send.
+
+        Returns:
+            List[Optional[Exception]]: Per email, None if it was sent or the error it failed with.
+        """
+
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Whether an email that failed with this error should be sent again.
+        """
+        return True
+
+
+class GmailTransport(MailTransport):
+    """
+    Sends emails through the Gmail API, all emails of a batch in one Google batch HTTP request.
+    The batch goes through the Google API scheduler and takes one Gmail rate limit token per email.
+
+    The batch is only retried as a whole on quota errors, which Google returns before sending
+    anything; after any other failure some of its emails may have been delivered. Each email's
+    outcome is reported instead, so the mail queue only sends the failed ones again.
+    """
+
+    def __init__(self, google: Any = None, scheduler: Any = None) -> None:
+        # Imported here so the local transport never loads the Google client libraries
+        from app.services.google_clients import google_clients
+        from app.services.google_scheduler import google_scheduler
+
+        self.google = google or google_clients
+        self.scheduler = scheduler or google_scheduler
+
+    def send_batch(self, messages: List[EmailMessage]) -> List[Optional[Exception]]:
+        gmail = self.google.gmail
+        results: List[Optional[Exception]] = [None] * len(messages)
+        reported = [False] * len(messages)
+        sent = False
+
+        def callback(request_id: str, response: Any, exception: Exception | None) -> None:
+            results[int(request_id)] = exception
+            reported[int(request_id)] = True
+
+        def execute_batch() -> None:
+            nonlocal sent
+            batch = gmail.new_batch_http_request(callback=callback)
+            for index, message in enumerate(messages):
+                raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
+                batch.add(gmail.users().messages().send(userId="me", body={"raw": raw}), request_id=str(index))
+            sent = True
+            batch.execute()
+
+        try:
+            self.scheduler.execute("gmail", execute_batch, cost=len(messages), idempotent=False)
+        except Exception as e:
+            if not sent:
+                # Nothing left the process, e.g. no rate limit slot was available
+                raise
+            # Emails whose outcome was not reported before the failure count as failed with it
+            for index in range(len(messages)):
+                if not reported[index]:
+                    results[index] = e
+        return results
+
+    def is_retryable(self, error: Exception) -> bool:
+        return self.scheduler.is_retryable(error)
+
+
+class LocalMailTransport(MailTransport):
+    """
+    Stand-in transport that keeps sent emails in memory and, optionally, writes them to a
+    directory as .eml files. Used for tests and offline runs.
+
+    Attributes:
+        directory (Optional[str]): Directory the .eml files are written to, if any.
+        outbox (List[EmailMessage]): Every email sent, in order.
+        batches (List[int]): The size of every batch sent.
+    """
+
+    def __init__(self, directory: Optional[str] = settings.MAIL_LOCAL_DIR) -> None:
+        self.directory = directory
+        self.outbox: List[EmailMessage] = []
+        self.batches: List[int] = []
+        self._lock = threading.Lock()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def send_batch(self, messages: List[EmailMessage]) -> List[Optional[Exception]]:
+        with self._lock:
+            self.outbox.extend(messages)
+            self.batches.append(len(messages))
+
+        if self.directory:
+            for message in messages:
+                with open(os.path.join(self.directory, f"{uuid.uuid4().hex}.eml"), "wb") as f:
+                    f.write(message.as_bytes())
+
+        return [None] * len(messages)
+
+
+class MailQueue:
+    """
+    Outbound mail queue drained by a background sender thread.
+
+    Enqueuing returns at once. The sender waits up to `linger` seconds for a batch of
+    `batch_size` emails to gather and sends them in one transport call. Emails failing with a
+    transient error are retried with exponential backoff and jitter, up to `max_retries` times;
+    the rest of the queue keeps flowing meanwhile.
+
+    Attributes:
+        transport (MailTransport): Delivers the batches.
+        batch_size (int): Maximum number of emails per batch.
+        linger (float): Seconds to wait for a batch to fill up.
+        max_retries (int): Retries per email after the first attempt.
+        max_queue (int): Maximum number of emails waiting to be sent.
+    """
+
+    def __init__(
+        self,
+        transport: MailTransport | None = None,
+        batch_size: int = settings.MAIL_BATCH_SIZE,
+        linger: float = settings.MAIL_BATCH_LINGER,
+        max_retries: int = settings.MAIL_MAX_RETRIES,
+        max_queue: int = settings.MAIL_MAX_QUEUE,
+        max_mails_kept: int = 1000
+    ) -> None:
+        self._transport = transport
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_retries = max_retries
+        self.max_queue = max_queue
+        self.max_mails_kept = max_mails_kept
+
+        self._pending: Deque[OutboundMail] = deque()
+        self._in_flight = 0
+        self._mails: OrderedDict[str, OutboundMail] = OrderedDict()
+        self._counters = {"sent": 0, "failed": 0, "retries": 0, "batches": 0}
+        self._condition = threading.Condition()
+        self._sender: threading.Thread | None = None
+        self._stopping = False
+
+    @property
+    def transport(self) -> MailTransport:
+        """
+        The transport, chosen by MAIL_TRANSPORT on first use unless one was given.
+        """
+        if self._transport is None:
+            self._transport = LocalMailTransport() if settings.MAIL_TRANSPORT == "local" else GmailTransport()
+        return self._transport
+
+    def enqueue(self, message: EmailMessage) -> OutboundMail:
+        """
+        Adds an email to the queue, starting the sender on first use.
+
+        Args:
+            message (EmailMessage): The email to send.
+
+        Returns:
+            OutboundMail: The queued email, whose status is updated as it is delivered.
+
+        Raises:
+            MailQueueFull: If MAIL_MAX_QUEUE emails are already waiting.
+            MailQueueClosed: If the queue was closed, so nothing would send the email.
+        """
+        mail = OutboundMail(mail_id=uuid.uuid4().hex, message=message, enqueued_at=time.time())
+
+        with self._condition:
+            if self._stopping:
+                raise MailQueueClosed("The mail queue is closed")
+            if len(self._pending) >= self.max_queue:
+                raise MailQueueFull(f"{self.max_queue} emails already waiting")
+
+            if self._sender is None:
+                self._sender = threading.Thread(target=self._run, name="mail-sender", daemon=True)
+                self._sender.start()
+
+            self._pending.append(mail)
+            self._mails[mail.mail_id] = mail
+            self._trim()
+            self._condition.notify_all()
+
+        return mail
+
+    def status(self, mail_id: str) -> OutboundMail | None:
+        """
+        Returns the email with the given id, if it is still tracked.
+        """
+        with self._condition:
+            return self._mails.get(mail_id)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Blocks until every queued email has been sent or has failed for good.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        with self._condition:
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: not self._pending and not self._in_flight, timeout=timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """
+        Sends what is queued, then stops the sender thread. Emails can no longer be enqueued afterwards.
+        """
+        self.flush(timeout)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        Returns the queue depth and delivery counters.
+        """
+        with self._condition:
+            return {"queue_depth": len(self._pending), "in_flight": self._in_flight, **self._counters}
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._send(batch)
+
+    def _next_batch(self) -> List[OutboundMail] | None:
+        with self._condition:
+            while True:
+                if self._stopping:
+                    return None
+
+                now = time.monotonic()
+                ready = [mail for mail in self._pending if mail.next_attempt_at <= now]
+
+                if ready:
+                    # Flush a full batch at once, otherwise give the batch up to `linger` seconds to fill
+                    oldest = min(mail.enqueued_at for mail in ready)
+                    linger_left = oldest + self.linger - time.time()
+                    if len(ready) >= self.batch_size or linger_left <= 0:
+                        batch = ready[:self.batch_size]
+                        for mail in batch:
+                            self._pending.remove(mail)
+                        self._in_flight += len(batch)
+                        return batch
+                    self._condition.wait(linger_left)
+
+                elif self._pending:
+                    self._condition.wait(min(mail.next_attempt_at for mail in self._pending) - now)
+
+                else:
+                    self._condition.wait()
+
+    def _send(self, batch: List[OutboundMail]) -> None:
+        try:
+            errors = self.transport.send_batch([mail.message for mail in batch])
+        except Exception as e:
+            # Nothing was sent, e.g. no rate limit slot was available; transports report emails
+            # that failed once sent through the returned errors instead
+            logger.warning("Mail batch of %d failed: %s", len(batch), e)
+            errors = [e] * len(batch)
+
+        with self._condition:
+            self._counters["batches"] += 1
+            self._in_flight -= len(batch)
+
+            for mail, error in zip(batch, errors):
+                mail.attempts += 1
+
+                if error is None:
+                    mail.status = "sent"
+                    mail.sent_at = time.time()
+                    self._counters["sent"] += 1
+
+                elif mail.attempts <= self.max_retries and self.transport.is_retryable(error):
+                    mail.error = str(error)
+                    mail.next_attempt_at = time.monotonic() + backoff_delay(
+                        mail.attempts - 1, settings.GOOGLE_API_BACKOFF_BASE, settings.GOOGLE_API_BACKOFF_MAX
+                    )
+                    self._pending.append(mail)
+                    self._counters["retries"] += 1
+
+                else:
+                    mail.error = str(error)
+                    mail.status = "failed"
+                    self._counters["failed"] += 1
+                    logger.error("Could not send mail %s to %s: %s", mail.mail_id, mail.message["to"], error)
+
+            self._condition.notify_all()
+
+    def _trim(self) -> None:
+        # Forget the oldest delivered emails beyond max_mails_kept
+        finished = [mail_id for mail_id, mail in self._mails.items() if mail.status in ("sent", "failed")]
+        for mail_id in finished[:max(0, len(self._mails) - self.max_mails_kept)]:
+            del self._mails[mail_id]
+
+
+# Queue shared by every node sending mail
+mail_queue = MailQueue()
@@ -0,0 +1,224 @@
+import copy
+import json
+import atexit
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from app.types.node_state import NodeState
+from app.utils.cache import LRUCache, SQLiteCache, stable_hash
+from app.utils.profile_overlay import apply_overlay
+from app.config import settings
+
+
+class ProfileNotFound(KeyError):
+    """
+    Raised when a thread refers to a profile the store does not hold, e.g. an in-memory store
+    of another worker or one that evicted it.
+    """
+
+
+class ProfileStore(ABC):
+    """
+    Content-addressed store of user profiles.
+
+    A profile is stored once under the hash of its content, and graph threads refer to it by
+    that id, so checkpoints carry the id and a small overlay of the nodes' changes instead of
+    the whole resume. Stored profiles are never modified. Profiles read from a persistent
+    backend are kept in an in-process LRU, since they never change under the same id.
+    """
+
+    def __init__(self, cache_size: int = settings.PROFILE_CACHE_SIZE) -> None:
+        self._cache = LRUCache(max_size=cache_size) if cache_size > 0 else None
+
+    def put(self, profile: Dict[str, Any]) -> str:
+        """
+        Stores a profile, unless an identical one is already stored.
+
+        Args:
+            profile (Dict[str, Any]): The user's profile.
+
+        Returns:
+            str: The profile's id, the SHA-256 hash of its content.
+        """
+        profile_id = stable_hash(profile)
+        if self._cache is not None and self._cache.get(profile_id) is not None:
+            return profile_id
+
+        profile = copy.deepcopy(profile)  # Callers may keep modifying their dict
+        self._save(profile_id, profile)
+        if self._cache is not None:
+            self._cache.set(profile_id, profile)
+        return profile_id
+
+    def get(self, profile_id: str) -> Dict[str, Any]:
+        """
+        Returns the stored profile. The dict is shared and must not be modified.
+
+        Raises:
+            ProfileNotFound: If no profile is stored under the id.
+        """
+        profile = self._cache.get(profile_id) if self._cache is not None else None
+        if profile is None:
+            profile = self._load(profile_id)
+            if profile is None:
+                raise ProfileNotFound(profile_id)
+            if self._cache is not None:
+                self._cache.set(profile_id, profile)
+        return profile
+
+    def resolve(self, state: NodeState, with_overlay: bool = True) -> Dict[str, Any] | None:
+        """
+        Returns the profile a thread works on, as a copy the caller may modify.
+
+        The profile is looked up by `state.profile_id`; states that still carry the profile
+        inline in `user_details` are resolved from it. The thread's overlay is applied unless
+        `with_overlay` is False.
+        """
+        if state.profile_id is not None:
+            profile = self.get(state.profile_id)
+        elif state.user_details:
+            profile = state.user_details
+        else:
+            return None
+        return apply_overlay(profile, state.profile_overlay if with_overlay else None)
+
+    @abstractmethod
+    def _save(self, profile_id: str, profile: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def _load(self, profile_id: str) -> Dict[str, Any] | None:
+        ...
+
+
+class MemoryProfileStore(ProfileStore):
+    """
+    Keeps profiles in this process, up to `max_size` of them, evicting the least recently used.
+    Threads are then only resumable by this process, like with the "memory" checkpointer.
+    """
+
+    def __init__(self, max_size: int = settings.PROFILE_STORE_MAX_SIZE) -> None:
+        super().__init__(cache_size=0)
+        self._profiles = LRUCache(max_size=max_size)
+
+    def _save(self, profile_id: str, profile: Dict[str, Any]) -> None:
+        self._profiles.set(profile_id, profile)
+
+    def _load(self, profile_id: str) -> Dict[str, Any] | None:
+        return self._profiles.get(profile_id)
+
+
+class SQLiteProfileStore(ProfileStore):
+    """
+    Keeps profiles in the SQLite cache database, shared by the processes of one host.
+    """
+
+    def __init__(self, path: str = settings.CACHE_DB_PATH, cache_size: int = settings.PROFILE_CACHE_SIZE) -> None:
+        super().__init__(cache_size=cache_size)
+        self._db = SQLiteCache(path=path, namespace="profiles")
+
+    def _save(self, profile_id: str, profile: Dict[str, Any]) -> None:
+        self._db.set(profile_id, profile)
+
+    def _load(self, profile_id: str) -> Dict[str, Any] | None:
+        return self._db.get(profile_id)
+
+
+class PostgresProfileStore(ProfileStore):
+    """
+    Keeps profiles in the Postgres database, next to the Postgres checkpointer's tables, so every
+    worker can resolve the profile of any thread. The connection pool is opened on first use.
+    """
+
+    def __init__(self, uri: str = settings.POSTGRES_DB_URI, cache_size: int = settings.PROFILE_CACHE_SIZE) -> None:
+        super().__init__(cache_size=cache_size)
+        self.uri = uri
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> Any:
+        with self._lock:
+            if self._pool is None:
+                # Imported here so the Postgres driver is only needed when it is used
+                from psycopg_pool import ConnectionPool
+                from app.services.checkpointer import POSTGRES_CONNECTION_KWARGS
+
+                pool = ConnectionPool(
+                    conninfo=self.uri,
+                    min_size=settings.POSTGRES_POOL_MIN_SIZE,
+                    max_size=settings.POSTGRES_POOL_MAX_SIZE,
+                    timeout=settings.POSTGRES_POOL_TIMEOUT,
+                    kwargs=POSTGRES_CONNECTION_KWARGS,
+                    open=True
+                )
+                atexit.register(pool.close)
+
+                if settings.POSTGRES_SETUP:
+                    with pool.connection() as conn:
+                        conn.execute(
+                            """
+                            CREATE TABLE IF NOT EXISTS profiles (
+                                profile_id TEXT PRIMARY KEY,
+                                profile JSONB NOT NULL,
+                                created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                            )
+                            """
+                        )
+                self._pool = pool
+            return self._pool
+
+    def _save(self, profile_id: str, profile: Dict[str, Any]) -> None:
+        with self.pool.connection() as conn:
+            conn.execute(
+                "INSERT INTO profiles (profile_id, profile) VALUES (%s, %s) ON CONFLICT (profile_id) DO NOTHING",
+                (profile_id, json.dumps(profile))
+            )
+
+    def _load(self, profile_id: str) -> Dict[str, Any] | None:
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT profile FROM profiles WHERE profile_id = %s", (profile_id,)).fetchone()
+        return row[0] if row is not None else None
+
+
+def create_profile_store(
+    kind: Optional[str] = settings.PROFILE_STORE,
+    checkpointer: str = settings.CHECKPOINTER
+) -> ProfileStore:
+    """
+    Creates the profile store. Threads reference their profile by id, so the store must outlive
+    the process whenever the checkpointer does: by default "postgres" is used with the Postgres
+    checkpointer, so that any worker can resume any thread, and "memory" otherwise. "sqlite"
+    shares profiles between the processes of one host.
+
+    Args:
+        kind (Optional[str]): "memory", "sqlite" or "postgres"; None derives it from the checkpointer.
+        checkpointer (str): The CHECKPOINTER the graph's threads are stored with.
+
+    Returns:
+        ProfileStore: The profile store.
+
+    Raises:
+        ValueError: If the store is unknown, or is in memory while threads are stored in Postgres.
+    """
+    if kind is None:
+        kind = "postgres" if checkpointer == "postgres" else "memory"
+
+    if kind == "memory" and checkpointer == "postgres":
+        raise ValueError(
+            "PROFILE_STORE=memory cannot be used with CHECKPOINTER=postgres: threads resumed by another "
+            "worker or after a restart would reference profiles that are gone"
+        )
+
+    if kind == "memory":
+        return MemoryProfileStore()
+    if kind == "sqlite":
+        return SQLiteProfileStore()
+    if kind == "postgres":
+        return PostgresProfileStore()
+    raise ValueError(f"Unknown profile store: {kind}")
+
+
+# Store shared by every node resolving a thread's profile
+profile_store = create_profile_store()
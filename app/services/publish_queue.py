@@ -0,0 +1,222 @@
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PublishJob:
+    """
+    A document render+upload job running in the background.
+
+    Attributes:
+        job_id (str): Unique identifier returned to the user as the job handle.
+        node (str): Name of the graph node that enqueued the job.
+        thread_id (Optional[str]): Conversation thread the result is attached to.
+        message_id (str): Id of the message the node answers with while the job runs; the result
+            is attached once the thread's state holds it, i.e. once the node's run has finished.
+        status (str): One of "queued", "running", "done" or "failed".
+        link (Optional[str]): Link to the published document once done.
+        error (Optional[str]): Error message if the job failed.
+    """
+    job_id: str
+    node: str
+    thread_id: Optional[str]
+    message_id: str
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    status: str = "queued"
+    link: Optional[str] = None
+    error: Optional[str] = None
+
+
+class PublishQueue:
+    """
+    Runs document publishing jobs on a worker pool so crafting nodes can respond immediately.
+
+    When a job finishes, a message carrying the link (or the failure) is appended to the
+    conversation thread through the compiled graph's `update_state`, so the result shows up in
+    the thread state. The run that queued the job usually hasn't finished by then, and its own
+    checkpoints would overwrite the message, so the result is only attached once the thread's
+    latest checkpoint holds the node's reply (`job.message_id`) and has no pending nodes.
+    Queue depth and job latency metrics are kept for monitoring.
+
+    Attributes:
+        max_workers (int): Number of jobs published concurrently.
+        max_jobs_kept (int): Number of finished jobs kept for status lookups.
+        attach_timeout (float): Seconds to wait for the queuing run to finish before attaching anyway.
+        attach_poll_interval (float): Seconds between checks of the thread's state.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = settings.PUBLISH_WORKERS,
+        max_jobs_kept: int = settings.PUBLISH_MAX_JOBS_KEPT,
+        attach_timeout: float = settings.PUBLISH_ATTACH_TIMEOUT,
+        attach_poll_interval: float = settings.PUBLISH_ATTACH_POLL_INTERVAL
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_jobs_kept = max_jobs_kept
+        self.attach_timeout = attach_timeout
+        self.attach_poll_interval = attach_poll_interval
+
+        self._graph = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._jobs: OrderedDict[str, PublishJob] = OrderedDict()
+        self._wait_times: deque[float] = deque(maxlen=1000)
+        self._latencies: deque[float] = deque(maxlen=1000)
+        self._counters = {"completed": 0, "failed": 0, "attached": 0}
+        self._lock = threading.Lock()
+
+    def bind_graph(self, graph: Any) -> None:
+        """
+        Registers the compiled graph whose thread state receives finished job results.
+        """
+        self._graph = graph
+
+    def submit(
+        self,
+        node: str,
+        work: Callable[[], str],
+        config: RunnableConfig,
+        message: Callable[[str], str]
+    ) -> PublishJob:
+        """
+        Enqueues a publishing job.
+
+        Args:
+            node (str): Name of the node enqueuing the job; the result is attached as this node.
+            work (Callable[[], str]): Renders and uploads the document, returning its link.
+            config (RunnableConfig): The node's config, used to find the conversation thread.
+            message (Callable[[str], str]): Builds the message shown to the user from the link.
+
+        Returns:
+            PublishJob: The job handle. The node must answer with a message whose id is `job.message_id`.
+        """
+        thread_id = config.get("configurable", {}).get("thread_id") if config else None
+        job_id = uuid.uuid4().hex
+        job = PublishJob(
+            job_id=job_id, node=node, thread_id=thread_id, message_id=f"publish-{job_id}", submitted_at=time.time()
+        )
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="publisher")
+            self._jobs[job.job_id] = job
+            self._trim()
+
+        self._executor.submit(self._run, job, work, message)
+        return job
+
+    def status(self, job_id: str) -> PublishJob | None:
+        """
+        Returns the job with the given id, if it is still tracked.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Returns the queue depth, running jobs, completion and attachment counters, and wait/latency
+        statistics in seconds.
+        """
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+            wait_times = list(self._wait_times)
+            latencies = sorted(self._latencies)
+            counters = dict(self._counters)
+
+        return {
+            "queue_depth": statuses.count("queued"),
+            "running": statuses.count("running"),
+            **counters,
+            "avg_wait_seconds": sum(wait_times) / len(wait_times) if wait_times else 0.0,
+            "avg_latency_seconds": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p95_latency_seconds": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "max_latency_seconds": latencies[-1] if latencies else 0.0,
+        }
+
+    def _run(self, job: PublishJob, work: Callable[[], str], message: Callable[[str], str]) -> None:
+        job.started_at = time.time()
+        job.status = "running"
+
+        try:
+            job.link = work()
+            job.status = "done"
+            content = message(job.link)
+
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+            content = f"Sorry, I could not publish your document (job {job.job_id}). Please try again."
+            logger.exception("Publish job %s failed", job.job_id)
+
+        job.finished_at = time.time()
+        with self._lock:
+            self._counters["completed" if job.status == "done" else "failed"] += 1
+            self._wait_times.append(job.started_at - job.submitted_at)
+            self._latencies.append(job.finished_at - job.submitted_at)
+
+        self._attach(job, content)
+
+    def _attach(self, job: PublishJob, content: str) -> None:
+        # Append the result to the conversation thread so it lands in the thread state
+        if self._graph is None or job.thread_id is None:
+            return
+
+        config = {"configurable": {"thread_id": job.thread_id}}
+        if not self._wait_for_run(job, config):
+            logger.warning(
+                "Run of thread %s did not finish within %.1fs, attaching publish job %s anyway",
+                job.thread_id, self.attach_timeout, job.job_id
+            )
+
+        try:
+            self._graph.update_state(
+                config,
+                {"messages": [AIMessage(content=content)]},
+                as_node=job.node
+            )
+            with self._lock:
+                self._counters["attached"] += 1
+        except Exception:
+            logger.exception("Could not attach publish job %s to thread %s", job.job_id, job.thread_id)
+
+    def _wait_for_run(self, job: PublishJob, config: RunnableConfig) -> bool:
+        # The run is over once its final checkpoint, holding the node's reply, is saved. Until then
+        # the snapshot may show the reply from the finished task's pending writes, with no `next`
+        # node but with the task still listed; attaching to that would fork the thread.
+        deadline = time.monotonic() + self.attach_timeout
+        while True:
+            try:
+                snapshot = self._graph.get_state(config)
+                replied = any(message.id == job.message_id for message in snapshot.values.get("messages", []))
+                if replied and not snapshot.next and not snapshot.tasks:
+                    return True
+            except Exception:
+                logger.exception("Could not read the state of thread %s", job.thread_id)
+
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.attach_poll_interval)
+
+    def _trim(self) -> None:
+        # Forget the oldest finished jobs beyond max_jobs_kept
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in ("done", "failed")]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_jobs_kept)]:
+            del self._jobs[job_id]
+
+
+# Queue shared by the crafting nodes
+publish_queue = PublishQueue()
@@ -1,4 +1,4 @@
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
 class ConfigSchema(TypedDict):
     """
@@ -7,5 +7,7 @@ class ConfigSchema(TypedDict):
 
     Attributes:
         thread_id (str): Unique identifier for the thread context.
+        resume_format (str): Optional resume output format for the run: "docx", "markdown" or "html".
     """
-    thread_id: str
\ No newline at end of file
+    thread_id: str
+    resume_format: NotRequired[str]
\ No newline at end of file
@@ -1,25 +1,34 @@
-from typing import Annotated, List, Optional, Dict, Sequence
+from typing import Annotated, Any, List, Optional, Dict, Sequence
 from pydantic import BaseModel, Field
-from langgraph.graph.message import AnyMessage, add_messages
+from langgraph.graph.message import AnyMessage
 
 from app.types.jd_schema import JDSchema
 from app.types.userdetails_schema import UserDetails
+from app.utils.profile_overlay import merge_overlay
+from app.utils.message_window import window_messages
 
 class NodeState(BaseModel):
     """
     Represents the state of a node in the processing graph.
 
     Attributes:
-        messages (Sequence[AnyMessage]): Sequence of messages exchanged during node execution.
+        messages (Sequence[AnyMessage]): Sequence of messages exchanged during node execution, windowed
+            to the last MESSAGE_WINDOW messages.
         intent (Optional[str]): Intent of the process, such as "resume" or "cover_letter".
         is_jd_given (bool): Indicates if a job description is provided.
         job_description (Optional[Union[str, JDSchema]]): Job description or its parsed schema.
-        user_details (Optional[Dict]): Additional user details, if available.
+        user_details (Optional[Dict]): The user's profile as given by the client. It is moved to the
+            profile store on entry and cleared, so checkpoints don't carry it.
+        profile_id (Optional[str]): Id of the user's profile in the profile store.
+        profile_overlay (Dict[str, Any]): The nodes' changes to the profile: selected items, skills
+            and rephrased descriptions. Resolve the tailored profile with `profile_store.resolve`.
         cover_letter (Optional[str]): Generated cover letter, if applicable.
     """
-    messages: Annotated[Sequence[AnyMessage], add_messages]
+    messages: Annotated[Sequence[AnyMessage], window_messages]
     intent: Optional[str] = Field(default=None, required=False)
     is_jd_given: bool = Field(default=False)
     job_description: Optional[str | JDSchema] = Field(default="")
-    user_details: Optional[Dict]
+    user_details: Optional[Dict] = Field(default=None)
+    profile_id: Optional[str] = Field(default=None)
+    profile_overlay: Annotated[Dict[str, Any], merge_overlay] = Field(default_factory=dict)
     cover_letter: Optional[str] = Field(required=False, default="")
\ No newline at end of file
@@ -10,6 +10,26 @@ class RatingSchema(BaseModel):
     """
     rating: int = Field(description="Rating given by the expert judge.", default=5)
 
+class ItemRatingSchema(BaseModel):
+    """
+    Schema for storing the rating of a single item within a batched judgement.
+
+    Attributes:
+        index (int): Index of the rated item as listed in the prompt.
+        rating (int): Rating score given to the item.
+    """
+    index: int = Field(description="Index of the rated item as listed in the prompt.")
+    rating: int = Field(description="Rating given by the expert judge.", default=5)
+
+class BatchRatingSchema(BaseModel):
+    """
+    Schema for storing the ratings of several experiences and projects judged in one request.
+
+    Attributes:
+        ratings (List[ItemRatingSchema]): One rating per item, keyed by item index.
+    """
+    ratings: List[ItemRatingSchema] = Field(description="Ratings for every listed item, one entry per index.", default=[])
+
 class SkillsSchema(BaseModel):
     """
     Schema for storing a list of skills extracted from the job description.
@@ -0,0 +1,349 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+import unicodedata
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Every tiered cache of the process, by namespace, for cache_stats()
+_caches: "weakref.WeakValueDictionary[str, TieredCache]" = weakref.WeakValueDictionary()
+
+
+def _json_default(value: Any) -> Any:
+    # Pydantic models (e.g. a structured job description) are hashed by their fields
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return str(value)
+
+
+def stable_hash(*parts: Any) -> str:
+    """
+    Computes a stable content hash for JSON-like values. Dictionaries are hashed with sorted
+    keys, so two equal dictionaries always hash the same regardless of insertion order.
+
+    Args:
+        *parts (Any): The values to hash together.
+
+    Returns:
+        str: The hex SHA-256 digest.
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=_json_default)
+    return hashlib.sha256(payload.encode("UTF-8")).hexdigest()
+
+
+def fingerprint(*texts: str) -> str:
+    """
+    Returns a short fingerprint of one or more texts, e.g. the prompts a cached result was
+    produced with, so that editing a prompt invalidates the entries built from it.
+    """
+    return stable_hash(*texts)[:16]
+
+
+def data_path(path: str) -> str:
+    """
+    Resolves a path of local state against DATA_DIR; absolute paths are returned unchanged.
+    """
+    return os.path.join(os.path.expanduser(settings.DATA_DIR), os.path.expanduser(path))
+
+
+def cache_stats() -> Dict[str, Dict[str, int | float]]:
+    """
+    Returns the hit/miss statistics of every tiered cache in the process, by namespace.
+    """
+    return {namespace: cache.stats() for namespace, cache in list(_caches.items())}
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes free text before hashing: Unicode NFKC, collapsed whitespace and stripped ends.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class LRUCache:
+    """
+    A thread-safe in-process LRU cache with an optional time-to-live per entry.
+
+    Attributes:
+        max_size (int): Maximum number of entries kept before the least recently used is evicted.
+        ttl (Optional[float]): Seconds an entry stays valid, or None to never expire.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Returns the cached value for the key, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)  # Mark as most recently used
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores a value, evicting the least recently used entries beyond max_size.
+        """
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    A persistent key-value cache stored in a SQLite database. Values must be JSON-serializable.
+    Several caches can share one database file, each under its own namespace.
+
+    The database is opened on first use, and expired entries of the namespace are purged then.
+    With `max_rows`, the namespace is kept to that many entries: once a write goes past it, the
+    entries written longest ago are dropped.
+
+    Attributes:
+        path (str): Path of the SQLite database file, resolved against DATA_DIR.
+        namespace (str): Namespace separating this cache's keys from other caches in the file.
+        ttl (Optional[float]): Seconds an entry stays valid, or None to never expire.
+        max_rows (Optional[int]): Entries kept in the namespace, or None for no cap.
+    """
+
+    def __init__(self, path: str, namespace: str, ttl: Optional[float] = None, max_rows: Optional[int] = None) -> None:
+        self.path = data_path(path)
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._rows = 0  # Entries of the namespace as of the last count, plus writes since
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Opened on first use, so building a cache never touches the disk; callers hold the lock
+        if self._connection is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS cache (
+                        namespace TEXT NOT NULL,
+                        key TEXT NOT NULL,
+                        value TEXT NOT NULL,
+                        expires_at REAL,
+                        PRIMARY KEY (namespace, key)
+                    )
+                    """
+                )
+                conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at < ?",
+                    (self.namespace, time.time())
+                )
+            self._connection = conn
+            self._rows = self._count_rows()
+        return self._connection
+
+    def get(self, key: str) -> Any | None:
+        """
+        Returns the cached value for the key, or None if it is missing or expired.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at is not None and expires_at < time.time():
+                with self._conn:
+                    self._conn.execute(
+                        "DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key)
+                    )
+                return None
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Stores a JSON-serializable value, replacing any previous entry for the key, and drops
+        the oldest entries of the namespace beyond max_rows.
+        """
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), expires_at)
+            )
+
+            # Replacements are counted too, so this only overestimates; the count is redone on pruning
+            self._rows += 1
+            if self.max_rows is not None and self._rows > self.max_rows:
+                self._prune()
+
+    def _prune(self) -> None:
+        # A replaced entry is reinserted with a new rowid, so the lowest rowids were written longest ago
+        self._conn.execute(
+            """
+            DELETE FROM cache WHERE namespace = ? AND (
+                (expires_at IS NOT NULL AND expires_at < ?)
+                OR rowid NOT IN (SELECT rowid FROM cache WHERE namespace = ? ORDER BY rowid DESC LIMIT ?)
+            )
+            """,
+            (self.namespace, time.time(), self.namespace, self.max_rows)
+        )
+        self._rows = self._count_rows()
+
+    def _count_rows(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)).fetchone()[0]
+
+    def purge_expired(self) -> int:
+        """
+        Deletes expired entries of this namespace and returns how many were removed.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at < ?",
+                (self.namespace, time.time())
+            )
+            self._rows = self._count_rows()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            self._rows = 0
+
+
+class TieredCache:
+    """
+    A two-tier cache: an in-process LRU in front of an optional persistent SQLite tier.
+    Persistent hits are promoted into memory. Hit and miss counters are kept per tier, logged
+    every `log_every` lookups and available for every cache of the process from `cache_stats()`.
+
+    Attributes:
+        namespace (str): Name of the cache in logs and in `cache_stats()`.
+        memory (LRUCache): The in-process tier.
+        disk (Optional[SQLiteCache]): The persistent tier, if enabled.
+        log_every (Optional[int]): Lookups between two stats log lines, or None to never log them.
+    """
+
+    def __init__(
+        self,
+        memory: LRUCache,
+        disk: Optional[SQLiteCache] = None,
+        namespace: str = "cache",
+        log_every: Optional[int] = settings.CACHE_STATS_LOG_EVERY
+    ) -> None:
+        self.namespace = namespace
+        self.memory = memory
+        self.disk = disk
+        self.log_every = log_every
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        _caches[namespace] = self
+
+    @classmethod
+    def create(
+        cls,
+        namespace: str,
+        max_size: int,
+        ttl: Optional[float] = None,
+        path: Optional[str] = None,
+        max_rows: Optional[int] = settings.CACHE_MAX_ROWS
+    ) -> "TieredCache":
+        """
+        Builds a tiered cache; the persistent tier is only enabled when a path is given.
+        """
+        disk = SQLiteCache(path, namespace=namespace, ttl=ttl, max_rows=max_rows) if path else None
+        return cls(LRUCache(max_size=max_size, ttl=ttl), disk, namespace=namespace)
+
+    def get(self, key: str) -> Any | None:
+        """
+        Looks the key up in memory first, then in the persistent tier.
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)  # Promote to the fast tier
+                self._count("disk_hits")
+                return value
+
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Stores a JSON-serializable value in every tier.
+        """
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def stats(self) -> Dict[str, int | float]:
+        """
+        Returns hit/miss counters, the hit rate and the number of entries held in memory.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        stats["memory_size"] = len(self.memory)
+        return stats
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+            lookups = sum(self._counters.values())
+
+        if self.log_every and lookups % self.log_every == 0:
+            stats = self.stats()
+            logger.info(
+                "Cache %s: %d lookups, hit rate %.2f (memory %d, disk %d, misses %d), %d entries in memory",
+                self.namespace, lookups, stats["hit_rate"], stats["memory_hits"], stats["disk_hits"],
+                stats["misses"], stats["memory_size"]
+            )
@@ -0,0 +1,47 @@
+from typing import Any, Callable, Iterable, List, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def bounded_map(fn: Callable[[T], R], items: Iterable[T], max_concurrency: int) -> List[R]:
+    """
+    Applies a blocking function to every item using a bounded thread pool.
+
+    Results are returned in the same order as the input items, regardless of the
+    order in which the calls complete. The first exception raised by any call is
+    re-raised to the caller.
+
+    Args:
+        fn (Callable[[T], R]): The function to apply, typically one wrapping an LLM call.
+        items (Iterable[T]): The inputs to process.
+        max_concurrency (int): Maximum number of calls in flight at once.
+
+    Returns:
+        List[R]: The results, in input order.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    # Nothing to gain from a pool for a single item or a cap of one
+    if len(items) == 1 or max_concurrency <= 1:
+        return [fn(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(items))) as executor:
+        return list(executor.map(fn, items))
+
+
+def run_concurrently(tasks: List[Callable[[], Any]], max_concurrency: int) -> List[Any]:
+    """
+    Runs a list of zero-argument callables with a bounded thread pool.
+
+    Args:
+        tasks (List[Callable[[], Any]]): The callables to run.
+        max_concurrency (int): Maximum number of callables running at once.
+
+    Returns:
+        List[Any]: The return values, in the same order as the tasks.
+    """
+    return bounded_map(lambda task: task(), tasks, max_concurrency)
@@ -0,0 +1,185 @@
+import re
+import threading
+from typing import Dict, Literal, Optional, Tuple
+
+from app.types.intent_schema import IntentSchema
+from app.config import settings
+
+# Phrases that name what the user wants crafted
+INTENT_PATTERNS = {
+    "resume": re.compile(r"\b(resume|résumé|cv|curriculum vitae)s?\b", re.IGNORECASE),
+    "cover_letter": re.compile(r"\bcover[\s_-]*letters?\b", re.IGNORECASE),
+}
+
+# A negation shortly before a keyword, e.g. "not a resume" or "don't need a cover letter"
+NEGATION_PATTERN = re.compile(r"\b(not|no|don'?t|dont|without|instead of)\b(\s+\w+){0,2}\s*$", re.IGNORECASE)
+
+# Section headings and phrases that typically appear in pasted job postings
+JD_MARKERS = [
+    r"\bresponsibilit(y|ies)\b",
+    r"\brequirements?\b",
+    r"\bqualifications?\b",
+    r"\bwhat you('|’)?ll do\b",
+    r"\bwhat we('|’)?re looking for\b",
+    r"\babout (the|this) (role|position|job|team)\b",
+    r"\babout (us|the company)\b",
+    r"\bjob description\b",
+    r"\byears of (professional |relevant )?experience\b",
+    r"\bwe are (looking|seeking|hiring)\b",
+    r"\b(benefits|compensation|salary)\b",
+    r"\b(nice to have|preferred|must have)\b",
+    r"\b(full[\s-]?time|part[\s-]?time|remote|hybrid|on[\s-]?site)\b",
+]
+JD_MARKER_PATTERNS = [re.compile(marker, re.IGNORECASE) for marker in JD_MARKERS]
+
+# Lines formatted as list items: "- ...", "* ...", "• ...", "1. ..."
+BULLET_PATTERN = re.compile(r"^\s*([-*•●▪]|\d+[.)])\s+\S", re.MULTILINE)
+
+
+class IntentClassifier:
+    """
+    A local, rule-based classifier that fills `IntentSchema` without an LLM call when it is
+    confident enough. It recognizes intent keywords (resume / cover letter) and pasted job
+    descriptions by length and structure. When confidence is below the threshold it returns
+    None and the caller falls back to the LLM.
+
+    Attributes:
+        min_confidence (float): Minimum confidence required to answer locally.
+        jd_min_chars (int): Minimum length of a message to be considered a job description.
+        short_reply_chars (int): Messages up to this length are treated as short replies
+            that cannot contain a job description.
+    """
+
+    def __init__(
+        self,
+        min_confidence: float = settings.INTENT_RULES_MIN_CONFIDENCE,
+        jd_min_chars: int = settings.INTENT_RULES_JD_MIN_CHARS,
+        short_reply_chars: int = settings.INTENT_RULES_SHORT_REPLY_CHARS
+    ) -> None:
+        self.min_confidence = min_confidence
+        self.jd_min_chars = jd_min_chars
+        self.short_reply_chars = short_reply_chars
+
+        self._counters = {"rule_hits": 0, "llm_fallbacks": 0}
+        self._lock = threading.Lock()
+
+    def detect_intent(self, text: str) -> Tuple[str, float]:
+        """
+        Detects the crafting intent from keywords.
+
+        Returns:
+            Tuple[str, float]: The intent ("resume", "cover_letter" or "") and the confidence.
+        """
+        found = {}
+        for intent, pattern in INTENT_PATTERNS.items():
+            for match in pattern.finditer(text):
+                # Skip negated mentions such as "not a cover letter"
+                if not NEGATION_PATTERN.search(text[:match.start()]):
+                    found.setdefault(intent, match)
+
+        if len(found) != 1:
+            # Nothing mentioned, or both mentioned: leave it to the LLM
+            return "", 0.0
+
+        intent = next(iter(found))
+        stripped = text.strip()
+
+        # A bare keyword reply ("resume", "a cover letter please") is unambiguous
+        if len(stripped) <= self.short_reply_chars:
+            return intent, 1.0
+
+        # Keyword inside a longer message, e.g. a request followed by a pasted posting
+        return intent, 0.85
+
+    def detect_job_description(self, text: str) -> Tuple[bool, str, float]:
+        """
+        Detects a pasted job description from the message length and structure.
+
+        Returns:
+            Tuple[bool, str, float]: Whether a job description is present, its text and the confidence.
+        """
+        stripped = text.strip()
+
+        # Short replies never carry a job description
+        if len(stripped) <= self.short_reply_chars:
+            return False, "", 1.0
+
+        if len(stripped) < self.jd_min_chars:
+            return False, "", 0.0
+
+        markers = sum(1 for pattern in JD_MARKER_PATTERNS if pattern.search(stripped))
+        bullets = len(BULLET_PATTERN.findall(stripped))
+
+        if markers >= 3 or (markers >= 2 and bullets >= 3):
+            confidence = 0.95
+        elif markers >= 2 or (markers >= 1 and bullets >= 3):
+            confidence = 0.85
+        else:
+            return False, "", 0.0
+
+        return True, self._strip_request(stripped), confidence
+
+    def classify(
+        self,
+        text: str,
+        known_intent: Optional[str] = None,
+        need: Literal["intent", "jd", "both"] = "both"
+    ) -> IntentSchema | None:
+        """
+        Classifies a user message locally.
+
+        Args:
+            text (str): The user message.
+            known_intent (Optional[str]): The intent already collected in earlier turns.
+            need (Literal["intent", "jd", "both"]): Which fields the caller needs from this message.
+
+        Returns:
+            IntentSchema | None: The filled schema, or None when the LLM should decide.
+        """
+        output = None
+
+        if need == "intent":
+            intent, confidence = self.detect_intent(text)
+            if intent and confidence >= self.min_confidence:
+                output = IntentSchema(intent=intent)
+
+        elif need == "jd":
+            is_jd_given, job_description, confidence = self.detect_job_description(text)
+            if is_jd_given and confidence >= self.min_confidence:
+                output = IntentSchema(intent=known_intent or "", is_jd_given=True, job_description=job_description)
+
+        else:
+            is_jd_given, job_description, jd_confidence = self.detect_job_description(text)
+
+            # Postings often mention resumes or cover letters themselves, so the intent is only
+            # read from the request around a detected job description, never from the posting.
+            request = text.strip().replace(job_description, "") if is_jd_given else text
+            intent, intent_confidence = self.detect_intent(request)
+
+            if intent and min(intent_confidence, jd_confidence) >= self.min_confidence:
+                output = IntentSchema(intent=intent, is_jd_given=is_jd_given, job_description=job_description)
+
+        self._count("rule_hits" if output is not None else "llm_fallbacks")
+        return output
+
+    def stats(self) -> Dict[str, int | float]:
+        """
+        Returns how often the rules answered locally versus fell back to the LLM.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+
+        total = stats["rule_hits"] + stats["llm_fallbacks"]
+        stats["hit_rate"] = stats["rule_hits"] / total if total else 0.0
+        return stats
+
+    def _strip_request(self, text: str) -> str:
+        # Drop a short leading request line such as "Can you write a cover letter for this job?"
+        first, _, rest = text.partition("\n")
+        if rest.strip() and len(first) <= 200 and any(p.search(first) for p in INTENT_PATTERNS.values()):
+            return rest.strip()
+        return text
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
@@ -0,0 +1,61 @@
+from typing import Any, List, Sequence
+from langchain_core.messages import AnyMessage, HumanMessage
+from langgraph.graph.message import add_messages
+
+from app.config import settings
+
+
+def window_messages(left: Sequence[AnyMessage], right: Sequence[AnyMessage] | AnyMessage) -> List[AnyMessage]:
+    """
+    Reducer for `NodeState.messages`: merges the update like `add_messages` (appending new messages,
+    replacing those with a known id), then keeps only the last MESSAGE_WINDOW messages. Trimming
+    happens on every update, so what gets checkpointed never grows past the window.
+    """
+    merged = add_messages(left, right)
+    window = settings.MESSAGE_WINDOW
+    if window is not None and len(merged) > window:
+        merged = merged[-window:]
+    return merged
+
+
+def compact_job_descriptions(
+    messages: Sequence[AnyMessage],
+    job_description: Any,
+    min_chars: int | None = settings.MESSAGE_COMPACT_CHARS
+) -> List[HumanMessage]:
+    """
+    Builds replacements for the large user messages of a conversation, typically pasted job
+    descriptions, once the job description has been extracted into the state. Each replacement
+    keeps the original message's id, so `add_messages` swaps it in place, and its content refers
+    to the extracted job description instead of repeating it.
+
+    Args:
+        messages (Sequence[AnyMessage]): The conversation so far.
+        job_description (Any): The extracted job description, e.g. a JDSchema.
+        min_chars (int | None): Size from which a user message is compacted; None disables compaction.
+
+    Returns:
+        List[HumanMessage]: The replacement messages, empty if nothing needs compacting.
+    """
+    if min_chars is None:
+        return []
+
+    position = getattr(job_description, "position", None)
+    organization = getattr(job_description, "organization", None)
+    summary = " at ".join(part for part in (position, organization) if part) or "the job"
+
+    replacements = []
+    for message in messages:
+        if (
+            isinstance(message, HumanMessage)
+            and message.id is not None
+            and "compacted_chars" not in message.additional_kwargs
+            and isinstance(message.content, str)
+            and len(message.content) >= min_chars
+        ):
+            replacements.append(HumanMessage(
+                id=message.id,
+                content=f"[Job description for {summary}, {len(message.content)} characters, compacted into the extracted job description]",
+                additional_kwargs={"compacted_chars": len(message.content)}
+            ))
+    return replacements
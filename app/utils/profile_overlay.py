@@ -0,0 +1,74 @@
+import copy
+from typing import Any, Dict, List, Optional
+
+
+def overlay_key(kind: str, index: int) -> str:
+    """
+    Key of an item's rephrased description in an overlay, e.g. "projects:1".
+    """
+    return f"{kind}:{index}"
+
+
+def merge_overlay(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reducer for `NodeState.profile_overlay`. Top-level keys of the update replace the current
+    ones, except "descriptions", which is merged item by item. An update of None clears the
+    overlay, and {"descriptions": None} clears the rephrased descriptions only.
+    """
+    if right is None:
+        return {}
+
+    left = left or {}
+    merged = {**left, **right}
+    if "descriptions" in right:
+        if right["descriptions"] is None:
+            merged.pop("descriptions")
+        else:
+            merged["descriptions"] = {**left.get("descriptions", {}), **right["descriptions"]}
+    return merged
+
+
+def selected_indices(profile: Dict[str, Any], overlay: Optional[Dict[str, Any]], kind: str) -> List[int]:
+    """
+    Indices of the profile's items of a kind (e.g. "experiences") kept by the overlay, in
+    display order. Every item is kept when the overlay selects none.
+    """
+    selected = (overlay or {}).get("selected", {}).get(kind)
+    if selected is None:
+        return list(range(len(profile.get(kind) or [])))
+    return list(selected)
+
+
+def apply_overlay(profile: Dict[str, Any], overlay: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Builds the tailored profile from a stored profile and the overlay of a thread.
+
+    Args:
+        profile (Dict[str, Any]): The profile as the user gave it. It is not modified.
+        overlay (Optional[Dict[str, Any]]): Changes made by the nodes:
+            - "selected": item indices kept per kind, e.g. {"experiences": [2, 0]};
+            - "skills": the skills kept;
+            - "descriptions": rephrased descriptions keyed by `overlay_key(kind, index)`.
+
+    Returns:
+        Dict[str, Any]: A copy of the profile with the overlay applied.
+    """
+    resolved = copy.deepcopy(profile)
+    if not overlay:
+        return resolved
+
+    # Descriptions are keyed by the item's index in the stored profile, so apply them before selecting
+    for key, description in overlay.get("descriptions", {}).items():
+        kind, index = key.rsplit(":", 1)
+        items = resolved.get(kind) or []
+        if int(index) < len(items):
+            items[int(index)]["description"] = description
+
+    for kind, indices in overlay.get("selected", {}).items():
+        items = resolved.get(kind) or []
+        resolved[kind] = [items[index] for index in indices if index < len(items)]
+
+    if "skills" in overlay:
+        resolved["skills"] = overlay["skills"]
+
+    return resolved
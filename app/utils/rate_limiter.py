@@ -0,0 +1,72 @@
+import time
+import random
+import threading
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a call cannot get a slot from a rate limiter, because too many calls are
+    already queued or the wait would exceed the caller's timeout.
+    """
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that smooths bursts into a steady request rate.
+
+    Each call reserves a token and sleeps until the token is due, so queued callers are
+    served in reservation order. The bucket may go into debt by at most `max_queue` tokens;
+    beyond that, callers are rejected instead of piling up.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of tokens, i.e. the largest burst allowed at once.
+        max_queue (int): Maximum number of callers waiting for a token.
+    """
+
+    def __init__(self, rate: float, capacity: float, max_queue: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.max_queue = max_queue
+
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float | None = None, tokens: float = 1) -> float:
+        """
+        Blocks until a token is available.
+
+        Args:
+            timeout (float | None): Maximum seconds to wait; None waits as long as the queue allows.
+            tokens (float): Tokens taken by the call, e.g. the number of requests in a batch.
+
+        Returns:
+            float: The seconds spent waiting.
+
+        Raises:
+            RateLimitExceeded: If the queue is full or the wait would exceed the timeout.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if wait > 0 and -self._tokens >= self.max_queue:
+                raise RateLimitExceeded(f"{self.max_queue} calls already waiting")
+            if timeout is not None and wait > timeout:
+                raise RateLimitExceeded(f"Next slot in {wait:.1f}s exceeds the {timeout:.1f}s timeout")
+
+            self._tokens -= tokens
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """
+    Exponential backoff with full jitter: a random delay between 0 and base * 2^attempt, capped at maximum.
+    """
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
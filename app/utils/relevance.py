@@ -0,0 +1,105 @@
+import re
+import math
+from collections import Counter
+from typing import Any, Dict, List
+
+from app.types.jd_schema import JDSchema
+
+# Words that carry no signal about relevance
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into", "is", "it",
+    "of", "on", "or", "our", "the", "to", "using", "we", "with", "you", "your", "will", "that",
+    "this", "their", "its", "was", "were", "has", "have", "etc"
+}
+
+# Keeps technology names such as "c++", "c#", "node.js" and "ci/cd" as single tokens
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercases the text and splits it into tokens, dropping stop words.
+    """
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def item_text(item: Any) -> str:
+    """
+    Flattens an experience/project dict (or any nested value) into plain text.
+    """
+    if isinstance(item, dict):
+        return " ".join(item_text(value) for value in item.values())
+    if isinstance(item, (list, tuple)):
+        return " ".join(item_text(value) for value in item)
+    return str(item) if item is not None else ""
+
+
+def job_query(job_description: JDSchema | str) -> tuple[List[str], List[str]]:
+    """
+    Builds the query terms for a job description.
+
+    Returns:
+        tuple[List[str], List[str]]: The query tokens and the list of required skills (lowercased).
+    """
+    if isinstance(job_description, JDSchema):
+        text = " ".join([job_description.position, *job_description.skills, *job_description.responsibilities])
+        skills = [skill.lower() for skill in job_description.skills]
+    else:
+        text = str(job_description)
+        skills = []
+
+    return tokenize(text), skills
+
+
+def bm25_scores(query: List[str], documents: List[List[str]], k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """
+    Scores tokenized documents against a tokenized query with Okapi BM25.
+    The corpus statistics are taken from the documents themselves.
+    """
+    if not documents:
+        return []
+
+    avg_length = sum(len(doc) for doc in documents) / len(documents) or 1.0
+    document_frequency = Counter(token for doc in documents for token in set(doc))
+    query_terms = Counter(query)
+
+    scores = []
+    for doc in documents:
+        term_frequency = Counter(doc)
+        score = 0.0
+        for term, query_count in query_terms.items():
+            tf = term_frequency.get(term, 0)
+            if not tf:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+            score += query_count * idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / avg_length))
+        scores.append(score)
+
+    return scores
+
+
+def lexical_scores(items: List[Dict[str, Any]], job_description: JDSchema | str) -> List[float]:
+    """
+    Cheap local relevance of each item to the job description: BM25 against the job's position,
+    skills and responsibilities, plus one point per required skill mentioned verbatim in the item.
+
+    Returns:
+        List[float]: One score per item, in input order.
+    """
+    query, skills = job_query(job_description)
+    texts = [item_text(item).lower() for item in items]
+    scores = bm25_scores(query, [tokenize(text) for text in texts])
+
+    return [
+        score + sum(1 for skill in skills if skill and skill in text)
+        for score, text in zip(scores, texts)
+    ]
+
+
+def rank_by_relevance(items: List[Dict[str, Any]], job_description: JDSchema | str) -> List[int]:
+    """
+    Returns item indices ordered from most to least lexically relevant; ties keep input order.
+    """
+    scores = lexical_scores(items, job_description)
+    return sorted(range(len(items)), key=lambda index: -scores[index])
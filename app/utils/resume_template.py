@@ -0,0 +1,175 @@
+import io
+import threading
+from typing import Any, Dict
+from docx import Document
+from docx.document import Document as DocumentObject
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_TAB_ALIGNMENT
+from docx.shared import Pt, Inches
+
+# Named styles of the resume skeleton
+NAME_STYLE = "Resume Name"
+CONTACT_STYLE = "Resume Contact"
+RULE_STYLE = "Resume Rule"
+SECTION_STYLE = "Resume Section"
+ENTRY_STYLE = "Resume Entry"
+ENTRY_TITLE_STYLE = "Resume Entry Title"
+BODY_STYLE = "Resume Body"
+BULLET_STYLE = "Resume Bullet"
+
+
+class ResumeTemplate:
+    """
+    Renders resumes from a precompiled .docx skeleton.
+
+    The skeleton holds the page setup and every paragraph/character style a resume uses, so it
+    is built once and each render starts from a clone of it. Content is then added with named
+    styles only; no run or paragraph is formatted individually. The output looks the same as
+    the resumes previously formatted run by run.
+    """
+
+    def __init__(self) -> None:
+        self._skeleton: bytes | None = None
+        self._style_ids: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def skeleton(self) -> bytes:
+        """
+        The serialized skeleton document, built on first use.
+        """
+        if self._skeleton is None:
+            with self._lock:
+                if self._skeleton is None:
+                    doc = self.build_skeleton()
+                    buffer = io.BytesIO()
+                    doc.save(buffer)
+                    self._style_ids = {style.name: style.style_id for style in doc.styles}
+                    self._skeleton = buffer.getvalue()
+        return self._skeleton
+
+    @staticmethod
+    def build_skeleton() -> DocumentObject:
+        """
+        Builds an empty document with the resume page setup and named styles.
+        """
+        doc = Document()
+
+        # Letter size: 8.5" x 11", margins: Top/Bottom 0.36", Left/Right 0.5"
+        section = doc.sections[0]
+        section.page_height = Inches(11)
+        section.page_width = Inches(8.5)
+        section.top_margin = Inches(0.36)
+        section.bottom_margin = Inches(0.36)
+        section.left_margin = Inches(0.5)
+        section.right_margin = Inches(0.5)
+
+        styles = doc.styles
+
+        def paragraph_style(name, base="Normal", size=None, bold=None, alignment=None, spaced=True):
+            style = styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+            style.base_style = styles[base]
+            style.quick_style = True
+            if size is not None:
+                style.font.size = Pt(size)
+            if bold is not None:
+                style.font.bold = bold
+            if alignment is not None:
+                style.paragraph_format.alignment = alignment
+            if spaced:
+                style.paragraph_format.line_spacing = Pt(12)
+                style.paragraph_format.space_before = Pt(2)
+                style.paragraph_format.space_after = Pt(2)
+            return style
+
+        paragraph_style(NAME_STYLE, size=18, bold=True, alignment=WD_ALIGN_PARAGRAPH.CENTER)
+        paragraph_style(CONTACT_STYLE, alignment=WD_ALIGN_PARAGRAPH.CENTER)
+        paragraph_style(RULE_STYLE, alignment=WD_ALIGN_PARAGRAPH.CENTER, spaced=False)
+        paragraph_style(SECTION_STYLE, size=14, bold=True)
+        paragraph_style(BODY_STYLE)
+        paragraph_style(BULLET_STYLE, base="List Bullet")
+
+        # Entry headings: bold title on the left, dates right-aligned on a tab stop
+        entry = paragraph_style(ENTRY_STYLE)
+        entry.paragraph_format.tab_stops.add_tab_stop(Inches(7.5), WD_TAB_ALIGNMENT.RIGHT)
+        entry_title = styles.add_style(ENTRY_TITLE_STYLE, WD_STYLE_TYPE.CHARACTER)
+        entry_title.font.size = Pt(12)
+        entry_title.font.bold = True
+
+        return doc
+
+    def render(self, data: Dict[str, Any]) -> DocumentObject:
+        """
+        Generates a resume as a Word document from the user's resume data.
+
+        Args:
+            data (Dict[str, Any]): User's resume data, including personal details, education,
+                                   work experience, projects, and skills.
+
+        Returns:
+            Document: A Word document object representing the resume.
+        """
+        doc = Document(io.BytesIO(self.skeleton))
+
+        # Assigning styles through python-docx looks up the document's default style on every
+        # paragraph, so the skeleton's style ids are set on the XML directly
+        style_ids = self._style_ids
+
+        def add(text, style):
+            paragraph = doc.add_paragraph(text)
+            paragraph._p.get_or_add_pPr().style = style_ids[style]
+            return paragraph
+
+        def add_entry(title, dates):
+            paragraph = add(None, ENTRY_STYLE)
+            paragraph.add_run(title)._r.get_or_add_rPr().style = style_ids[ENTRY_TITLE_STYLE]
+            paragraph.add_run("\t" + dates)
+
+        def add_section(title):
+            add("_" * 120, RULE_STYLE)
+            add("\n" + title, SECTION_STYLE)
+
+        # Add personal details
+        personal = data["personal_details"]
+        add(personal["name"], NAME_STYLE)
+        add(f'{personal["phone"]} | {personal["email"]} | {personal["linkedin"]} | {personal["github"]}', CONTACT_STYLE)
+
+        # Add Education section
+        add_section("Education")
+        for edu in data["education"]:
+            add_entry(f'{edu["degree"]}, {edu["institution"]}', f'{edu["start_date"]} - {edu["end_date"]}')
+            add(f"GPA: {edu['gpa']}", BODY_STYLE)
+            add(f"Courses: {', '.join(edu['courses'])}", BODY_STYLE)
+
+        # Add Work Experience section
+        add_section("Work Experience")
+        for exp in data["experiences"]:
+            add_entry(f'{exp["position"]} at {exp["organization"]}', f'{exp["start_date"]} - {exp["end_date"]}')
+            for desc in exp["description"]:
+                add(desc, BULLET_STYLE)
+
+        # Add Projects section
+        add_section("Projects")
+        for proj in data["projects"]:
+            add_entry(proj["name"], f'{proj["start_date"]} - {proj["end_date"]}')
+            add(proj["github_link"], BODY_STYLE)
+            for desc in proj["description"]:
+                add(desc, BULLET_STYLE)
+
+        # Add Skills section
+        add_section("Skills")
+        add(", ".join(data["skills"]), BODY_STYLE)
+
+        return doc
+
+    def render_bytes(self, data: Dict[str, Any]) -> bytes:
+        """
+        Renders the resume and serializes it to .docx bytes in memory.
+        """
+        buffer = io.BytesIO()
+        self.render(data).save(buffer)
+        return buffer.getvalue()
+
+
+# Template shared by every resume render in the process
+resume_template = ResumeTemplate()
@@ -0,0 +1,138 @@
+import re
+import html
+from typing import Any, Callable, Dict, List
+
+# Characters that would otherwise be read as Markdown formatting in user-provided text
+MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]<>#|])")
+
+HTML_DOCUMENT = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Calibri, Arial, sans-serif; font-size: 11pt; max-width: 7.5in; margin: 0.36in auto; line-height: 1.2; }}
+h1 {{ font-size: 18pt; text-align: center; margin: 2pt 0; }}
+.contact {{ text-align: center; margin: 2pt 0; }}
+h2 {{ font-size: 14pt; border-top: 1px solid #000; padding-top: 6pt; margin: 8pt 0 2pt; }}
+.entry {{ display: flex; justify-content: space-between; margin: 2pt 0; }}
+.entry strong {{ font-size: 12pt; }}
+p, li {{ margin: 2pt 0; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def escape_markdown(text: Any) -> str:
+    """
+    Escapes Markdown formatting characters in user-provided text.
+    """
+    return MARKDOWN_SPECIAL.sub(r"\\\1", str(text))
+
+
+def render_markdown(data: Dict[str, Any]) -> str:
+    """
+    Renders the user's resume data as Markdown, following the layout of the Word resume.
+
+    Args:
+        data (Dict[str, Any]): User's resume data, including personal details, education,
+                               work experience, projects, and skills.
+
+    Returns:
+        str: The resume in Markdown format.
+    """
+    e = escape_markdown
+    personal = data["personal_details"]
+    lines: List[str] = [
+        f'# {e(personal["name"])}',
+        "",
+        " | ".join(e(personal[key]) for key in ("phone", "email", "linkedin", "github")),
+        "",
+        "## Education",
+    ]
+
+    for edu in data["education"]:
+        lines += [
+            "",
+            f'**{e(edu["degree"])}, {e(edu["institution"])}** — {e(edu["start_date"])} - {e(edu["end_date"])}',
+            "",
+            f'GPA: {e(edu["gpa"])}  ',
+            f'Courses: {e(", ".join(edu["courses"]))}',
+        ]
+
+    lines += ["", "## Work Experience"]
+    for exp in data["experiences"]:
+        lines += ["", f'**{e(exp["position"])} at {e(exp["organization"])}** — {e(exp["start_date"])} - {e(exp["end_date"])}', ""]
+        lines += [f"- {e(desc)}" for desc in exp["description"]]
+
+    lines += ["", "## Projects"]
+    for proj in data["projects"]:
+        lines += ["", f'**{e(proj["name"])}** — {e(proj["start_date"])} - {e(proj["end_date"])}', ""]
+        if proj.get("github_link"):  # Optional in the profile schema
+            lines += [e(proj["github_link"]), ""]
+        lines += [f"- {e(desc)}" for desc in proj["description"]]
+
+    lines += ["", "## Skills", "", e(", ".join(data["skills"]))]
+    return "\n".join(lines) + "\n"
+
+
+def render_html(data: Dict[str, Any]) -> str:
+    """
+    Renders the user's resume data as a standalone HTML document styled like the Word resume.
+
+    Args:
+        data (Dict[str, Any]): User's resume data, including personal details, education,
+                               work experience, projects, and skills.
+
+    Returns:
+        str: The resume as an HTML document.
+    """
+    e = html.escape
+
+    def entry(title: str, start_date: str, end_date: str) -> str:
+        return f'<div class="entry"><strong>{e(title)}</strong><span>{e(start_date)} - {e(end_date)}</span></div>'
+
+    def bullets(items: List[str]) -> str:
+        return "<ul>" + "".join(f"<li>{e(item)}</li>" for item in items) + "</ul>"
+
+    personal = data["personal_details"]
+    parts: List[str] = [
+        f'<h1>{e(personal["name"])}</h1>',
+        '<p class="contact">' + " | ".join(e(personal[key]) for key in ("phone", "email", "linkedin", "github")) + "</p>",
+        "<h2>Education</h2>",
+    ]
+
+    for edu in data["education"]:
+        parts += [
+            entry(f'{edu["degree"]}, {edu["institution"]}', edu["start_date"], edu["end_date"]),
+            f'<p>GPA: {e(edu["gpa"])}</p>',
+            f'<p>Courses: {e(", ".join(edu["courses"]))}</p>',
+        ]
+
+    parts.append("<h2>Work Experience</h2>")
+    for exp in data["experiences"]:
+        parts += [
+            entry(f'{exp["position"]} at {exp["organization"]}', exp["start_date"], exp["end_date"]),
+            bullets(exp["description"]),
+        ]
+
+    parts.append("<h2>Projects</h2>")
+    for proj in data["projects"]:
+        parts.append(entry(proj["name"], proj["start_date"], proj["end_date"]))
+        if proj.get("github_link"):  # Optional in the profile schema
+            parts.append(f'<p>{e(proj["github_link"])}</p>')
+        parts.append(bullets(proj["description"]))
+
+    parts += ["<h2>Skills</h2>", f'<p>{e(", ".join(data["skills"]))}</p>']
+    return HTML_DOCUMENT.format(title=e(f'{personal["name"]} - Resume'), body="\n".join(parts))
+
+
+# Text renderers by resume output format
+TEXT_RENDERERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "markdown": render_markdown,
+    "html": render_html,
+}
@@ -0,0 +1,16 @@
+import os
+import sys
+import tempfile
+
+# Settings read these at import time; the tests never reach the real services
+for key in ("POSTGRES_DB_URI", "OPENAI_API_KEY", "RESUME_PARSER_API_KEY", "SERVICE_ACCOUNT", "SECRET_VERSION"):
+    os.environ.setdefault(key, "test")
+
+# Offline backends
+os.environ.setdefault("DOCUMENT_SINK", "fake")
+os.environ.setdefault("MAIL_TRANSPORT", "local")
+
+# Local state such as the cache database goes to a scratch directory
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="career-craft-tests-"))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,76 @@
+"""
+Micro-benchmark of resume rendering throughput over the sample resumes in `resumes/*.json`.
+
+Compares rendering from the cached, precompiled skeleton against rebuilding the styled
+skeleton for every resume, and reports renders per second for both.
+
+Usage, from the repository root:
+    python -m tests.resume_render_benchmark [--iterations 50] [--resumes "resumes/*.json"]
+"""
+import io
+import json
+import glob
+import time
+import argparse
+from typing import Any, Callable, Dict, List
+
+from app.utils.resume_template import ResumeTemplate
+
+
+def uncached_render(data: Dict[str, Any]) -> bytes:
+    # A fresh template has no skeleton yet, so every render builds the styles again
+    return ResumeTemplate().render_bytes(data)
+
+
+def benchmark(render: Callable[[Dict[str, Any]], bytes], resumes: List[Dict[str, Any]], iterations: int) -> float:
+    """
+    Renders every resume `iterations` times and returns renders per second.
+    """
+    for data in resumes:
+        render(data)  # Warm up
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for data in resumes:
+            render(data)
+    elapsed = time.perf_counter() - start
+
+    return iterations * len(resumes) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--resumes", default="resumes/*.json")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(args.resumes))
+    if not paths:
+        raise SystemExit(f"No resumes match {args.resumes}")
+
+    resumes = []
+    for path in paths:
+        with open(path) as f:
+            resumes.append(json.load(f))
+
+    template = ResumeTemplate()
+    start = time.perf_counter()
+    template.skeleton
+    print(f"Skeleton build: {(time.perf_counter() - start) * 1000:.1f} ms ({len(template.skeleton)} bytes)")
+
+    for path, data in zip(paths, resumes):
+        start = time.perf_counter()
+        size = len(template.render_bytes(data))
+        print(f"{path}: {(time.perf_counter() - start) * 1000:.1f} ms, {size} bytes")
+
+    cached = benchmark(template.render_bytes, resumes, args.iterations)
+    uncached = benchmark(uncached_render, resumes, args.iterations)
+
+    print(f"\nResumes: {len(resumes)}, iterations: {args.iterations}")
+    print(f"Precompiled template: {cached:.1f} renders/s")
+    print(f"Skeleton per render:  {uncached:.1f} renders/s")
+    print(f"Speedup: {cached / uncached:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
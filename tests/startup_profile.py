@@ -0,0 +1,114 @@
+"""
+Cold start profile of a graph worker, checked against a budget.
+
+Imports `app.main` in a fresh interpreter with `-X importtime`, then builds every graph node.
+Reports the import time of `app.main`, the heaviest packages and app modules it loads, and
+the import and init time of each node. Exits with status 1 when importing `app.main` takes
+longer than the budget, or building the nodes takes longer than the node budget if one is set.
+
+Usage, from the repository root:
+    python -m tests.startup_profile [--budget 1.5] [--node-budget 3.0] [--top 15] [--no-nodes]
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from app.config import settings
+
+# The fresh interpreter imports `app` from the repository root, wherever the profiler is run from
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in the fresh interpreter: times the import of app.main, then builds the nodes one by one
+CHILD_SCRIPT = """
+import sys, json, time
+start = time.perf_counter()
+import app.main
+import_seconds = time.perf_counter() - start
+nodes = {}
+if sys.argv[1] == "nodes":
+    app.main.warm_up()
+    nodes = {name: [node.import_seconds, node.init_seconds] for name, node in app.main.nodes.items()}
+print(json.dumps({"import_seconds": import_seconds, "nodes": nodes}))
+"""
+
+
+def parse_importtime(output: str) -> List[Tuple[str, float, float]]:
+    """
+    Parses `-X importtime` output into (module, self seconds, cumulative seconds) records.
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        records.append((module.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return records
+
+
+def profile(build_nodes: bool) -> Tuple[Dict[str, Any], List[Tuple[str, float, float]]]:
+    """
+    Profiles a cold start in a fresh interpreter. Nodes are built lazily there, whatever NODE_WARMUP says.
+    """
+    env = {**os.environ, "NODE_WARMUP": "lazy"}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_SCRIPT, "nodes" if build_nodes else "none"],
+        capture_output=True, text=True, env=env, cwd=REPO_ROOT
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"Cold start failed:\n{completed.stderr[-4000:]}")
+
+    return json.loads(completed.stdout.strip().splitlines()[-1]), parse_importtime(completed.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=settings.COLD_START_BUDGET, help="Seconds allowed for importing app.main")
+    parser.add_argument("--node-budget", type=float, default=None, help="Seconds allowed for building every node")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--no-nodes", action="store_true", help="Only profile the import of app.main")
+    args = parser.parse_args()
+
+    result, records = profile(build_nodes=not args.no_nodes)
+
+    # Self time summed per top-level package
+    packages: Dict[str, float] = defaultdict(float)
+    for module, self_seconds, _ in records:
+        packages[module.split(".")[0]] += self_seconds
+
+    print(f"Import of app.main: {result['import_seconds'] * 1000:.0f} ms (budget {args.budget * 1000:.0f} ms)")
+
+    print("\nHeaviest packages (self time, including modules first loaded by the nodes):")
+    for package, seconds in sorted(packages.items(), key=lambda x: -x[1])[:args.top]:
+        print(f"  {package:<40} {seconds * 1000:8.1f} ms")
+
+    print("\nApp modules (cumulative time):")
+    app_modules = [record for record in records if record[0] == "app" or record[0].startswith("app.")]
+    for module, _, cumulative in sorted(app_modules, key=lambda x: -x[2])[:args.top]:
+        print(f"  {module:<40} {cumulative * 1000:8.1f} ms")
+
+    node_seconds = 0.0
+    if result["nodes"]:
+        print("\nNodes (import + init):")
+        for name, (import_seconds, init_seconds) in result["nodes"].items():
+            node_seconds += import_seconds + init_seconds
+            print(f"  {name:<40} {import_seconds * 1000:8.1f} ms + {init_seconds * 1000:8.1f} ms")
+        print(f"  {'total':<40} {node_seconds * 1000:8.1f} ms")
+
+    failures = []
+    if result["import_seconds"] > args.budget:
+        failures.append(f"import of app.main took {result['import_seconds']:.2f}s, over the {args.budget:.2f}s budget")
+    if args.node_budget is not None and node_seconds > args.node_budget:
+        failures.append(f"building the nodes took {node_seconds:.2f}s, over the {args.node_budget:.2f}s budget")
+
+    if failures:
+        print("\nOver budget: " + "; ".join(failures))
+        sys.exit(1)
+    print("\nWithin budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import os
+import json
+import threading
+
+from app.agents.craft_resume_node import CraftResumeNode
+from app.agents.resume_rephraser_node import ResumeRephraserNode
+from app.agents.suggestor_node import SuggestorNode
+from app.bulk import BulkCrafter
+from app.services.document_sinks import FakeDocumentSink
+from app.types.enhancer_schema import EnhancerSchema
+from app.types.jd_schema import JDSchema
+
+
+RESUMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resumes")
+
+
+class FakeJDA:
+    """
+    Stands in for JDANode: every posting becomes an engineering role at the company it names.
+    """
+
+    def __init__(self):
+        self.extracted = []
+        self._lock = threading.Lock()
+
+    def extract(self, job_description):
+        with self._lock:
+            self.extracted.append(job_description)
+        return JDSchema(position="Engineer", organization=job_description.split()[0], responsibilities=["Build"], skills=["Python"])
+
+
+class FakeEnhancerLLM:
+    def invoke(self, prompt):
+        return EnhancerSchema(enhanced_points=["Rephrased: " + prompt.to_messages()[-1].content[:20]])
+
+
+def load_profile():
+    with open(os.path.join(RESUMES_DIR, "john_doe.json")) as f:
+        return json.load(f)
+
+
+def make_crafter():
+    suggestor = SuggestorNode(cache_enabled=False, prefilter_top_k=None, early_exit_rating=None)
+    suggestor.rate_experience = lambda item, job_description: len(item["description"])
+    suggestor.rate_project = lambda item, job_description: len(item["description"])
+    suggestor.select_skills = lambda skills, job_description: ["Python"]
+
+    rephraser = ResumeRephraserNode(cache_enabled=False)
+    rephraser.llm = FakeEnhancerLLM()
+
+    crafter = CraftResumeNode(sink=FakeDocumentSink(), output_format="markdown")
+    return BulkCrafter(intent="resume", max_concurrency=4, jda=FakeJDA(), suggestor=suggestor, rephraser=rephraser, crafter=crafter)
+
+
+def test_bulk_run_tailors_the_profile_dict_to_every_posting():
+    profile = load_profile()
+    bulk = make_crafter()
+
+    result = bulk.run(profile, ["Acme needs an engineer", "Globex needs an engineer", "Acme  needs an engineer"])
+
+    assert [job.error for job in result.results] == [None, None, None]
+    assert [job.index for job in result.results] == [0, 1, 2]
+    # The repeated posting (same text up to whitespace) is analysed once
+    assert len(bulk.jda.extracted) == 2
+
+    for job in result.results:
+        assert len(job.user_details["experiences"]) == 2
+        assert len(job.user_details["projects"]) == 2
+        assert job.user_details["skills"] == ["Python"]
+        assert all(point.startswith("Rephrased: ") for point in job.user_details["experiences"][0]["description"])
+        assert job.message.startswith(f'# {profile["personal_details"]["name"]}')
+
+    # The caller's profile is left as it was
+    assert profile == load_profile()
+    assert result.summary()["succeeded"] == 3
@@ -0,0 +1,51 @@
+import os
+import time
+
+from app.utils.cache import SQLiteCache, TieredCache, cache_stats
+
+
+def test_sqlite_cache_opens_lazily_under_the_data_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.config.settings.DATA_DIR", str(tmp_path))
+    cache = SQLiteCache("cache.sqlite3", namespace="lazy")
+
+    assert cache.path == os.path.join(str(tmp_path), "cache.sqlite3")
+    assert not os.path.exists(cache.path)
+
+    cache.set("key", {"value": 1})
+    assert os.path.exists(cache.path)
+    assert cache.get("key") == {"value": 1}
+
+
+def test_sqlite_cache_keeps_only_the_newest_rows(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), namespace="capped", max_rows=10)
+    other = SQLiteCache(str(tmp_path / "cache.sqlite3"), namespace="other")
+    other.set("kept", 1)
+
+    for i in range(25):
+        cache.set(f"key-{i}", i)
+
+    assert cache.get("key-0") is None
+    assert cache.get("key-24") == 24
+    assert cache._count_rows() <= 10
+    assert other.get("kept") == 1
+
+
+def test_sqlite_cache_purges_expired_rows_on_open(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    SQLiteCache(path, namespace="ttl", ttl=0.01).set("key", 1)
+    time.sleep(0.02)
+
+    reopened = SQLiteCache(path, namespace="ttl")
+    reopened.get("missing")
+    assert reopened._count_rows() == 0
+
+
+def test_tiered_cache_stats_are_exposed_by_namespace():
+    cache = TieredCache.create(namespace="stats_test", max_size=4)
+    cache.get("missing")
+    cache.set("key", 1)
+    cache.get("key")
+
+    stats = cache_stats()["stats_test"]
+    assert stats["misses"] == 1
+    assert stats["memory_hits"] == 1
@@ -0,0 +1,163 @@
+import operator
+from typing import Annotated, List, TypedDict
+
+import pytest
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Command, interrupt
+
+import app.services.checkpointer as checkpointer_module
+from app.services.checkpointer import BoundedMemorySaver
+
+
+class State(TypedDict):
+    turns: Annotated[List[str], operator.add]
+    answer: str
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(checkpointer_module, "time", clock)
+    return clock
+
+
+def build_graph(saver, ask=False):
+    def record(state):
+        return {"turns": [f"turn-{len(state['turns'])}"]}
+
+    def ask_user(state):
+        return {"answer": interrupt("Which job?")}
+
+    builder = StateGraph(State)
+    builder.add_node("record", record)
+    builder.add_edge(START, "record")
+    if ask:
+        builder.add_node("ask_user", ask_user)
+        builder.add_edge("record", "ask_user")
+        builder.add_edge("ask_user", END)
+    else:
+        builder.add_edge("record", END)
+    return builder.compile(checkpointer=saver)
+
+
+def config(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def run_turn(graph, thread_id):
+    return graph.invoke({"turns": []}, config(thread_id))
+
+
+def test_older_checkpoints_and_unreferenced_blobs_are_pruned(clock):
+    saver = BoundedMemorySaver(max_threads=10, max_bytes=10 ** 9, ttl=None, keep_last=2)
+    graph = build_graph(saver)
+
+    for _ in range(5):
+        result = run_turn(graph, "a")
+
+    assert result["turns"] == [f"turn-{i}" for i in range(5)]
+    assert len(saver.storage["a"][""]) == 2
+    assert saver.metrics()["checkpoints"] == 2
+    assert saver.metrics()["pruned_checkpoints"] > 0
+
+    # Every blob left is referenced by a kept checkpoint, and writes only belong to kept checkpoints
+    referenced = {
+        ("a", "", channel, version)
+        for checkpoint_id in saver.storage["a"][""]
+        for channel, version in saver._versions[("a", "", checkpoint_id)].items()
+    }
+    assert {key for key in saver.blobs if key[0] == "a"} <= referenced
+    assert {key[2] for key in saver.writes if key[0] == "a"} <= set(saver.storage["a"][""])
+
+    # The latest state is still complete after pruning
+    assert graph.get_state(config("a")).values["turns"] == result["turns"]
+
+
+def test_idle_threads_expire_after_ttl(clock):
+    saver = BoundedMemorySaver(max_threads=10, max_bytes=10 ** 9, ttl=60.0, keep_last=2)
+    graph = build_graph(saver)
+
+    run_turn(graph, "idle")
+    clock.now += 30.0
+    run_turn(graph, "active")
+    clock.now += 40.0
+
+    # "idle" has been unused for 70s, "active" for 40s
+    assert graph.get_state(config("active")).values["turns"] == ["turn-0"]
+    assert graph.get_state(config("idle")).values == {}
+    assert "idle" not in saver.storage
+    assert not any(key[0] == "idle" for key in saver.blobs)
+    assert saver.metrics()["threads"] == 1
+    assert saver.metrics()["expired_threads"] == 1
+
+
+def test_least_recently_used_thread_is_evicted_over_max_threads(clock):
+    saver = BoundedMemorySaver(max_threads=2, max_bytes=10 ** 9, ttl=None, keep_last=2)
+    graph = build_graph(saver)
+
+    run_turn(graph, "a")
+    clock.now += 1.0
+    run_turn(graph, "b")
+    clock.now += 1.0
+    graph.get_state(config("a"))  # Reading a thread counts as using it
+    clock.now += 1.0
+    run_turn(graph, "c")
+
+    assert set(saver.storage) == {"a", "c"}
+    assert graph.get_state(config("b")).values == {}
+    assert saver.metrics()["evicted_threads"] == 1
+
+
+def test_threads_are_evicted_over_max_bytes_but_never_the_one_being_written(clock):
+    saver = BoundedMemorySaver(max_threads=10, max_bytes=10 ** 9, ttl=None, keep_last=2)
+    graph = build_graph(saver)
+    run_turn(graph, "a")
+    thread_bytes = saver.metrics()["bytes"]
+
+    # Room for about two threads
+    saver.max_bytes = int(thread_bytes * 2.5)
+    clock.now += 1.0
+    run_turn(graph, "b")
+    clock.now += 1.0
+    run_turn(graph, "c")
+
+    assert set(saver.storage) == {"b", "c"}
+    assert saver.metrics()["bytes"] <= saver.max_bytes
+
+    # A thread larger than the whole budget is still kept while it is being written
+    saver.max_bytes = 1
+    clock.now += 1.0
+    result = run_turn(graph, "c")
+
+    assert set(saver.storage) == {"c"}
+    assert result["turns"] == ["turn-0", "turn-1"]
+    assert saver.metrics()["evicted_threads"] == 2
+
+
+def test_thread_parked_at_an_interrupt_can_be_resumed_within_limits(clock):
+    saver = BoundedMemorySaver(max_threads=3, max_bytes=10 ** 9, ttl=3600.0, keep_last=1)
+    graph = build_graph(saver, ask=True)
+
+    graph.invoke({"turns": []}, config("parked"))
+    assert graph.get_state(config("parked")).next == ("ask_user",)
+
+    # Other conversations keep running while the user answers
+    for thread_id in ["x", "y"]:
+        clock.now += 60.0
+        graph.invoke({"turns": []}, config(thread_id))
+    clock.now += 60.0
+
+    result = graph.invoke(Command(resume="Acme"), config("parked"))
+
+    assert result == {"turns": ["turn-0"], "answer": "Acme"}
+    assert graph.get_state(config("parked")).next == ()
+    assert saver.metrics()["evicted_threads"] == 0
+    assert saver.metrics()["expired_threads"] == 0
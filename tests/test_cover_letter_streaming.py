@@ -0,0 +1,60 @@
+import os
+import json
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph, START, END
+
+from app.agents.cover_letter_rephraser_node import CoverLetterRephraserNode
+from app.types.jd_schema import JDSchema
+from app.types.node_state import NodeState
+
+
+RESUMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resumes")
+
+LETTER = "Dear hiring team, I am excited to apply for the Engineer role at Acme."
+
+
+def load_profile():
+    with open(os.path.join(RESUMES_DIR, "john_doe.json")) as f:
+        return json.load(f)
+
+
+# Under stream_mode="messages" LangGraph streams a node's invoke() calls as well
+@pytest.mark.parametrize("streaming", [True, False])
+def test_cover_letter_tokens_are_streamed_before_the_node_finishes(streaming):
+    node = CoverLetterRephraserNode(streaming=streaming)
+    node.llm = GenericFakeChatModel(messages=iter([AIMessage(content=LETTER)]))  # Streams word by word
+
+    builder = StateGraph(NodeState)
+    builder.add_node("cover_letter_rephraser", node)
+    builder.add_edge(START, "cover_letter_rephraser")
+    builder.add_edge("cover_letter_rephraser", END)
+    graph = builder.compile(checkpointer=MemorySaver())
+
+    config = {"configurable": {"thread_id": "streaming"}}
+    events = list(graph.stream(
+        {
+            "messages": [],
+            "job_description": JDSchema(position="Engineer", organization="Acme", responsibilities=["Build"], skills=["Python"]),
+            "user_details": load_profile()
+        },
+        config,
+        stream_mode="messages"
+    ))
+
+    chunks = [
+        message for message, metadata in events
+        if isinstance(message, AIMessageChunk) and metadata["langgraph_node"] == "cover_letter_rephraser"
+    ]
+    assert len(chunks) > 1
+    assert "".join(chunk.content for chunk in chunks) == LETTER
+
+    # Every token arrives before the node's closing message
+    replies = [index for index, (message, _) in enumerate(events) if message.content == "Crafted your cover letter!"]
+    token_positions = [index for index, (message, _) in enumerate(events) if isinstance(message, AIMessageChunk)]
+    assert not replies or max(token_positions) < replies[0]
+
+    assert graph.get_state(config).values["cover_letter"] == LETTER
@@ -0,0 +1,109 @@
+import json
+import logging
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from app.services.google_publisher import GoogleDocsPublisher
+from app.services.google_scheduler import GoogleAPIScheduler
+
+
+def http_error(status, reason=""):
+    content = json.dumps({"error": {"code": status, "message": reason, "errors": [{"reason": reason}]}})
+    return HttpError(httplib2.Response({"status": status}), content.encode())
+
+
+class FakeRequest:
+    def __init__(self, drive, kind, errors=()):
+        self.drive = drive
+        self.kind = kind
+        self.errors = list(errors)
+
+    def execute(self):
+        self.drive.executed.append(self.kind)
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"id": "file-1"}
+
+
+class FakeBatch:
+    def __init__(self, drive, callback):
+        self.drive = drive
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request):
+        self.requests.append(request)
+
+    def execute(self):
+        self.drive.batches.append([request.kind for request in self.requests])
+        for index, request in enumerate(self.requests):
+            self.callback(str(index), {"id": f"permission-{index}"}, None)
+
+
+class FakeDrive:
+    def __init__(self, create_errors=()):
+        self.create_errors = create_errors
+        self.executed = []
+        self.batches = []
+
+    def files(self):
+        return self
+
+    def permissions(self):
+        return self
+
+    def create(self, **kwargs):
+        kind = "permissions.create" if "fileId" in kwargs else "files.create"
+        return FakeRequest(self, kind, errors=self.create_errors if kind == "files.create" else ())
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+class FakeGoogle:
+    def __init__(self, drive):
+        self.drive = drive
+
+
+def make_publisher(drive):
+    scheduler = GoogleAPIScheduler(rates={}, max_retries=3, backoff_base=0.0, backoff_max=0.0)
+    return GoogleDocsPublisher(google=FakeGoogle(drive), permissions=[{"type": "anyone", "role": "writer"}], scheduler=scheduler)
+
+
+def test_single_permission_is_granted_through_a_batch_and_timings_are_logged(caplog):
+    drive = FakeDrive()
+    publisher = make_publisher(drive)
+
+    with caplog.at_level(logging.INFO, logger="app.services.google_publisher"):
+        link = publisher.publish_text("Acme - Engineer Cover Letter", "Dear team")
+
+    assert link == "https://docs.google.com/document/d/file-1/edit"
+    assert drive.executed == ["files.create"]
+    assert drive.batches == [["permissions.create"]]
+    assert [name for name, _ in publisher.last_timings] == ["drive.files.create", "drive.permissions.batch"]
+    assert any("drive.files.create" in record.getMessage() and record.levelno == logging.INFO for record in caplog.records)
+
+
+@pytest.mark.parametrize("error", [TimeoutError("read timed out"), http_error(503, "backendError")])
+def test_file_creation_is_not_retried_after_ambiguous_failures(error):
+    # The server may have created the file before the response failed
+    drive = FakeDrive(create_errors=[error])
+    publisher = make_publisher(drive)
+
+    with pytest.raises(type(error)):
+        publisher.publish_text("Acme - Engineer Cover Letter", "Dear team")
+
+    assert drive.executed == ["files.create"]
+    assert drive.batches == []
+
+
+@pytest.mark.parametrize("error", [http_error(429, "rateLimitExceeded"), http_error(403, "userRateLimitExceeded")])
+def test_file_creation_is_retried_after_quota_errors(error):
+    # Quota errors are returned before anything is created
+    drive = FakeDrive(create_errors=[error])
+    publisher = make_publisher(drive)
+
+    assert publisher.publish_text("Acme - Engineer Cover Letter", "Dear team").endswith("/file-1/edit")
+    assert drive.executed == ["files.create", "files.create"]
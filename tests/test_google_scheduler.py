@@ -0,0 +1,137 @@
+import json
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+import app.services.google_scheduler as google_scheduler
+import app.utils.rate_limiter as rate_limiter
+from app.services.google_scheduler import GoogleAPIScheduler
+
+
+def http_error(status, reason="", headers=None):
+    content = json.dumps({"error": {"code": status, "message": reason, "errors": [{"reason": reason}]}})
+    return HttpError(httplib2.Response({"status": status, **(headers or {})}), content.encode())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FlakyCall:
+    """
+    Raises the given errors in turn, then succeeds.
+    """
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "done"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(google_scheduler, "time", clock)
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
+
+
+@pytest.mark.parametrize("error, retryable, rate_limited", [
+    (http_error(429), True, True),
+    (http_error(403, "rateLimitExceeded"), True, True),
+    (http_error(403, "userRateLimitExceeded"), True, True),
+    (http_error(403, "quotaExceeded"), True, True),
+    (http_error(403, "forbidden"), False, False),
+    (http_error(403, "insufficientPermissions"), False, False),
+    (http_error(400, "badRequest"), False, False),
+    (http_error(404, "notFound"), False, False),
+    (http_error(500), True, False),
+    (http_error(503), True, False),
+    (ConnectionError("reset"), True, False),
+    (TimeoutError("timed out"), True, False),
+])
+def test_errors_are_classified(error, retryable, rate_limited):
+    assert GoogleAPIScheduler.is_retryable(error) is retryable
+    assert GoogleAPIScheduler.is_rate_limited(error) is rate_limited
+
+
+@pytest.mark.parametrize("error, seconds", [
+    (http_error(429, headers={"retry-after": "7"}), 7.0),
+    (http_error(429, headers={"retry-after": "1.5"}), 1.5),
+    (http_error(429, headers={"retry-after": "Wed, 21 Oct 2026 07:28:00 GMT"}), 0.0),  # Dates are not used
+    (http_error(429), 0.0),
+    (ConnectionError("reset"), 0.0),
+])
+def test_retry_after_is_read_in_seconds(error, seconds):
+    assert GoogleAPIScheduler.retry_after(error) == seconds
+
+
+def test_retries_back_off_with_full_jitter(clock, monkeypatch):
+    draws = []
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: draws.append((low, high)) or high)
+    scheduler = GoogleAPIScheduler(rates={}, max_retries=5, backoff_base=0.5, backoff_max=1.5)
+    call = FlakyCall(http_error(503), http_error(503), http_error(429), ConnectionError("reset"))
+
+    assert scheduler.execute("docs", call) == "done"
+
+    assert call.calls == 5
+    assert draws == [(0, 0.5), (0, 1.0), (0, 1.5), (0, 1.5)]
+    assert clock.sleeps == [0.5, 1.0, 1.5, 1.5]
+    assert scheduler.stats()["docs"]["retries"] == 4
+
+
+def test_retry_after_overrides_a_shorter_backoff(clock):
+    scheduler = GoogleAPIScheduler(rates={}, max_retries=3, backoff_base=0.1, backoff_max=0.5)
+    call = FlakyCall(http_error(429, headers={"retry-after": "7"}))
+
+    assert scheduler.execute("gmail", call) == "done"
+    assert clock.sleeps == [7.0]
+
+
+def test_retries_stop_after_max_retries(clock):
+    scheduler = GoogleAPIScheduler(rates={}, max_retries=2, backoff_base=0.1, backoff_max=0.5)
+    call = FlakyCall(*[http_error(503)] * 5)
+
+    with pytest.raises(HttpError):
+        scheduler.execute("drive", call)
+
+    assert call.calls == 3
+    assert scheduler.stats()["drive"]["failures"] == 1
+
+
+def test_non_retryable_errors_are_raised_at_once(clock):
+    scheduler = GoogleAPIScheduler(rates={}, max_retries=3, backoff_base=0.1, backoff_max=0.5)
+    call = FlakyCall(http_error(403, "insufficientPermissions"))
+
+    with pytest.raises(HttpError):
+        scheduler.execute("drive", call)
+
+    assert call.calls == 1
+    assert clock.sleeps == []
+
+
+def test_calls_wait_for_the_api_bucket(clock):
+    scheduler = GoogleAPIScheduler(rates={"docs": 2.0}, bursts={"docs": 1}, max_queue=10, max_retries=0, acquire_timeout=10.0)
+
+    for _ in range(3):
+        scheduler.execute("docs", lambda: "done")
+    scheduler.execute("drive", lambda: "done")  # No bucket for this API
+
+    assert clock.sleeps == [0.5, 0.5]
+    assert scheduler.stats()["docs"]["throttled_seconds"] == 1.0
+    assert scheduler.stats()["drive"]["throttled_seconds"] == 0.0
@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from app.agents.preprocessor_node import QueryPreprocessorNode
+from app.types.intent_schema import IntentSchema
+from app.types.node_state import NodeState
+from app.utils.intent_rules import IntentClassifier
+
+
+POSTING = """Senior Backend Engineer - Acme Corp (Remote)
+
+About the role
+We are looking for a backend engineer to build and scale our payments platform.
+
+Responsibilities
+- Design and build Python services on AWS
+- Own the reliability of our APIs
+- Mentor other engineers
+
+Requirements
+- 5+ years of professional experience
+- Strong Python and SQL
+- Experience with distributed systems
+
+To apply, send your resume and a short note about yourself."""
+
+
+class FakeIntentLLM:
+    """
+    Stands in for the structured-output LLM, counting the calls that fell through the rules.
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.calls += 1
+        return self.output
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("resume", "resume"),
+    ("A cover letter please", "cover_letter"),
+    ("I don't need a resume, write me a cover letter", "cover_letter"),
+    ("Not a cover letter, a CV please", "resume"),
+])
+def test_intent_keywords_skip_negated_mentions(text, intent):
+    output = IntentClassifier().classify(text, need="intent")
+    assert output is not None and output.intent == intent
+
+
+@pytest.mark.parametrize("text", [
+    "I don't want a cover letter",  # Only a negated mention
+    "A resume and a cover letter",  # Both mentioned
+    "Can you help me with my job application?",  # Neither mentioned
+])
+def test_unclear_intent_is_left_to_the_llm(text):
+    assert IntentClassifier().classify(text, need="intent") is None
+
+
+def test_pasted_posting_is_detected_and_the_request_stripped():
+    output = IntentClassifier().classify("Please write a cover letter for this job\n" + POSTING)
+
+    # The posting's own "send your resume" does not override the request
+    assert output.intent == "cover_letter"
+    assert output.is_jd_given
+    assert output.job_description == POSTING
+
+
+def test_long_message_without_posting_structure_is_not_a_job_description():
+    text = "I am applying to a few companies this week and would love some help. " * 6
+    is_jd_given, job_description, _ = IntentClassifier().detect_job_description(text)
+    assert not is_jd_given and job_description == ""
+
+
+def test_short_reply_never_carries_a_job_description():
+    output = IntentClassifier().classify("here it is", known_intent="resume", need="jd")
+    assert output is None
+    assert IntentClassifier().detect_job_description("here it is")[:2] == (False, "")
+
+
+def make_node(output):
+    node = QueryPreprocessorNode()
+    node.llm = FakeIntentLLM(output)
+    return node
+
+
+def test_confident_rules_answer_without_the_llm():
+    node = make_node(IntentSchema(intent=""))
+    update = node(NodeState(messages=[HumanMessage(content="Write a resume for this job\n" + POSTING)]), {"configurable": {}})
+
+    assert node.llm.calls == 0
+    assert update["intent"] == "resume"
+    assert update["is_jd_given"] and update["job_description"] == POSTING
+
+
+def test_ambiguous_message_falls_back_to_the_llm():
+    llm_output = IntentSchema(intent="cover_letter", is_jd_given=False)
+    node = make_node(llm_output)
+    update = node(NodeState(messages=[HumanMessage(content="Help me apply to Acme, not with a resume")]), {"configurable": {}})
+
+    assert node.llm.calls == 1
+    assert update["intent"] == "cover_letter"
+    assert node.intent_rules.stats()["llm_fallbacks"] == 1
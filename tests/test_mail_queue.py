@@ -0,0 +1,90 @@
+import base64
+from email import message_from_bytes
+from email.message import EmailMessage
+
+import pytest
+
+from app.services.google_scheduler import GoogleAPIScheduler
+from app.services.mail_queue import GmailTransport, LocalMailTransport, MailQueue, MailQueueClosed
+
+
+class FakeBatch:
+    def __init__(self, gmail, callback):
+        self.gmail = gmail
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.gmail.executions += 1
+        for request_id, request in self.requests:
+            recipient = request["to"]
+            if recipient in self.gmail.fail_once:
+                # Delivery of this email fails once, then the connection drops before the rest are reported
+                self.gmail.fail_once.discard(recipient)
+                self.callback(request_id, None, TimeoutError("send timed out"))
+                raise ConnectionError("connection reset")
+            self.gmail.delivered.append(recipient)
+            self.callback(request_id, {"id": recipient}, None)
+
+
+class FakeGmail:
+    def __init__(self, fail_once):
+        self.fail_once = set(fail_once)
+        self.delivered = []
+        self.executions = 0
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def send(self, userId, body):
+        return {"to": message_from_bytes(base64.urlsafe_b64decode(body["raw"]))["to"]}
+
+
+class FakeGoogle:
+    def __init__(self, gmail):
+        self.gmail = gmail
+
+
+def make_message(recipient):
+    message = EmailMessage()
+    message["to"] = recipient
+    message["subject"] = "Cover letter"
+    message.set_content("Here is your link")
+    return message
+
+
+def test_failed_gmail_batch_only_resends_undelivered_emails():
+    gmail = FakeGmail(fail_once={"b@example.com"})
+    scheduler = GoogleAPIScheduler(rates={}, max_retries=3, backoff_base=0.0, backoff_max=0.0)
+    transport = GmailTransport(google=FakeGoogle(gmail), scheduler=scheduler)
+    queue = MailQueue(transport=transport, batch_size=3, linger=0.05, max_retries=3)
+
+    mails = [queue.enqueue(make_message(f"{name}@example.com")) for name in ("a", "b", "c")]
+    assert queue.flush(timeout=5.0)
+
+    # The batch is not retried by the scheduler; only the emails it did not deliver are sent again
+    assert sorted(gmail.delivered) == ["a@example.com", "b@example.com", "c@example.com"]
+    assert scheduler.stats()["gmail"]["retries"] == 0
+    assert [mail.status for mail in mails] == ["sent", "sent", "sent"]
+    assert [mail.attempts for mail in mails] == [1, 2, 2]
+    queue.close()
+
+
+def test_enqueue_after_close_is_rejected():
+    transport = LocalMailTransport()
+    queue = MailQueue(transport=transport, batch_size=10, linger=0.01)
+    queue.enqueue(make_message("a@example.com"))
+    queue.close(timeout=5.0)
+
+    with pytest.raises(MailQueueClosed):
+        queue.enqueue(make_message("b@example.com"))
+    assert [message["to"] for message in transport.outbox] == ["a@example.com"]
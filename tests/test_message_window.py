@@ -0,0 +1,135 @@
+import threading
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+from langgraph.graph import StateGraph, START, END
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.agents.jda_node import JDANode
+from app.agents.preprocessor_node import QueryPreprocessorNode
+from app.config import settings
+from app.types.jd_schema import JDSchema
+from app.types.node_state import NodeState
+from app.utils.message_window import compact_job_descriptions, window_messages
+
+
+POSTING = """Senior Backend Engineer - {organization} (Remote)
+
+About the role
+We are looking for a backend engineer to build and scale our payments platform.
+
+Responsibilities
+- Design and build Python services on AWS
+- Own the reliability of our APIs and the on-call rotation that supports them
+- Mentor other engineers and review their designs
+- Work with product managers to plan quarterly roadmaps
+
+Requirements
+- 5+ years of professional experience building backend systems
+- Strong Python and SQL, including query tuning on large tables
+- Experience with distributed systems, queues and caches
+
+"""
+
+
+def long_posting(organization):
+    # Long enough to be compacted once extracted
+    return POSTING.format(organization=organization) * 5 + "To apply, send your resume and a short note about yourself."
+
+
+class FakeJDLLM:
+    """
+    Stands in for the structured-output LLM of JDANode, keeping the job descriptions it was asked to extract.
+    """
+
+    def __init__(self):
+        self.extracted = []
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        job_description = prompt.to_messages()[-1].content
+        with self._lock:
+            self.extracted.append(job_description)
+        organization = "Globex" if "Globex" in job_description else "Acme"
+        return JDSchema(position="Backend Engineer", organization=organization, responsibilities=["Build"], skills=["Python"])
+
+
+def numbered(count, start=0):
+    return [HumanMessage(content=f"message {i}", id=str(i)) for i in range(start, start + count)]
+
+
+@pytest.fixture
+def window(monkeypatch):
+    monkeypatch.setattr(settings, "MESSAGE_WINDOW", 3)
+    return 3
+
+
+def test_window_keeps_the_last_messages(window):
+    messages = window_messages(numbered(2), numbered(3, start=2))
+    assert [message.id for message in messages] == ["2", "3", "4"]
+
+
+def test_window_replaces_messages_by_id_in_place(window):
+    messages = window_messages(numbered(3), [HumanMessage(content="edited", id="1")])
+
+    assert [message.id for message in messages] == ["0", "1", "2"]
+    assert messages[1].content == "edited"
+
+
+def test_window_applies_removals_before_trimming(window):
+    messages = window_messages(numbered(3), [RemoveMessage(id="0"), HumanMessage(content="new", id="3")])
+
+    # The removal frees a place, so nothing else is trimmed
+    assert [message.id for message in messages] == ["1", "2", "3"]
+
+
+def test_window_is_disabled_with_none(monkeypatch):
+    monkeypatch.setattr(settings, "MESSAGE_WINDOW", None)
+    assert len(window_messages(numbered(30), numbered(5, start=30))) == 35
+
+
+def test_compacted_messages_are_left_alone():
+    message = HumanMessage(content=long_posting("Acme"), id="jd")
+    job_description = JDSchema(position="Backend Engineer", organization="Acme", responsibilities=["Build"], skills=["Python"])
+
+    compacted = compact_job_descriptions([message], job_description, min_chars=2000)
+
+    assert [replacement.id for replacement in compacted] == ["jd"]
+    assert "Backend Engineer at Acme" in compacted[0].content
+    assert compacted[0].additional_kwargs["compacted_chars"] == len(message.content)
+    assert compact_job_descriptions(compacted, job_description, min_chars=2000) == []
+
+
+def test_compacted_job_description_is_not_extracted_again_on_later_turns():
+    preprocessor = QueryPreprocessorNode(rules_enabled=True)
+    jda = JDANode(cache_enabled=False)
+    jda.llm = FakeJDLLM()
+
+    builder = StateGraph(NodeState)
+    builder.add_node("query_preprocessor", preprocessor)
+    builder.add_node("jd_analysis", jda)
+    builder.add_edge(START, "query_preprocessor")
+    builder.add_conditional_edges("query_preprocessor", lambda state: "jd_analysis" if state.is_jd_given else END)
+    builder.add_edge("jd_analysis", END)
+    graph = builder.compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "compaction"}}
+
+    graph.invoke({"messages": [HumanMessage(content="Write me a cover letter for this posting:\n" + long_posting("Acme"))]}, config)
+    first = graph.get_state(config).values["messages"][0]
+
+    assert first.additional_kwargs["compacted_chars"] > settings.MESSAGE_COMPACT_CHARS
+    assert "Backend Engineer at Acme" in first.content
+
+    graph.invoke({"messages": [HumanMessage(content="Now a resume for this one:\n" + long_posting("Globex"))]}, config)
+    state = graph.get_state(config).values
+
+    # Each posting was extracted once, from its original text, and the first one kept its compaction
+    assert len(jda.llm.extracted) == 2
+    assert "Acme" in jda.llm.extracted[0] and "Globex" in jda.llm.extracted[1]
+    assert not any("compacted" in text for text in jda.llm.extracted)
+    assert state["job_description"].organization == "Globex"
+    assert state["messages"][0] == first
+
+    compacted = [message for message in state["messages"] if "compacted_chars" in message.additional_kwargs]
+    assert [message.id for message in compacted] == [first.id, state["messages"][2].id]
+    assert all(len(message.content) < 200 for message in state["messages"] if not isinstance(message, AIMessage))
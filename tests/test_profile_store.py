@@ -0,0 +1,17 @@
+import pytest
+
+from app.services.profile_store import (
+    MemoryProfileStore, PostgresProfileStore, SQLiteProfileStore, create_profile_store
+)
+
+
+def test_profile_store_follows_the_checkpointer_by_default():
+    assert isinstance(create_profile_store(None, checkpointer="memory"), MemoryProfileStore)
+    assert isinstance(create_profile_store(None, checkpointer="bounded_memory"), MemoryProfileStore)
+    assert isinstance(create_profile_store(None, checkpointer="postgres"), PostgresProfileStore)
+
+
+def test_in_memory_profile_store_is_rejected_with_postgres_checkpointer():
+    with pytest.raises(ValueError):
+        create_profile_store("memory", checkpointer="postgres")
+    assert isinstance(create_profile_store("sqlite", checkpointer="postgres"), SQLiteProfileStore)
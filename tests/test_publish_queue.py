@@ -0,0 +1,43 @@
+import time
+import pytest
+from langgraph.graph import StateGraph, START, END
+from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.messages import HumanMessage
+
+from app.agents.craft_cover_letter_node import CraftCoverLetterNode
+from app.services.document_sinks import FakeDocumentSink
+from app.services.publish_queue import PublishQueue
+from app.types.jd_schema import JDSchema
+from app.types.node_state import NodeState
+
+
+@pytest.mark.parametrize("durability", ["async", "exit"])
+def test_async_publish_link_lands_in_final_thread_state(durability):
+    queue = PublishQueue(max_workers=4, attach_timeout=10.0)
+    node = CraftCoverLetterNode(publish_mode="async", sink=FakeDocumentSink())
+    node.publish_queue = queue
+
+    builder = StateGraph(NodeState)
+    builder.add_node("craft_cover_letter", node)
+    builder.add_edge(START, "craft_cover_letter")
+    builder.add_edge("craft_cover_letter", END)
+    graph = builder.compile(checkpointer=MemorySaver())
+    queue.bind_graph(graph)
+
+    job_description = JDSchema(position="Engineer", organization="Acme", responsibilities=["Build"], skills=["Python"])
+    threads = [f"thread-{i}" for i in range(20)]
+    for thread_id in threads:
+        graph.invoke(
+            {"messages": [HumanMessage(content="Cover letter please")], "job_description": job_description, "cover_letter": "Dear team"},
+            {"configurable": {"thread_id": thread_id}},
+            durability=durability
+        )
+
+    # Wait until every job has been attached to its thread, not only published
+    deadline = time.monotonic() + 10.0
+    while queue.metrics()["attached"] < len(threads) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    for thread_id in threads:
+        messages = graph.get_state({"configurable": {"thread_id": thread_id}}).values["messages"]
+        assert any("Here's the link" in message.content for message in messages), thread_id
@@ -0,0 +1,103 @@
+import pytest
+
+import app.utils.rate_limiter as rate_limiter
+from app.utils.rate_limiter import RateLimitExceeded, TokenBucket, backoff_delay
+
+
+class FakeClock:
+    """
+    Stands in for the `time` module. With `advance=False`, sleeping callers don't move the clock,
+    like concurrent callers that have reserved a token and are still waiting for it.
+    """
+
+    def __init__(self, advance=True):
+        self.now = 1000.0
+        self.advance = advance
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        if self.advance:
+            self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    clock = FakeClock(advance=False)
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
+
+
+def test_bucket_serves_a_burst_then_spaces_calls_at_the_rate(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2, max_queue=10)
+
+    waits = [bucket.acquire() for _ in range(5)]
+
+    assert waits == [0.0, 0.0, 0.5, 0.5, 0.5]
+    assert clock.sleeps == [0.5, 0.5, 0.5]
+
+
+def test_bucket_refills_up_to_its_capacity(clock):
+    bucket = TokenBucket(rate=1.0, capacity=3, max_queue=10)
+    for _ in range(3):
+        bucket.acquire()
+
+    clock.now += 100.0
+
+    assert [bucket.acquire() for _ in range(4)] == [0.0, 0.0, 0.0, 1.0]
+
+
+def test_call_cost_takes_several_tokens(clock):
+    bucket = TokenBucket(rate=1.0, capacity=1, max_queue=10)
+
+    assert bucket.acquire(tokens=3) == 2.0
+    assert bucket.acquire() == 1.0
+
+
+def test_waiting_callers_are_bounded_by_the_queue_debt(frozen_clock):
+    bucket = TokenBucket(rate=1.0, capacity=1, max_queue=2)
+
+    # Reservations are served in order, each one second after the previous
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 1.0, 2.0]
+    with pytest.raises(RateLimitExceeded):
+        bucket.acquire()
+
+    # The rejected call took no token: once the debt is paid, calls go through again
+    frozen_clock.now += 3.0
+    assert bucket.acquire() == 0.0
+
+
+def test_wait_beyond_the_timeout_is_rejected_without_taking_a_token(frozen_clock):
+    bucket = TokenBucket(rate=1.0, capacity=1, max_queue=10)
+    bucket.acquire()
+
+    with pytest.raises(RateLimitExceeded):
+        bucket.acquire(timeout=0.5)
+
+    assert bucket.acquire(timeout=1.0) == 1.0
+
+
+@pytest.mark.parametrize("attempt, bound", [(0, 0.5), (1, 1.0), (3, 4.0), (10, 8.0)])
+def test_backoff_draws_a_full_jitter_delay_up_to_the_capped_step(monkeypatch, attempt, bound):
+    draws = []
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: draws.append((low, high)) or high)
+
+    assert backoff_delay(attempt, base=0.5, maximum=8.0) == bound
+    assert draws == [(0, bound)]
+
+
+def test_backoff_delays_spread_over_the_whole_range():
+    delays = [backoff_delay(4, base=0.5, maximum=8.0) for _ in range(1000)]
+
+    assert all(0.0 <= delay <= 8.0 for delay in delays)
+    assert min(delays) < 1.0 and max(delays) > 7.0
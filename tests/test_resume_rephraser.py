@@ -0,0 +1,54 @@
+import os
+import json
+import threading
+
+from app.agents.resume_rephraser_node import ResumeRephraserNode
+from app.types.enhancer_schema import EnhancerSchema
+from app.types.node_state import NodeState
+from app.utils.profile_overlay import apply_overlay
+
+
+class FakeEnhancerLLM:
+    """
+    Stands in for the structured-output LLM: upper-cases the points it is given.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.calls += 1
+        experience = prompt.to_messages()[-1].content
+        return EnhancerSchema(enhanced_points=[experience.upper()])
+
+
+RESUMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resumes")
+
+
+def load_profile():
+    with open(os.path.join(RESUMES_DIR, "john_doe.json")) as f:
+        return json.load(f)
+
+
+def test_selected_experiences_and_projects_are_rephrased_into_the_overlay():
+    profile = load_profile()
+    node = ResumeRephraserNode(cache_enabled=False)
+    node.llm = FakeEnhancerLLM()
+
+    state = NodeState(
+        messages=[],
+        job_description="Python developer",
+        user_details=profile,
+        profile_overlay={"selected": {"experiences": [1, 0], "projects": [0]}}
+    )
+    update = node(state, {"configurable": {}})
+
+    descriptions = update["profile_overlay"]["descriptions"]
+    assert set(descriptions) == {"experiences:1", "experiences:0", "projects:0"}
+    assert node.llm.calls == 3
+
+    resolved = apply_overlay(profile, {**state.profile_overlay, **update["profile_overlay"]})
+    assert resolved["experiences"][0]["description"] == descriptions["experiences:1"]
+    assert resolved["experiences"][0]["description"] != profile["experiences"][1]["description"]
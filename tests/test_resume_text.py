@@ -0,0 +1,28 @@
+import os
+import json
+
+import pytest
+
+from app.utils.resume_text import TEXT_RENDERERS
+
+
+RESUMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resumes")
+
+
+def load_profile():
+    with open(os.path.join(RESUMES_DIR, "john_doe.json")) as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("output_format", sorted(TEXT_RENDERERS))
+def test_project_without_github_link_is_rendered_without_it(output_format):
+    profile = load_profile()
+    profile["projects"][0]["github_link"] = None
+    del profile["projects"][1]["github_link"]
+
+    rendered = TEXT_RENDERERS[output_format](profile)
+
+    assert "None" not in rendered
+    assert "<p></p>" not in rendered
+    assert profile["projects"][0]["name"] in rendered
+    assert profile["projects"][2]["github_link"] in rendered
@@ -0,0 +1,141 @@
+import os
+import json
+import time
+import threading
+
+import pytest
+
+from app.agents.suggestor_node import SuggestorNode, UNJUDGED_RATING
+from app.types.jd_schema import JDSchema
+from app.types.node_state import NodeState
+from app.utils.cache import stable_hash
+
+
+RESUMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resumes")
+
+JOB_DESCRIPTION = JDSchema(position="Engineer", organization="Acme", responsibilities=["Build services"], skills=["Python"])
+
+
+class FakeJudge:
+    """
+    Rates items with `rating(item)` after `delay` seconds, counting the calls and the most calls in flight.
+    """
+
+    def __init__(self, rating, delay=0.0):
+        self.rating = rating
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, item, job_description):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return self.rating(item)
+
+
+def load_profile(name):
+    with open(os.path.join(RESUMES_DIR, name)) as f:
+        return json.load(f)
+
+
+def make_node(judge, **kwargs):
+    node = SuggestorNode(cache_enabled=False, **kwargs)
+    node.rate_experience = judge
+    node.rate_project = judge
+    node.select_skills = lambda skills, job_description: ["Python"]
+    return node
+
+
+def baseline_selection(exp_ratings, proj_ratings):
+    """
+    The selection of the original node: every item rated, sorted by rating, then the top-2 rules.
+    """
+    rated_experiences = sorted(zip(exp_ratings, range(len(exp_ratings))), reverse=True, key=lambda x: x[0])
+    rated_projects = sorted(zip(proj_ratings, range(len(proj_ratings))), reverse=True, key=lambda x: x[0])
+    experiences = [index for _, index in rated_experiences]
+    projects = [index for _, index in rated_projects]
+
+    if (len(experiences) < 2 and len(projects) < 2) or (len(experiences) > 2 and len(projects) > 2):
+        return experiences[:2], projects[:2]
+    if len(experiences) < 2 and len(projects) >= 2:
+        return experiences[:2], projects[:2 + 2 - len(experiences[:2])]
+    if len(experiences) >= 2 and len(projects) < 2:
+        return experiences[:2 + 2 - len(projects[:2])], projects[:2]
+    return list(range(len(experiences))), list(range(len(projects)))
+
+
+def hashed_rating(item):
+    return int(stable_hash(item), 16) % 11
+
+
+@pytest.mark.parametrize("resume", ["john_doe.json", "john_doe_short_exp.json", "john_doe_short_proj.json", "john_doe_short_both.json"])
+@pytest.mark.parametrize("mode", ["sequential", "concurrent"])
+def test_selection_matches_the_baseline_without_prefilter_or_early_exit(resume, mode):
+    profile = load_profile(resume)
+    judge = FakeJudge(hashed_rating)
+    node = make_node(judge, mode=mode, prefilter_top_k=None, early_exit_rating=None)
+
+    update = node(NodeState(messages=[], job_description=JOB_DESCRIPTION, user_details=profile), {"configurable": {}})
+
+    expected = baseline_selection(
+        [hashed_rating(item) for item in profile["experiences"]],
+        [hashed_rating(item) for item in profile["projects"]]
+    )
+    selected = update["profile_overlay"]["selected"]
+    assert (selected["experiences"], selected["projects"]) == expected
+    assert judge.calls == len(profile["experiences"]) + len(profile["projects"])
+
+
+@pytest.mark.parametrize("rating", [10, 5])
+def test_candidates_are_judged_in_one_concurrent_round(rating):
+    profile = load_profile("john_doe.json")
+    judge = FakeJudge(lambda item: rating, delay=0.2)
+    node = make_node(judge, mode="concurrent", max_concurrency=9, prefilter_top_k=4, early_exit_rating=9)
+
+    start = time.perf_counter()
+    experience_ratings, project_ratings, _ = node.judge_items(
+        profile["experiences"], profile["projects"], JOB_DESCRIPTION, lambda: ["Python"]
+    )
+    elapsed = time.perf_counter() - start
+
+    # Strong or weak, every candidate is in flight at once: one round trip of latency, not one per open slot
+    assert judge.peak == 8
+    assert elapsed < 0.35
+    assert experience_ratings == [rating] * 4
+    assert project_ratings == [rating] * 4
+
+
+def test_filled_slots_cancel_the_queued_judge_calls():
+    profile = load_profile("john_doe.json")
+    judge = FakeJudge(lambda item: 10, delay=0.05)
+    node = make_node(judge, mode="concurrent", max_concurrency=2, prefilter_top_k=4, early_exit_rating=9)
+
+    experience_ratings, project_ratings, _ = node.judge_items(
+        profile["experiences"], profile["projects"], JOB_DESCRIPTION, lambda: ["Python"]
+    )
+
+    # Calls beyond the concurrency cap wait in the queue and are dropped once both kinds are filled;
+    # which kind a freed worker picks up before the cancellation lands depends on timing
+    assert judge.calls < 8
+    assert (experience_ratings + project_ratings).count(UNJUDGED_RATING) == 8 - judge.calls
+
+
+def test_sequential_judging_stops_once_the_slots_are_filled():
+    profile = load_profile("john_doe.json")
+    judge = FakeJudge(lambda item: 10)
+    node = make_node(judge, mode="sequential", prefilter_top_k=4, early_exit_rating=9)
+
+    experience_ratings, project_ratings, _ = node.judge_items(
+        profile["experiences"], profile["projects"], JOB_DESCRIPTION, lambda: ["Python"]
+    )
+
+    assert judge.calls == 4
+    assert experience_ratings.count(UNJUDGED_RATING) == 2
+    assert project_ratings.count(UNJUDGED_RATING) == 2